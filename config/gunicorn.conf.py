@@ -0,0 +1,30 @@
+# config/gunicorn.conf.py
+# Multi-worker serving with correct Prometheus metrics (see
+# src/app/multiproc_metrics.py). From the repo root:
+#     gunicorn -c config/gunicorn.conf.py src.app.main:app
+import os
+import sys
+import tempfile
+
+# Must be set before any worker imports prometheus_client
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "daraz_prometheus_multiproc"),
+)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.app.multiproc_metrics import mark_worker_dead, reset_dir  # noqa: E402
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120  # model and RAG loading happen in each worker's startup
+
+
+def on_starting(server):
+    reset_dir()
+
+
+def child_exit(server, worker):
+    folded = mark_worker_dead(worker.pid)
+    server.log.info(f"Worker {worker.pid} exited; archived {folded} metric files")
@@ -0,0 +1,95 @@
+# experiments/benchmarks/bench_bulk_score.py
+"""
+Throughput of the bulk scoring CLI (src/app/bulk_score.py) on a 1M-row
+synthetic product file, resampled from Top_Selling_Product_Data.csv with
+all of its columns, as CSV and as Parquet, for 1, 2 and 4 workers.
+
+Each run is a fresh `python -m src.app.bulk_score` process, and its peak
+RSS (parent plus largest worker) shows that memory stays bounded by the
+chunk size rather than the file size.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_bulk_score.py [rows]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+SOURCE = os.path.join(ROOT, "data", "raw", "Top_Selling_Product_Data.csv")
+WORKERS = (1, 2, 4)
+CHUNK_ROWS = 100_000
+
+PEAK_RSS = """
+import resource, sys
+from src.app.bulk_score import main
+sys.argv = ["bulk_score"] + sys.argv[1:]
+main()
+own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(f"peak_rss_mb {own / 1024:.0f} {kids / 1024:.0f}")
+"""
+
+
+def make_input(directory: str, rows: int) -> dict:
+    rng = np.random.default_rng(0)
+    base = pd.read_csv(SOURCE)
+    df = base.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    df["No. of products to be sold"] *= rng.uniform(0.5, 1.5, rows)
+    paths = {
+        "csv": os.path.join(directory, "products.csv"),
+        "parquet": os.path.join(directory, "products.parquet"),
+    }
+    df.to_csv(paths["csv"], index=False)
+    df.to_parquet(paths["parquet"], index=False, row_group_size=CHUNK_ROWS)
+    return paths
+
+
+def run(source: str, output: str, workers: int) -> tuple:
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-W",
+            "ignore",
+            "-c",
+            PEAK_RSS,
+            source,
+            output,
+            "--workers",
+            str(workers),
+            "--chunk-rows",
+            str(CHUNK_ROWS),
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    rate = float(re.search(r"\((\d+) rows/s\)", out).group(1))
+    parent, child = re.search(r"peak_rss_mb (\d+) (\d+)", out).groups()
+    return rate, int(parent), int(child)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    scratch = tempfile.mkdtemp(prefix="bench_bulk_")
+    paths = make_input(scratch, rows)
+    for fmt, path in paths.items():
+        size = os.path.getsize(path) / 2**20
+        print(f"\n{fmt}: {rows} rows, {size:.0f} MB ({os.cpu_count()} CPUs)")
+        print(f"{'workers':>8} {'rows/s':>9} {'parent MB':>10} {'worker MB':>10}")
+        for workers in WORKERS:
+            output = os.path.join(scratch, f"scores_{fmt}_{workers}.parquet")
+            rate, parent, child = run(path, output, workers)
+            print(f"{workers:>8} {rate:>9.0f} {parent:>10} {child:>10}")
+    subprocess.run(["rm", "-rf", scratch])
+
+
+if __name__ == "__main__":
+    main()
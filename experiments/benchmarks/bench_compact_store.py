@@ -0,0 +1,134 @@
+# experiments/benchmarks/bench_compact_store.py
+"""
+Index load time, per-worker memory and retrieval latency: the default JSON
+stores (what src/rag/query.py loaded before) vs. the compact store
+(src/rag/compact_store.py), on the full review corpus.
+
+The index is built like src/ingest.py does (one node per review, same
+splitter), but with random 384-dim vectors in place of MiniLM embeddings,
+so neither the model nor torch is needed. The stores have the same size and
+shape as the real ones. Each load runs in a fresh process. Memory is the
+RSS growth from loading (llama_index already imported) plus 100 top-5
+retrievals.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_compact_store.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+REVIEWS = os.path.join(ROOT, "data", "raw", "daraz-code-mixed-product-reviews.csv")
+DIM = 384  # all-MiniLM-L6-v2
+QUERIES = 100
+
+LOAD = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+from llama_index.core import QueryBundle, StorageContext, load_index_from_storage
+from llama_index.core.embeddings import MockEmbedding
+from src.rag.compact_store import compact_storage_context
+
+def rss_mb():
+    return int(open("/proc/self/statm").read().split()[1]) * 4096 / 2**20
+
+before = rss_mb()
+start = time.perf_counter()
+if {compact}:
+    context = compact_storage_context(os.path.join({path!r}, "compact"))
+else:
+    context = StorageContext.from_defaults(persist_dir={path!r})
+index = load_index_from_storage(context, embed_model=MockEmbedding(embed_dim={dim}))
+retriever = index.as_retriever(similarity_top_k=5)
+load = time.perf_counter() - start
+
+rng = np.random.default_rng(0)
+queries = [QueryBundle("q", embedding=rng.normal(size={dim}).tolist())
+           for _ in range({queries})]
+retriever.retrieve(queries[0])
+start = time.perf_counter()
+for query in queries:
+    retriever.retrieve(query)
+per_query = (time.perf_counter() - start) / len(queries)
+print(load, rss_mb() - before, per_query)
+"""
+
+
+def build_index(path: str) -> int:
+    from llama_index.core import Document, Settings, VectorStoreIndex
+    from llama_index.core.embeddings import MockEmbedding
+    from llama_index.core.node_parser import SentenceSplitter
+
+    Settings.embed_model = MockEmbedding(embed_dim=DIM)
+    df = pd.read_csv(REVIEWS)
+    documents = [
+        Document(
+            text=f"Review: {review}\nSentiment: {sentiment}",
+            metadata={"sentiment": str(sentiment)},
+        )
+        for review, sentiment in zip(df["Reviews"].astype(str), df["Sentiments"])
+    ]
+    nodes = SentenceSplitter(chunk_size=512, chunk_overlap=50).get_nodes_from_documents(
+        documents
+    )
+    rng = np.random.default_rng(0)
+    for node in nodes:
+        node.embedding = rng.normal(size=DIM).tolist()
+    VectorStoreIndex(nodes).storage_context.persist(path)
+    return len(nodes)
+
+
+def measure(path: str, compact: bool) -> tuple:
+    code = LOAD.format(
+        root=os.path.abspath(ROOT), path=path, compact=compact, dim=DIM, queries=QUERIES
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    load, rss, per_query = map(float, out.stdout.split()[-3:])
+    return load, rss, per_query
+
+
+def size_mb(path: str, names) -> float:
+    return sum(os.path.getsize(os.path.join(path, n)) for n in names) / 2**20
+
+
+def main():
+    from src.rag.compact_store import compact_index
+
+    scratch = tempfile.mkdtemp(prefix="bench_compact_")
+    path = os.path.join(scratch, "index")
+    nodes = build_index(path)
+    start = time.perf_counter()
+    compact = compact_index(path)
+    convert = time.perf_counter() - start
+
+    json_files = [f for f in os.listdir(path) if f.endswith(".json")]
+    print(f"{nodes} nodes; compact_index() took {convert:.1f}s")
+    print(
+        f"{'store':>8} {'on disk MB':>11} {'load s':>7} {'RSS MB':>7} {'query ms':>9}"
+    )
+    for name, is_compact, disk in (
+        ("json", False, size_mb(path, json_files)),
+        ("compact", True, size_mb(compact, os.listdir(compact))),
+    ):
+        load, rss, per_query = measure(path, is_compact)
+        print(
+            f"{name:>8} {disk:>11.1f} {load:>7.2f} {rss:>7.0f} {per_query * 1000:>9.2f}"
+        )
+    shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# experiments/benchmarks/bench_context_packing.py
+"""
+Prompt context before vs. after token-budgeted packing (src/rag/context.py),
+over the questions in tests/prompt_eval_dataset.json.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_context_packing.py
+    python experiments/benchmarks/bench_context_packing.py --live
+
+Offline (default): retrieves the top-k reviews per question with TF-IDF over
+the raw review CSV, formatted as src/ingest.py indexes them, and reports the
+context tokens before/after packing, the packing time, and how many of each
+question's expected keywords are still present in the context.
+
+--live: runs the real RAG engine (needs faiss_index plus GROQ_API_KEY, or
+LLM_CACHE_MODE=replay) once with RAG_CONTEXT_TOKENS=0 and once with the
+budget, and reports input tokens, latency, and the evaluate_prompts keyword
+score of the answers.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+DATASET = os.path.join(ROOT, "tests", "prompt_eval_dataset.json")
+REVIEWS = os.path.join(ROOT, "data", "raw", "daraz-code-mixed-product-reviews.csv")
+
+
+def load_questions():
+    with open(DATASET) as f:
+        return json.load(f)
+
+
+def keyword_ratio(text: str, keywords: list) -> float:
+    text = text.lower()
+    return sum(k.lower() in text for k in keywords) / len(keywords)
+
+
+def run_offline(budget: int, top_k: int):
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from src.rag.context import count_tokens, pack_context, tokenizer_name
+
+    df = pd.read_csv(REVIEWS)
+    docs = [
+        f"Review: {r}\nSentiment: {s}" for r, s in zip(df["Reviews"], df["Sentiments"])
+    ]
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(docs)
+
+    print(f"tokenizer={tokenizer_name()} budget={budget} top_k={top_k}")
+    totals = np.zeros(4)
+    for item in load_questions():
+        question = item["question"]
+        scores = (matrix @ vectorizer.transform([question]).T).toarray().ravel()
+        top = np.argsort(-scores)[:top_k]
+        passages = [(docs[i], float(scores[i])) for i in top]
+
+        count_tokens.cache_clear()  # time packing with a cold encoding cache
+        start = time.perf_counter()
+        packed, stats = pack_context(question, passages, budget_tokens=budget)
+        ms = (time.perf_counter() - start) * 1e3
+
+        before = keyword_ratio(
+            " ".join(t for t, _ in passages), item["expected_keywords"]
+        )
+        after = keyword_ratio(" ".join(t for _, t in packed), item["expected_keywords"])
+        totals += (stats["tokens_before"], stats["tokens_after"], before, after)
+        print(
+            f"  {question[:45]:<45} tokens {stats['tokens_before']:>4} -> "
+            f"{stats['tokens_after']:>4}  kept {stats['kept']}/{stats['passages']} "
+            f"(filler {stats['filler']}, dup {stats['duplicates']})  "
+            f"keywords {before:.0%} -> {after:.0%}  pack {ms:.2f}ms"
+        )
+    n = len(load_questions())
+    print(
+        f"mean context tokens {totals[0] / n:.0f} -> {totals[1] / n:.0f} "
+        f"({1 - totals[1] / max(totals[0], 1):.0%} fewer), "
+        f"keyword coverage {totals[2] / n:.0%} -> {totals[3] / n:.0%}"
+    )
+
+
+def run_live_mode():
+    from src.rag.query import ask_rag
+
+    rows = []
+    for item in load_questions():
+        result = ask_rag(item["question"])
+        rows.append(
+            (
+                result["usage"]["input_tokens"],
+                result["latency_seconds"],
+                keyword_ratio(result["answer"], item["expected_keywords"]),
+            )
+        )
+    tokens, latency, score = np.array(rows).mean(axis=0)
+    budget = os.environ["RAG_CONTEXT_TOKENS"]
+    print(
+        f"budget={budget:<5} input_tokens={tokens:.0f} "
+        f"latency={latency:.2f}s keyword_score={score:.0%}"
+    )
+
+
+def run_live(budget: int, top_k: int):
+    # Fresh interpreter per setting: the engine is built once per process
+    for setting in (0, budget):
+        env = {
+            **os.environ,
+            "RAG_CONTEXT_TOKENS": str(setting),
+            "RAG_TOP_K": str(top_k),
+        }
+        out = subprocess.run(
+            [sys.executable, __file__, "--live-mode"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        print(out.stdout.strip().splitlines()[-1] if out.stdout else out.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=600, help="context tokens")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--live-mode", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.live_mode:
+        run_live_mode()
+    elif args.live:
+        run_live(args.budget, args.top_k)
+    else:
+        run_offline(args.budget, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# experiments/benchmarks/bench_degraded_ask.py
+"""
+/ask latency and error rate during injected LLM outages, without vs. with
+the latency budget + extractive fallback + circuit breaker
+(src/rag/degraded.py).
+
+Run from the repo root:
+    python experiments/benchmarks/bench_degraded_ask.py
+
+Retrieval returns five reviews from the raw CSV; the LLM is a stub that is
+healthy (300 ms), hanging (4 s per call) or failing (connection error after
+1 s), so no index or API key is needed.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+REVIEWS = os.path.join(ROOT, "data", "raw", "daraz-code-mixed-product-reviews.csv")
+REQUESTS = 32
+CLIENTS = 8
+BUDGET = 2.0
+QUESTION = "Is the delivery fast and is the product quality good?"
+
+
+def make_nodes():
+    df = pd.read_csv(REVIEWS).sample(5, random_state=0)
+    return [
+        SimpleNamespace(
+            node=SimpleNamespace(
+                get_content=lambda t=f"Review: {r}\nSentiment: {s}": t,
+                metadata={"sentiment": s},
+            )
+        )
+        for r, s in zip(df["Reviews"], df["Sentiments"])
+    ]
+
+
+def llm(mode):
+    def synthesize(nodes):
+        if mode == "healthy":
+            time.sleep(0.3)
+        elif mode == "hanging":
+            time.sleep(4.0)
+        else:
+            time.sleep(1.0)
+            raise ConnectionError("upstream unreachable")
+        return "Most buyers say delivery was quick and quality is fine."
+
+    return synthesize
+
+
+def run(mode, protected, nodes):
+    from src.rag.degraded import CircuitBreaker, answer_within_budget
+
+    breaker = (
+        CircuitBreaker(failure_threshold=5, reset_seconds=30) if protected else None
+    )
+    executor = ThreadPoolExecutor(8)
+    synthesize = llm(mode)
+    outcomes = []
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            if not protected:  # the old /ask: wait for the LLM, 500 on failure
+                synthesize(nodes)
+                outcomes.append("ok")
+                return time.perf_counter() - start
+            result = answer_within_budget(
+                QUESTION,
+                retrieve=lambda: nodes,
+                synthesize=synthesize,
+                budget_seconds=BUDGET,
+                breaker=breaker,
+                executor=executor,
+            )
+            status = "degraded" if result["degraded"] else "ok"
+        except Exception:
+            status = "error"  # what /ask turned into a 500
+        outcomes.append(status)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(CLIENTS) as pool:
+        ms = np.array(list(pool.map(one, range(REQUESTS)))) * 1e3
+    executor.shutdown(wait=False, cancel_futures=True)
+    print(
+        f"{mode:<8} {'budget+breaker' if protected else 'before':<15} "
+        f"p50={np.percentile(ms, 50):5.0f}ms p99={np.percentile(ms, 99):5.0f}ms "
+        f"errors={outcomes.count('error') / REQUESTS:4.0%} "
+        f"degraded={outcomes.count('degraded') / REQUESTS:4.0%}",
+        flush=True,
+    )
+    return outcomes
+
+
+def main():
+    nodes = make_nodes()
+    for mode in ("healthy", "hanging", "failing"):
+        for protected in (False, True):
+            run(mode, protected, nodes)
+
+    from src.rag.degraded import extractive_answer
+
+    print("\nExample degraded answer:")
+    answer, _ = extractive_answer(
+        QUESTION, [(n.node.get_content(), n.node.metadata) for n in nodes]
+    )
+    print(answer)
+
+
+if __name__ == "__main__":
+    main()
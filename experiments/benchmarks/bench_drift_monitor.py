@@ -0,0 +1,41 @@
+# experiments/benchmarks/bench_drift_monitor.py
+"""
+Per-request overhead of online drift monitoring on the /predict hot path.
+Run from the repo root: python experiments/benchmarks/bench_drift_monitor.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.app.drift import DriftMonitor, load_reference  # noqa: E402
+
+N = 100_000
+payload = {
+    "Original_Price": 1650,
+    "Discount_Price": 725,
+    "Number_of_Ratings": 31,
+    "Positive_Seller_Ratings": 86,
+    "Ship_On_Time": 0,
+    "Chat_Response_Rate": 93,
+    "No_of_products_to_be_sold": 113.79,
+    "Category": "Watches, Bags, Jewellery",
+    "Delivery_Type": "Free Delivery",
+    "Flagship_Store": "No",
+}
+
+monitor = DriftMonitor(load_reference())
+
+start = time.perf_counter()
+for _ in range(N):
+    monitor.observe(payload, 57.3)
+observe_us = (time.perf_counter() - start) / N * 1e6
+
+start = time.perf_counter()
+for _ in range(100):
+    monitor.compute()
+compute_ms = (time.perf_counter() - start) / 100 * 1e3
+
+print(f"observe(): {observe_us:.2f} us/request")
+print(f"compute(): {compute_ms:.3f} ms (every DRIFT_REFRESH_EVERY requests)")
@@ -0,0 +1,125 @@
+# experiments/benchmarks/bench_embed_batching.py
+"""
+Query embedding throughput and p95 latency at 1, 8 and 64 concurrent
+clients, with each query embedded on its own vs. through the micro-batcher
+(src/rag/micro_batch.py).
+
+Run from the repo root:
+    python experiments/benchmarks/bench_embed_batching.py
+
+With sentence-transformers installed and the MiniLM model available
+(EMBED_MODEL_PATH, as in src/rag/query.py), the real HuggingFaceEmbedding
+is measured. Otherwise a stand-in encoder is used. It holds one CPU core
+for FIXED_MS + PER_QUERY_MS x batch size per forward pass, which is the
+shape of a CPU MiniLM pass over short queries: tokenizer and dispatch
+overhead dominate, and each extra query adds little.
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+CLIENTS = (1, 8, 64)
+SECONDS = 3.0
+FIXED_MS = 8.0
+PER_QUERY_MS = 0.4
+MAX_BATCH = 32
+WAIT_MS = 2.0
+QUESTIONS = [
+    "Is the delivery fast?",
+    "How is the battery life of this phone?",
+    "Are the shoes true to size?",
+    "kya ye product original hai?",
+    "Does the watch strap break easily?",
+]
+
+
+class StandInEncoder:
+    """Embeds under one lock: a CPU-bound forward pass on a single core."""
+
+    def __init__(self, dim: int = 384):
+        self._lock = threading.Lock()
+        self._projection = np.random.default_rng(0).normal(size=(256, dim))
+
+    def _embed(self, queries, prompt_name=None):
+        with self._lock:
+            time.sleep((FIXED_MS + PER_QUERY_MS * len(queries)) / 1000)
+            counts = np.zeros((len(queries), 256))
+            for row, query in enumerate(queries):
+                for byte in query.encode():
+                    counts[row, byte] += 1
+            return (counts @ self._projection).tolist()
+
+    def _get_query_embedding(self, query):
+        return self._embed([query], prompt_name="query")[0]
+
+
+def load_encoder():
+    try:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+        path = os.getenv("EMBED_MODEL_PATH", "sentence-transformers/all-MiniLM-L6-v2")
+        return HuggingFaceEmbedding(model_name=path), "HuggingFaceEmbedding"
+    except Exception:
+        return StandInEncoder(), (
+            f"stand-in encoder ({FIXED_MS:g} ms + {PER_QUERY_MS:g} ms/query)"
+        )
+
+
+def run(embed_one, clients: int) -> tuple:
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + SECONDS
+
+    def client(seed: int):
+        i = seed
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            embed_one(QUESTIONS[i % len(QUESTIONS)])
+            with lock:
+                latencies.append(time.perf_counter() - start)
+            i += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client, range(clients)))
+    wall = time.perf_counter() - start
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+    return len(latencies) / wall, p95 * 1000
+
+
+def main():
+    from src.rag.micro_batch import MicroBatcher, query_batch_fn
+
+    encoder, name = load_encoder()
+    print(f"Encoder: {name}; micro-batch max {MAX_BATCH}, wait {WAIT_MS:g} ms")
+    print(
+        f"{'clients':>8} | {'single q/s':>10} {'p95 ms':>7} | "
+        f"{'batched q/s':>11} {'p95 ms':>7} {'mean batch':>10}"
+    )
+    for clients in CLIENTS:
+        single = run(encoder._get_query_embedding, clients)
+        batcher = MicroBatcher(
+            query_batch_fn(encoder),
+            max_batch_size=MAX_BATCH,
+            max_wait_seconds=WAIT_MS / 1000,
+        )
+        batched = run(batcher.submit, clients)
+        fill = batcher.items / max(1, batcher.batches)
+        print(
+            f"{clients:>8} | {single[0]:>10.0f} {single[1]:>7.1f} | "
+            f"{batched[0]:>11.0f} {batched[1]:>7.1f} {fill:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# experiments/benchmarks/bench_explain.py
+"""
+Cost of explaining predictions (src/app/explain.py) vs. predicting them,
+and vs. a naive permutation explainer, at batch sizes 1 to 1000:
+
+- predict: model.predict on the batch;
+- TreeSHAP: TreeExplainer.shap_values (exact);
+- permutation: Monte-Carlo Shapley estimates from PERMUTATIONS random
+  feature orderings per row, each ordering scored against BACKGROUND rows
+  (one model.predict per row). Approximate, and it needs a background set.
+
+for the shipped model (models/model.joblib) and a deeper 100-tree forest
+trained on synthetic data with the same 18 columns.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_explain.py
+
+The permutation baseline is timed on up to PERMUTATION_ROWS rows and
+scaled linearly (marked "~") beyond that.
+"""
+
+import json
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+BATCH_SIZES = (1, 10, 100, 1000)
+PERMUTATIONS = 10
+BACKGROUND = 50
+PERMUTATION_ROWS = 10
+
+
+def make_rows(n: int, n_features: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 2000, size=(n, n_features))
+    X[:, 7:] = rng.integers(0, 2, size=(n, n_features - 7))  # one-hot columns
+    return X
+
+
+def permutation_shap(model, X: np.ndarray, background: np.ndarray, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_features = X.shape[1]
+    out = np.zeros(X.shape)
+    for r, x in enumerate(X):
+        # Every (ordering, prefix length, background row) in one predict call
+        orders = [rng.permutation(n_features) for _ in range(PERMUTATIONS)]
+        batch = np.repeat(background[None], PERMUTATIONS * (n_features + 1), axis=0)
+        batch = batch.reshape(PERMUTATIONS, n_features + 1, len(background), -1)
+        for p, order in enumerate(orders):
+            for k in range(1, n_features + 1):
+                batch[p, k:, :, order[k - 1]] = x[order[k - 1]]
+        values = model.predict(batch.reshape(-1, n_features))
+        values = values.reshape(PERMUTATIONS, n_features + 1, -1).mean(2)
+        for p, order in enumerate(orders):
+            out[r, order] += np.diff(values[p]) / PERMUTATIONS
+    return out
+
+
+def timed(fn, *args) -> float:
+    fn(*args)  # warm-up
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench(name: str, model, n_features: int):
+    from src.app.explain import TreeExplainer
+
+    start = time.perf_counter()
+    explainer = TreeExplainer(model)
+    build = time.perf_counter() - start
+    print(f"\n{name}: {explainer.n_leaves} leaves, explainer built in {build:.2f}s")
+    print(f"{'rows':>6} {'predict ms':>11} {'TreeSHAP ms':>12} {'permutation ms':>15}")
+
+    X = make_rows(max(BATCH_SIZES), n_features)
+    background = make_rows(BACKGROUND, n_features, seed=1)
+    per_row = timed(permutation_shap, model, X[:PERMUTATION_ROWS], background)
+    per_row /= PERMUTATION_ROWS
+    for n in BATCH_SIZES:
+        predict = timed(model.predict, X[:n])
+        shap = timed(explainer.shap_values, X[:n])
+        if n <= PERMUTATION_ROWS:
+            permutation = (
+                f"{timed(permutation_shap, model, X[:n], background) * 1000:.1f}"
+            )
+        else:
+            permutation = f"~{per_row * n * 1000:.0f}"
+        print(f"{n:>6} {predict * 1000:>11.2f} {shap * 1000:>12.2f} {permutation:>15}")
+
+    phi = explainer.shap_values(X[:PERMUTATION_ROWS])
+    approx = permutation_shap(model, X[:PERMUTATION_ROWS], background)
+    gap = np.abs(
+        phi.sum(1) + explainer.expected_value - model.predict(X[:PERMUTATION_ROWS])
+    ).max()
+    print(f"  TreeSHAP additivity error: {gap:.1e}")
+    print(
+        "  permutation (sampled, background-based) vs TreeSHAP, mean abs diff: "
+        f"{np.abs(approx - phi).mean():.3f}"
+    )
+
+
+def main():
+    warnings.filterwarnings("ignore")  # feature names, sklearn version
+    shipped = joblib.load(os.path.join(ROOT, "models", "model.joblib"))
+    with open(os.path.join(ROOT, "models", "model_columns.json")) as f:
+        n_features = len(json.load(f))
+    bench("shipped model", shipped, n_features)
+
+    X = make_rows(2000, n_features, seed=2)
+    y = X[:, 6] / 20 + X[:, 0] * X[:, 3] / 4e4 + X[:, 8] * 10 + X[:, 5] / 50
+    deep = RandomForestRegressor(
+        n_estimators=100, max_depth=8, random_state=0, n_jobs=1
+    ).fit(X, y)
+    bench("100 trees, depth 8", deep, n_features)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# experiments/benchmarks/bench_feature_store.py
+"""
+Load time of the training matrix: CSV path (what train.py / evidently_report.py
+used to do) vs. the cached feature store.
+Run from the repo root: python experiments/benchmarks/bench_feature_store.py
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.app.feature_store import DATA_PATH, load_feature_store  # noqa: E402
+from src.app.features import (  # noqa: E402
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    TARGET_COLUMN,
+)
+
+REPEATS = 10
+
+
+def timed(fn):
+    fn()  # warm the OS page cache
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    return (time.perf_counter() - start) / REPEATS * 1e3, result
+
+
+def raw_csv_path():
+    df = pd.read_csv(DATA_PATH)
+    df = df.dropna(subset=NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN])
+    encoded = pd.get_dummies(df[CATEGORICAL_FEATURES], drop_first=True)
+    return pd.concat([df[NUMERIC_FEATURES], encoded], axis=1)
+
+
+def store_matrix():
+    store = load_feature_store()
+    return store.X_frame()
+
+
+def store_columnar():
+    return load_feature_store().frame()
+
+
+print(f"{'path':<38}{'ms/load':>10}{'MB in memory':>15}")
+for label, fn in (
+    ("raw CSV + dropna + get_dummies", raw_csv_path),
+    ("feature store X.npy (mmap)", store_matrix),
+    ("feature store features.parquet", store_columnar),
+):
+    ms, df = timed(fn)
+    mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"{label:<38}{ms:>10.1f}{mb:>15.2f}")
@@ -0,0 +1,54 @@
+# experiments/benchmarks/bench_guardrails.py
+"""
+Worst-case CustomGuardrails.check_input time on adversarial inputs, for the
+old backtracking Email pattern vs. the linear one (src/app/guardrails.py),
+with length caps turned off so the patterns themselves are measured.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_guardrails.py
+"""
+
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+OLD_EMAIL = r"[^@]+@[^@]+\.[^@]+"
+SIZES = (1_000, 2_000, 4_000, 8_000, 16_000, 32_000)
+INPUTS = {
+    "letters": lambda n: "a" * n,
+    "letters_at_letters": lambda n: "a" * (n // 2) + "@" + "a" * (n // 2),
+    "at_then_letters": lambda n: "@" + "a" * n,
+    "many_dots": lambda n: "a@" + "b." * (n // 2),
+    "cnic_near_miss": lambda n: "12345-123456-" * (n // 13),
+}
+
+
+def worst_case_ms(guardrails, n):
+    worst = 0.0
+    for make in INPUTS.values():
+        text = make(n)
+        start = time.perf_counter()
+        guardrails.check_input(text)
+        worst = max(worst, time.perf_counter() - start)
+    return worst * 1000
+
+
+def main():
+    from src.app.guardrails import MAX_INPUT_CHARS, CustomGuardrails, regex_backend
+
+    new = CustomGuardrails(max_input_chars=10**7)
+    old = CustomGuardrails(max_input_chars=10**7)
+    old._pii_regexes["Email"] = re.compile(OLD_EMAIL)
+
+    print(f"regex backend: {regex_backend()}, default cap {MAX_INPUT_CHARS} chars")
+    print(f"{'chars':>7} {'old worst ms':>13} {'new worst ms':>13}")
+    for n in SIZES:
+        print(f"{n:>7} {worst_case_ms(old, n):>13.2f} {worst_case_ms(new, n):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
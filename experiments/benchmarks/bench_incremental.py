@@ -0,0 +1,105 @@
+# experiments/benchmarks/bench_incremental.py
+"""
+Warm-start retraining (src/app/incremental.py) vs. full retraining, as the
+data grows by 5%, 10%, 25% and 50%.
+
+The feature store's train split is upsampled SCALE times (jittering every
+numeric column except "No. of products to be sold", which drives the
+target) to stand in for months of logged data. It is then shuffled and
+split into the base set and the new rows. Each strategy is scored on the
+store's real test split:
+
+- full: train.py's forest (10 trees, depth 5) refitted on base + new;
+- incremental: the base forest plus NEW_TREES trees fitted on the new rows;
+- incremental, capped: the same, keeping only the newest MAX_TREES trees.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_incremental.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+SCALE = 20
+GROWTH = (0.05, 0.10, 0.25, 0.50)
+PARAMS = {"n_estimators": 10, "max_depth": 5, "random_state": 42, "n_jobs": -1}
+NEW_TREES = 5
+MAX_TREES = 10
+
+
+def upsample(X: np.ndarray, y: np.ndarray, columns: list, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = np.tile(X, (SCALE, 1))
+    y = np.tile(y, SCALE)
+    jitter = rng.normal(1, 0.02, size=X.shape)
+    jitter[:, columns.index("No. of products to be sold")] = 1
+    jitter[:, 7:] = 1  # one-hot columns
+    order = rng.permutation(len(X))
+    return pd.DataFrame((X * jitter)[order], columns=columns), y[order]
+
+
+def rmse(model, X, y) -> float:
+    return float(np.sqrt(mean_squared_error(y, model.predict(X))))
+
+
+def timed_fit(fn):
+    start = time.perf_counter()
+    model = fn()
+    return model, time.perf_counter() - start
+
+
+def main():
+    from src.app.feature_store import load_feature_store
+    from src.app.incremental import grow_forest
+
+    store = load_feature_store()
+    X_all, y_all = upsample(
+        np.asarray(store.X[store.train_idx]),
+        np.asarray(store.y[store.train_idx]),
+        store.columns,
+    )
+    X_test, y_test = store.X_frame(store.test_idx), store.y_series(store.test_idx)
+
+    n_base = int(len(X_all) / (1 + max(GROWTH)))
+    X_base, y_base = X_all.iloc[:n_base], y_all[:n_base]
+    base_model = RandomForestRegressor(**PARAMS).fit(X_base, y_base)
+    print(f"base: {n_base} rows, RMSE {rmse(base_model, X_test, y_test):.3f}")
+    print(
+        f"{'growth':>7} {'new rows':>9} | {'full s':>7} {'RMSE':>6} | "
+        f"{'incr s':>7} {'RMSE':>6} | {'capped s':>8} {'RMSE':>6}"
+    )
+    for growth in GROWTH:
+        n_new = int(n_base * growth)
+        X_new = X_all.iloc[n_base : n_base + n_new]
+        y_new = y_all[n_base : n_base + n_new]
+        X_full = pd.concat([X_base, X_new])
+        y_full = np.concatenate([y_base, y_new])
+
+        full, full_s = timed_fit(
+            lambda: RandomForestRegressor(**PARAMS).fit(X_full, y_full)
+        )
+        incr, incr_s = timed_fit(
+            lambda: grow_forest(base_model, X_new, y_new, NEW_TREES)
+        )
+        capped, capped_s = timed_fit(
+            lambda: grow_forest(base_model, X_new, y_new, NEW_TREES, MAX_TREES)
+        )
+        print(
+            f"{growth:>7.0%} {n_new:>9} | {full_s:>7.2f} "
+            f"{rmse(full, X_test, y_test):>6.3f} | {incr_s:>7.2f} "
+            f"{rmse(incr, X_test, y_test):>6.3f} | {capped_s:>8.2f} "
+            f"{rmse(capped, X_test, y_test):>6.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
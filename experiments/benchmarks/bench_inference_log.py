@@ -0,0 +1,55 @@
+# experiments/benchmarks/bench_inference_log.py
+"""
+Handler-side overhead of the inference log and background writer throughput.
+Run from the repo root: python experiments/benchmarks/bench_inference_log.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.app.inference_log import InferenceLogger, schema_from_model  # noqa: E402
+from src.app.main import ProductFeatures, predict  # noqa: E402
+import src.app.main as main  # noqa: E402
+
+N = 200_000
+PAYLOAD = ProductFeatures.model_config["json_schema_extra"]["example"]
+
+with tempfile.TemporaryDirectory() as tmp:
+    schema = schema_from_model(ProductFeatures, {"predicted_success_score": float})
+    logger = InferenceLogger(tmp, {"predictions": schema}, max_queue=N).start()
+
+    # 1. Enqueue cost, as paid by the request handler
+    start = time.perf_counter()
+    for _ in range(N):
+        logger.log("predictions", {**PAYLOAD, "predicted_success_score": 42.0})
+    enqueue_us = (time.perf_counter() - start) / N * 1e6
+
+    # 2. Writer throughput (drain everything to Parquet)
+    start = time.perf_counter()
+    logger.close()
+    drain_s = time.perf_counter() - start
+    size = sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(tmp)
+        for f in files
+    )
+
+    # 3. /predict handler with and without logging
+    features = ProductFeatures(**PAYLOAD)
+    timings = {}
+    for label, log in (("off", None), ("on", InferenceLogger(tmp, logger.schemas))):
+        main.inference_log = log
+        start = time.perf_counter()
+        for _ in range(2000):
+            predict(features)
+        timings[label] = (time.perf_counter() - start) / 2000 * 1e6
+
+print(f"log() enqueue:      {enqueue_us:.2f} us/record (budget: 50 us)")
+print(f"writer throughput:  {N / drain_s:,.0f} records/s, {size / N:.1f} bytes/record")
+print(
+    f"/predict handler:   {timings['off']:.0f} us (log off) vs "
+    f"{timings['on']:.0f} us (log on)"
+)
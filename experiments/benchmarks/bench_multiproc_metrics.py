@@ -0,0 +1,152 @@
+# experiments/benchmarks/bench_multiproc_metrics.py
+"""
+Cost of multi-process Prometheus metrics (src/app/multiproc_metrics.py):
+
+1. per-request recording overhead of the /predict hot path (prediction
+   counter, cache counter, latency histogram), single-process vs. mmap
+   mode, with and without the cached label children in instrumentation.py;
+2. /metrics scrape latency (the merge over every worker's files) with
+   8 and 16 workers, and with 100 restarted workers' files left behind
+   before vs. after they are archived by mark_worker_dead().
+
+Run from the repo root:
+    python experiments/benchmarks/bench_multiproc_metrics.py
+
+Workers are forked processes that record a realistic spread of label
+values, so no gunicorn install is needed.
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+RECORDS = 100_000
+SCRAPES = 20
+
+HOT_PATH = """
+import sys, time
+sys.path.insert(0, {root!r})
+from src.app import instrumentation as m
+def raw():
+    m.PREDICTIONS_COUNTER.labels(model_version="v1.0").inc()
+    m.PREDICTION_CACHE_COUNTER.labels(result="miss").inc()
+    m.MODEL_LATENCY.labels(model="v1.0", path="served").observe(0.002)
+def cached():
+    m.observe_prediction("v1.0")
+    m.log_prediction_cache("miss")
+    m.log_model_latency("v1.0", 0.002)
+fn = {fn}
+fn()
+start = time.perf_counter()
+for _ in range({n}):
+    fn()
+print((time.perf_counter() - start) / {n} * 1e6)
+"""
+
+
+def hot_path_us(fn: str, multiproc_dir: str = None) -> float:
+    env = dict(os.environ)
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    if multiproc_dir:
+        env["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+    code = HOT_PATH.format(root=os.path.abspath(ROOT), fn=fn, n=RECORDS)
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def record_like_a_worker(seed: int):
+    from src.app import instrumentation as m
+
+    for i in range(200):
+        version = ("v1.0", "v2", "v3")[i % 3]
+        m.observe_prediction(version)
+        m.log_prediction_cache(("hit", "miss")[i % 2], 0.001)
+        m.log_model_latency(version, 0.0005 * (i % 20))
+        m.log_guardrail_event("input_validation", "blocked")
+        m.log_llm_metrics(0.2 * (i % 30), 300, 80)
+        m.log_single_flight(("leader", "follower")[i % 2])
+        m.log_llm_call_event(("retry", "hedge_fired")[i % 2])
+        m.log_sentiment({"positive": 3, "negative": 1})
+    m.log_feature_drift(
+        {f"f{j}": {"psi": 0.01 * seed, "ks": 0.02} for j in range(12)}, 200
+    )
+
+
+def spawn_workers(count: int) -> list:
+    pids = []
+    for seed in range(count):
+        pid = os.fork()
+        if pid == 0:
+            record_like_a_worker(seed)
+            os._exit(0)
+        os.waitpid(pid, 0)
+        pids.append(pid)
+    return pids
+
+
+def scrape_ms(path: str) -> float:
+    from src.app.multiproc_metrics import collect_latest
+
+    timings = []
+    for _ in range(SCRAPES):
+        start = time.perf_counter()
+        collect_latest(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def db_files(path: str) -> int:
+    return sum(f.endswith(".db") for f in os.listdir(path))
+
+
+def main():
+    scratch = tempfile.mkdtemp(prefix="bench_multiproc_")
+    print("Hot-path recording per /predict request (3 metric updates), us")
+    for fn in ("raw", "cached"):
+        single = hot_path_us(fn)
+        mmap_dir = os.path.join(scratch, f"hot_{fn}")
+        os.makedirs(mmap_dir)
+        multi = hot_path_us(fn, mmap_dir)
+        label = "metric.labels(...)" if fn == "raw" else "cached children"
+        print(f"  {label:<20} single-process {single:5.2f}   mmap {multi:5.2f}")
+
+    # Everything below records in forked workers, in mmap mode
+    path = os.path.join(scratch, "scrape")
+    os.makedirs(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    from src.app.multiproc_metrics import mark_worker_dead, reset_dir
+
+    print("\n/metrics scrape latency (median of 20), ms")
+    for workers in (8, 16):
+        reset_dir(path)
+        spawn_workers(workers)
+        print(
+            f"  {workers:>2} workers ({db_files(path):>3} files)   {scrape_ms(path):6.2f}"
+        )
+
+    reset_dir(path)
+    dead = spawn_workers(100)
+    spawn_workers(8)
+    before = scrape_ms(path)
+    print(f"  8 workers + 100 restarted ({db_files(path):>3} files)   {before:6.2f}")
+    start = time.perf_counter()
+    for pid in dead:
+        mark_worker_dead(pid, path)
+    archive_ms = (time.perf_counter() - start) * 1000 / len(dead)
+    after = scrape_ms(path)
+    print(f"  after archiving dead workers ({db_files(path):>3} files)   {after:6.2f}")
+    print(f"  mark_worker_dead: {archive_ms:.2f} ms per worker")
+    shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
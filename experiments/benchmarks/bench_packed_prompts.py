@@ -0,0 +1,115 @@
+# experiments/benchmarks/bench_packed_prompts.py
+"""
+Tokens per classified review, LLM calls and LLM time for packed few-shot
+prompts (src/rag/packed_prompts.py) at several pack sizes, on the 51
+reviews of data/eval.jsonl.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_packed_prompts.py
+
+The LLM is a local stub, so no API key is needed. Tokens are counted with
+the RAG tokenizer (src/rag/context.py). LLM time is simulated, not slept:
+250 ms per call plus 5 ms per output token, calls made one after another
+like the experiments do. 5% of packed replies are malformed (alternately
+truncated, or missing an item), to exercise the single-review fallback.
+Results are averaged over 20 shuffles of the reviews. Accuracy/F1 need the
+real model: see experiments/prompts/packed.py.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+CALL_SECONDS, OUTPUT_TOKEN_SECONDS = 0.25, 0.005
+MALFORMED_RATE = 0.05
+PASSES = 20
+PACK_SIZES = (1, 5, 10, 25, 51)
+ITEM_RE = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+
+# Same five examples as experiments/prompts/few_shot_k5.py and packed.py
+EXAMPLES = [
+    ("bohat achi cheez hai bhai zabardast sound", "positive"),
+    ("bakwas product hai bilkul time waste", "negative"),
+    ("theek hai lekin battery bohat jaldi khatam", "neutral"),
+    ("original product mila thanks daraz bohat khush hun", "positive"),
+    ("packing achi thi lekin item damaged tha", "negative"),
+]
+
+
+def main():
+    from src.rag.context import count_tokens
+    from src.rag.packed_prompts import build_preamble, classify_packed
+
+    with open(os.path.join(ROOT, "data", "eval.jsonl"), encoding="utf-8") as f:
+        data = [json.loads(line) for line in f]
+    truth = {" ".join(item["review"].split()): item["ground_truth"] for item in data}
+    preamble = build_preamble(EXAMPLES)
+    single_preamble = "\n\n".join(
+        f'Example {i}:\nReview: {review}\nAnswer: {{"sentiment": "{label}"}}'
+        for i, (review, label) in enumerate(EXAMPLES, 1)
+    )
+    rng = random.Random(0)
+    llm_seconds = [0.0]
+
+    def respond(prompt, output):
+        llm_seconds[0] += CALL_SECONDS + OUTPUT_TOKEN_SECONDS * count_tokens(output)
+        usage = {
+            "prompt_tokens": count_tokens(prompt),
+            "completion_tokens": count_tokens(output),
+        }
+        return output, usage
+
+    def complete(prompt, max_tokens):
+        body = prompt.rsplit("Now classify these reviews:\n", 1)[1]
+        lines = [line for line in body.splitlines() if ITEM_RE.match(line)]
+        answer = [
+            {"id": i, "sentiment": truth.get(ITEM_RE.sub("", line), "neutral")}
+            for i, line in enumerate(lines, 1)
+        ]
+        output = json.dumps(answer)
+        if rng.random() < MALFORMED_RATE:
+            if rng.random() < 0.5:
+                output = output[: len(output) // 2]
+            else:
+                output = json.dumps(answer[1:])
+        return respond(prompt, output)
+
+    def classify_one(review):
+        prompt = f"{single_preamble}\n\nNow classify this review. Return ONLY JSON:"
+        prompt += f"\n\nReview: {review}\n\nYour answer (JSON only):"
+        label = truth.get(" ".join(review.split()), "neutral")
+        _, usage = respond(prompt, json.dumps({"sentiment": label}))
+        return label, usage
+
+    print(f"{len(data)} reviews, mean of {PASSES} shuffles")
+    print(
+        f"{'pack':>4} {'calls':>6} {'fallback':>8} {'in tok/review':>13} "
+        f"{'tok/review':>10} {'LLM s':>6}"
+    )
+    reviews = [item["review"] for item in data]
+    for pack_size in PACK_SIZES:
+        totals = {}
+        llm_seconds[0] = 0.0
+        for _ in range(PASSES):
+            rng.shuffle(reviews)
+            _, stats = classify_packed(
+                reviews, complete, classify_one, pack_size=pack_size, preamble=preamble
+            )
+            stats["calls"] = stats["packed_calls"] + stats["single_calls"]
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        mean = {key: value / PASSES for key, value in totals.items()}
+        print(
+            f"{pack_size:>4} {mean['calls']:>6.1f} {mean['fallback_items']:>8.1f} "
+            f"{mean['input_tokens_per_review']:>13.1f} "
+            f"{mean['tokens_per_review']:>10.1f} {llm_seconds[0] / PASSES:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
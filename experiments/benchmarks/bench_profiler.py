@@ -0,0 +1,65 @@
+# experiments/benchmarks/bench_profiler.py
+"""
+/predict latency and throughput while the profiler is idle vs. while
+/admin/profile is sampling the worker (src/app/profiler.py), at a few
+sampling intervals. Also prints the hottest collapsed stacks.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_profiler.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+WINDOW = 3.0  # seconds of load per setting
+
+
+def main():
+    from src.app import main
+    from src.app.profiler import collapsed
+
+    main.prediction_cache = None
+    example = main.ProductFeatures.model_config["json_schema_extra"]["example"]
+    features = main.ProductFeatures(**example)
+    main.predict(features)
+
+    result = None
+    for interval in (None, 0.01, 0.005, 0.001):
+        timings, stop = [], threading.Event()
+
+        def load():
+            while not stop.is_set():
+                start = time.perf_counter()
+                main.predict(features)
+                timings.append(time.perf_counter() - start)
+
+        thread = threading.Thread(target=load)
+        thread.start()
+        if interval is None:
+            time.sleep(WINDOW)
+        else:
+            result = main.profiler.profile(WINDOW, interval=interval)
+        stop.set()
+        thread.join()
+
+        ms = np.array(timings) * 1e3
+        label = "idle" if interval is None else f"sampling every {interval * 1e3:g}ms"
+        print(
+            f"{label:<22} predict p50={np.percentile(ms, 50):.2f}ms "
+            f"p99={np.percentile(ms, 99):.2f}ms throughput={len(ms) / WINDOW:.0f}/s"
+        )
+
+    print(f"\nTop stacks ({result['samples']} samples at 1ms):")
+    for line in collapsed(result["stacks"]).splitlines()[:5]:
+        print("  ..." + line[-150:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# experiments/benchmarks/bench_rag_pool.py
+"""
+API worker RSS and /predict latency under mixed /predict + /ask load, with
+RAG embedded in the API process vs. forwarded to the RAG pool.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_rag_pool.py
+    python experiments/benchmarks/bench_rag_pool.py --handler synthetic
+
+The default handler is the real src.rag.query:ask_rag, which needs the FAISS
+index and GROQ_API_KEY. "synthetic" stands in for it with ~20 ms of
+GIL-holding Python work plus a 200 ms wait for the LLM.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+SYNTHETIC = "experiments.benchmarks.bench_rag_pool:synthetic_ask"
+N_PREDICT = 500
+ASK_CLIENTS = 4
+
+
+def synthetic_ask(question: str, budget_seconds: float = None) -> dict:
+    deadline = time.perf_counter() + 0.02
+    while time.perf_counter() < deadline:  # retrieval / embedding CPU work
+        sum(i * i for i in range(1000))
+    time.sleep(0.2)  # LLM round trip
+    return {"answer": question, "sources": [], "latency_seconds": 0.22}
+
+
+def rss_mb(pid="self") -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def children_rss_mb(pid: int) -> float:
+    """RSS of a process plus its direct children (the RAG pool workers)."""
+    total = rss_mb(pid)
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        total += rss_mb(entry)
+            except (OSError, IndexError):
+                continue
+    return total
+
+
+def run_mode(mode: str, handler: str):
+    os.environ["PREDICTION_CACHE_SIZE"] = "0"
+    server = None
+    if mode == "pool":
+        address = os.path.join(tempfile.mkdtemp(), "rag.sock")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.app.rag_pool", "--address", address]
+            + ["--workers", "2", "--handler", handler],
+            cwd=ROOT,
+        )
+        while not os.path.exists(address):
+            time.sleep(0.05)
+        os.environ["RAG_POOL_ADDRESS"] = address
+
+    from src.app import main
+
+    if mode == "embedded" and handler == SYNTHETIC:
+        main.ask_rag, main.RAG_READY = synthetic_ask, True
+
+    question = main.AskQuery(question="Which budget watches sell best?")
+    main.ask(question)  # warm up (loads the engine in whichever process runs it)
+
+    stop = threading.Event()
+    asked = []
+
+    def ask_loop():
+        while not stop.is_set():
+            main.ask(question)
+            asked.append(1)
+
+    threads = [threading.Thread(target=ask_loop) for _ in range(ASK_CLIENTS)]
+    for thread in threads:
+        thread.start()
+
+    example = main.ProductFeatures.model_config["json_schema_extra"]["example"]
+    timings = []
+    for price in np.random.default_rng(0).uniform(100, 5000, N_PREDICT):
+        features = main.ProductFeatures(**{**example, "Original_Price": float(price)})
+        start = time.perf_counter()
+        main.predict(features)
+        timings.append(time.perf_counter() - start)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    ms = np.array(timings) * 1e3
+    line = (
+        f"{mode:<9} api_rss={rss_mb():.0f}MB "
+        f"predict p50={np.percentile(ms, 50):.2f}ms p99={np.percentile(ms, 99):.2f}ms "
+        f"asks={len(asked)}"
+    )
+    if server is not None:
+        line += f" rag_pool_rss={children_rss_mb(server.pid):.0f}MB"
+        server.terminate()
+        server.wait()
+    print(line, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["embedded", "pool"], default=None)
+    parser.add_argument("--handler", default="src.rag.query:ask_rag")
+    args = parser.parse_args()
+    handler = SYNTHETIC if args.handler == "synthetic" else args.handler
+
+    if args.mode:
+        run_mode(args.mode, handler)
+        return
+    # Each mode in a fresh interpreter, so imports from one don't inflate the other
+    for mode in ("embedded", "pool"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--handler", handler],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        print(out.stdout.strip().splitlines()[-1] if out.stdout else out.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# experiments/benchmarks/bench_sentiment.py
+"""
+Throughput of the local sentiment classifier (src/app/sentiment.py), in
+process and through POST /sentiment, at several batch sizes, plus its
+accuracy/F1 on data/eval.jsonl (the set used for the LLM prompt strategies).
+
+Run from the repo root, after python train_sentiment.py:
+    python experiments/benchmarks/bench_sentiment.py
+"""
+
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+REVIEWS = os.path.join(ROOT, "data", "raw", "daraz-code-mixed-product-reviews.csv")
+EVAL = os.path.join(ROOT, "data", "eval.jsonl")
+MODEL = os.path.join(ROOT, "models", "sentiment.npz")
+
+
+def main():
+    from fastapi.testclient import TestClient
+    from sklearn.metrics import accuracy_score, f1_score
+
+    from src.app import main as api
+    from src.app.sentiment import SentimentClassifier
+
+    classifier = SentimentClassifier.load(MODEL)
+    with open(EVAL, encoding="utf-8") as f:
+        items = [json.loads(line) for line in f]
+    pred = classifier.predict([item["review"] for item in items])
+    truth = [item["ground_truth"] for item in items]
+    print(
+        f"eval.jsonl ({len(items)} reviews): "
+        f"accuracy={accuracy_score(truth, pred):.4f} "
+        f"f1_weighted={f1_score(truth, pred, average='weighted'):.4f}"
+    )
+
+    reviews = pd.read_csv(REVIEWS)["Reviews"].dropna().astype(str).tolist()
+    os.chdir(ROOT)  # the API loads models/ relative to the repo root
+    client = TestClient(api.app)
+    for batch_size in (1, 100, 1000, 10000):
+        batch = reviews[:batch_size]
+        repeats = max(1, 2000 // batch_size)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            classifier.predict(batch)
+        in_process = repeats * batch_size / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            client.post("/sentiment", json={"reviews": batch})
+        http = repeats * batch_size / (time.perf_counter() - start)
+        print(
+            f"batch={batch_size:<6} in-process {in_process:8.0f} reviews/s   "
+            f"POST /sentiment {http:8.0f} reviews/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
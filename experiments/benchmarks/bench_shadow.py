@@ -0,0 +1,59 @@
+# experiments/benchmarks/bench_shadow.py
+"""
+Primary /predict latency with and without shadow scoring of a candidate model.
+Run from the repo root: python experiments/benchmarks/bench_shadow.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ["PREDICTION_CACHE_SIZE"] = "0"  # every request must hit the model
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+
+from src.app import main  # noqa: E402
+from src.app.feature_store import load_feature_store  # noqa: E402
+from src.app.shadow import PRIMARY, ShadowScorer  # noqa: E402
+
+N = 2000
+rng = np.random.default_rng(0)
+example = main.ProductFeatures.model_config["json_schema_extra"]["example"]
+payloads = [
+    main.ProductFeatures(**{**example, "Original_Price": float(p)})
+    for p in rng.uniform(100, 5000, N)
+]
+
+# A heavier candidate than the primary, so shadow work is not free
+store = load_feature_store()
+candidate = RandomForestRegressor(n_estimators=50, max_depth=10, n_jobs=1)
+candidate.fit(store.X_frame(store.train_idx), store.y_series(store.train_idx))
+
+
+def run(label: str):
+    timings = []
+    for features in payloads:
+        start = time.perf_counter()
+        main.predict(features)
+        timings.append(time.perf_counter() - start)
+    ms = np.array(timings) * 1e3
+    print(
+        f"{label:<18} p50={np.percentile(ms, 50):.2f}ms "
+        f"p99={np.percentile(ms, 99):.2f}ms"
+    )
+
+
+main.predict(payloads[0])  # warm up
+run("primary only")
+
+main.shadow_scorer = ShadowScorer(
+    {PRIMARY: main.model, "candidate": candidate}, main.model_columns
+).start()
+main.candidates = {"candidate": candidate}
+run("with shadow")
+main.shadow_scorer.join()
+print(
+    f"shadow scored={main.shadow_scorer.scored} dropped={main.shadow_scorer.dropped}"
+)
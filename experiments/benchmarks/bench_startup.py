@@ -0,0 +1,98 @@
+# experiments/benchmarks/bench_startup.py
+"""
+Cold start of the API: time from launching uvicorn to the first successful
+/health and the first successful /predict. Exits non-zero when either is over
+budget, so it can gate CI.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_startup.py --health-budget 2 --predict-budget 5
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+PAYLOAD = {
+    "Original_Price": 1650,
+    "Discount_Price": 725,
+    "Number_of_Ratings": 31,
+    "Positive_Seller_Ratings": 86,
+    "Ship_On_Time": 0,
+    "Chat_Response_Rate": 93,
+    "No_of_products_to_be_sold": 113.79,
+    "Category": "Watches, Bags, Jewellery",
+    "Delivery_Type": "Free Delivery",
+    "Flagship_Store": "No",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(request, deadline: float, server) -> bool:
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            with urllib.request.urlopen(request, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--health-budget", type=float, default=2.0, help="seconds")
+    parser.add_argument("--predict-budget", type=float, default=5.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + args.timeout
+        health_ok = wait_for(f"{base}/health", deadline, server)
+        health = time.monotonic() - start
+        predict_request = urllib.request.Request(
+            f"{base}/predict",
+            data=json.dumps(PAYLOAD).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        predict_ok = health_ok and wait_for(predict_request, deadline, server)
+        predict = time.monotonic() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    failed = False
+    for name, ok, seconds, budget in (
+        ("first /health", health_ok, health, args.health_budget),
+        ("first /predict", predict_ok, predict, args.predict_budget),
+    ):
+        within = ok and seconds <= budget
+        failed |= not within
+        status = "ok" if within else "OVER BUDGET"
+        print(f"{name:<15} {seconds:6.2f}s (budget {budget:.1f}s) {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
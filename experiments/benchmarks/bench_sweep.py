@@ -0,0 +1,88 @@
+# experiments/benchmarks/bench_sweep.py
+"""
+What-if sweeps over Discount_Price x Chat_Response_Rate x Delivery_Type:
+one POST /predict/sweep vs. one POST /predict per variant (the pricing
+team's loop), through the in-process TestClient, so HTTP parsing and JSON
+are counted but not the network.
+
+Run from the repo root:
+    python experiments/benchmarks/bench_sweep.py
+
+The /predict loop is timed on LOOP_VARIANTS calls (with the prediction
+cache off) and scaled linearly (marked "~").
+"""
+
+import os
+import statistics
+import sys
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.append(ROOT)
+
+BASE = {
+    "Original_Price": 1650,
+    "Discount_Price": 725,
+    "Number_of_Ratings": 31,
+    "Positive_Seller_Ratings": 86,
+    "Ship_On_Time": 0,
+    "Chat_Response_Rate": 93,
+    "No_of_products_to_be_sold": 113.79,
+    "Category": "Watches, Bags, Jewellery",
+    "Delivery_Type": "Free Delivery",
+    "Flagship_Store": "No",
+}
+# (Discount_Price points, Chat_Response_Rate points); x2 delivery types
+GRIDS = ((5, 10), (50, 10), (50, 100), (250, 100))
+LOOP_VARIANTS = 200
+REPEATS = 5
+
+
+def sweep_body(prices: int, rates: int) -> dict:
+    return {
+        "base": BASE,
+        "grid": {
+            "Discount_Price": {"start": 100, "stop": 1650, "num": prices},
+            "Chat_Response_Rate": {"start": 0, "stop": 100, "num": rates},
+            "Delivery_Type": ["Free Delivery", "Standard Delivery"],
+        },
+        "constraints": {"Discount_Price": {"max": 1200}},
+    }
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    os.environ["PREDICTION_CACHE_SIZE"] = "0"
+    from fastapi.testclient import TestClient
+
+    from src.app.main import app
+
+    client = TestClient(app)
+    client.post("/predict/sweep", json=sweep_body(2, 2))  # loads the model
+
+    start = time.perf_counter()
+    for i in range(LOOP_VARIANTS):
+        client.post("/predict", json={**BASE, "Discount_Price": 100 + i})
+    per_call = (time.perf_counter() - start) / LOOP_VARIANTS
+
+    print(f"{'variants':>9} {'sweep ms':>9} {'/predict loop ms':>17} {'speed-up':>9}")
+    for prices, rates in GRIDS:
+        body = sweep_body(prices, rates)
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            response = client.post("/predict/sweep", json=body)
+            timings.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        variants = prices * rates * 2
+        sweep = statistics.median(timings)
+        loop = per_call * variants
+        print(
+            f"{variants:>9} {sweep * 1000:>9.1f} {'~%.0f' % (loop * 1000):>17}"
+            f" {loop / sweep:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 import json
 import os
 import time  # <--- Essential for rate limiting
+import sys
 from groq import Groq
 import mlflow
 from sklearn.metrics import accuracy_score, f1_score
@@ -10,7 +11,11 @@ from sklearn.metrics import accuracy_score, f1_score
 mlflow.set_tracking_uri("http://localhost:5000")
 mlflow.set_experiment("prompt_engineering_d1")
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.rag.llm_cache import CachedGroqClient  # noqa: E402
+
+# LLM_CACHE_MODE=record|replay makes re-runs free (see src/rag/llm_cache.py)
+client = CachedGroqClient(Groq(api_key=os.getenv("GROQ_API_KEY")))
 
 # --- PROMPT ---
 # We use double braces {{ }} for the JSON examples so Python doesn't crash.
@@ -43,6 +48,7 @@ print(f"Starting Chain-of-Thought classification on {len(data)} items...")
 
 # --- CLASSIFICATION LOOP ---
 for i, item in enumerate(data):
+    hits_before = client.cache.hits
     try:
         response = client.chat.completions.create(
             model="llama-3.1-8b-instant",  # Updated Model
@@ -79,7 +85,9 @@ for i, item in enumerate(data):
     results.append(parsed)
 
     # Sleep 1 second to respect Groq rate limits
-    time.sleep(1)
+    # (cache hits never touch the API, so they don't need it)
+    if client.cache.hits == hits_before:
+        time.sleep(1)
 
 # --- METRICS & LOGGING ---
 pred = [r.get("sentiment", "neutral") for r in results]
@@ -100,3 +108,4 @@ with open("../results/cot.json", "w", encoding="utf-8") as f:
     )
 
 print(f"Chain-of-Thought → Accuracy: {acc:.4f} | F1: {f1:.4f}")
+print(client.cache.report())
@@ -0,0 +1,137 @@
+# experiments/prompts/packed.py
+# Few-shot (k=5) classification with several reviews per prompt, sharing one
+# preamble (see src/rag/packed_prompts.py). Usage: python packed.py [1 5 10 25]
+import json
+import os
+import sys
+from groq import Groq
+import mlflow
+from sklearn.metrics import accuracy_score, f1_score
+import time
+
+mlflow.set_tracking_uri("http://localhost:5000")
+mlflow.set_experiment("prompt_engineering_d1")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.rag.llm_cache import CachedGroqClient  # noqa: E402
+from src.rag.packed_prompts import build_preamble, classify_packed  # noqa: E402
+
+# LLM_CACHE_MODE=record|replay makes re-runs free (see src/rag/llm_cache.py)
+client = CachedGroqClient(Groq(api_key=os.getenv("GROQ_API_KEY")))
+MODEL = "llama-3.1-8b-instant"
+
+# Same five examples as few_shot_k5.py, shown once per pack instead of per review
+EXAMPLES = [
+    ("bohat achi cheez hai bhai zabardast sound", "positive"),
+    ("bakwas product hai bilkul time waste", "negative"),
+    ("theek hai lekin battery bohat jaldi khatam", "neutral"),
+    ("original product mila thanks daraz bohat khush hun", "positive"),
+    ("packing achi thi lekin item damaged tha", "negative"),
+]
+PREAMBLE = build_preamble(EXAMPLES)
+
+# Single-review prompt for pack size 1 and for items a packed reply missed
+SINGLE_PROMPT = (
+    "\n\n".join(
+        f'Example {i}:\nReview: {review}\nAnswer: {{{{"sentiment": "{label}"}}}}'
+        for i, (review, label) in enumerate(EXAMPLES, 1)
+    )
+    + """\n\nNow classify this review. Return ONLY JSON:
+
+Review: {review}
+
+Your answer (JSON only):"""
+)
+
+PACK_SIZES = [int(n) for n in sys.argv[1:]] or [1, 5, 10, 25]
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "eval.jsonl")
+
+with open(DATA_PATH, encoding="utf-8") as f:
+    data = [json.loads(line) for line in f]
+
+
+def _usage(response):
+    usage = getattr(response, "usage", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+        "completion_tokens": getattr(usage, "completion_tokens", 0),
+    }
+
+
+def complete(prompt, max_tokens):
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0,
+        max_tokens=max_tokens,
+    )
+    return response.choices[0].message.content.strip(), _usage(response)
+
+
+def classify_one(review):
+    try:
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": SINGLE_PROMPT.format(review=review)}],
+            temperature=0.0,
+            max_tokens=100,
+        )
+        output = response.choices[0].message.content.strip()
+        start, end = output.find("{"), output.rfind("}") + 1
+        parsed = json.loads(output[start:end]) if start != -1 and end > 0 else {}
+        return parsed.get("sentiment", "neutral"), _usage(response)
+    except Exception as e:
+        print(f"Single call error: {e}")
+        return "neutral", None
+
+
+def rate_limit():
+    # Sleep to prevent hitting Rate Limits (429 Errors); cache hits don't need it
+    if client.cache.hits == rate_limit.hits:
+        time.sleep(1)
+    rate_limit.hits = client.cache.hits
+
+
+rate_limit.hits = 0
+true = [item["ground_truth"] for item in data]
+reviews = [item["review"] for item in data]
+summary = []
+
+for pack_size in PACK_SIZES:
+    print(f"Pack size {pack_size}: classifying {len(data)} items...")
+    rate_limit.hits = client.cache.hits
+    pred, stats = classify_packed(
+        reviews,
+        complete,
+        classify_one,
+        pack_size=pack_size,
+        preamble=PREAMBLE,
+        on_call=rate_limit,
+    )
+    stats["accuracy"] = accuracy_score(true, pred)
+    stats["f1_weighted"] = f1_score(true, pred, average="weighted")
+    summary.append(stats)
+
+    with mlflow.start_run(run_name=f"packed_n{pack_size}"):
+        mlflow.log_params({"strategy": "few_shot_packed", "k": 5, "pack_size": pack_size})
+        mlflow.log_metrics(
+            {k: v for k, v in stats.items() if k not in ("reviews", "pack_size")}
+        )
+        mlflow.log_artifact(DATA_PATH)
+
+os.makedirs("../results", exist_ok=True)
+with open("../results/packed.json", "w", encoding="utf-8") as f:
+    json.dump(summary, f, indent=2)
+
+print(
+    f"{'pack':>4} {'calls':>6} {'fallback':>8} {'in tok/review':>13} "
+    f"{'tok/review':>10} {'wall s':>7} {'accuracy':>8} {'f1':>6}"
+)
+for s in summary:
+    print(
+        f"{s['pack_size']:>4} {s['packed_calls'] + s['single_calls']:>6} "
+        f"{s['fallback_items']:>8} {s['input_tokens_per_review']:>13.1f} "
+        f"{s['tokens_per_review']:>10.1f} {s['seconds']:>7.1f} "
+        f"{s['accuracy']:>8.4f} {s['f1_weighted']:>6.4f}"
+    )
+print(client.cache.report())
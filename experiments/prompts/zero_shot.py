@@ -1,6 +1,7 @@
 # experiments/prompts/zero_shot.py   ← REPLACE YOUR FILE WITH THIS EXACT CODE
 import json
 import os
+import sys
 from groq import Groq
 import mlflow
 from sklearn.metrics import accuracy_score, f1_score
@@ -11,7 +12,11 @@ mlflow.set_tracking_uri("http://localhost:5000")
 mlflow.set_experiment("prompt_engineering_d1")
 
 # Groq client
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.rag.llm_cache import CachedGroqClient  # noqa: E402
+
+# LLM_CACHE_MODE=record|replay makes re-runs free (see src/rag/llm_cache.py)
+client = CachedGroqClient(Groq(api_key=os.getenv("GROQ_API_KEY")))
 
 # PROMPT — NO { } THAT CAN BREAK .format()
 PROMPT = """Classify this Daraz review as positive, negative, or neutral.
@@ -36,6 +41,7 @@ results = []
 print(f"Starting classification on {len(data)} items...")
 
 for i, item in enumerate(data):
+    hits_before = client.cache.hits
     try:
         response = client.chat.completions.create(
             model="llama-3.1-8b-instant",
@@ -67,7 +73,9 @@ for i, item in enumerate(data):
     results.append(parsed)
 
     # Sleep to prevent hitting Rate Limits (429 Errors)
-    time.sleep(1)
+    # (cache hits never touch the API, so they don't need it)
+    if client.cache.hits == hits_before:
+        time.sleep(1)
 
 
 # Calculate metrics
@@ -90,3 +98,4 @@ with open("../results/zero_shot.json", "w", encoding="utf-8") as f:
     )
 
 print(f"ZERO-SHOT DONE → Accuracy: {acc:.4f} | F1: {f1:.4f}")
+print(client.cache.report())
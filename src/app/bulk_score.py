@@ -0,0 +1,223 @@
+# src/app/bulk_score.py
+"""
+Bulk scoring of product files, without going through HTTP.
+
+    python -m src.app.bulk_score data/raw/Top_Selling_Product_Data.csv \
+        scores.parquet --workers 4
+
+- Input is CSV or Parquet, read in chunks of --chunk-rows rows, with either
+  the raw/training column names (like Top_Selling_Product_Data.csv) or the
+  API field names. Extra columns are passed through to the output.
+- Each chunk is encoded with the same encode_features() as /predict and
+  scored with the same [1, 100] clipping. Rows with a missing feature get
+  an empty score instead of failing the run.
+- Chunks are scored in a process pool. The model is loaded once in the
+  parent, and forked workers share it, each predicting on one core. Only --workers x 2 chunks are ever
+  in flight, and results are appended to the output in input order as they
+  complete, so memory stays bounded however large the input is.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .features import (
+    API_TO_TRAINING_COLUMNS,
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    encode_features,
+)
+
+MODEL_PATH = os.path.join("models", "model.joblib")
+MODEL_COLS_PATH = os.path.join("models", "model_columns.json")
+SCORE_COLUMN = "predicted_success_score"
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+# --- Worker state (inherited on fork, or set by _init_worker) ---
+_model = None
+_model_columns = None
+
+
+def _init_worker(model_path: str, model_columns: list):
+    global _model, _model_columns
+    if _model is None:
+        import joblib
+
+        _model = joblib.load(model_path)
+    _model_columns = model_columns
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """The chunk with a score column; NaN where a feature is missing."""
+    raw = chunk.rename(columns=API_TO_TRAINING_COLUMNS)
+    missing = [c for c in FEATURES if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {missing}")
+    valid = raw[FEATURES].notna().all(axis=1).to_numpy()
+    scores = np.full(len(chunk), np.nan)
+    if valid.any():
+        X = encode_features(raw.loc[valid, FEATURES], _model_columns)
+        scores[valid] = np.clip(_model.predict(X), 1, 100)
+    return chunk.assign(**{SCORE_COLUMN: scores})
+
+
+def read_chunks(path: str, chunk_rows: int):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        categoricals = {**API_TO_TRAINING_COLUMNS, **{c: c for c in FEATURES}}
+        dtypes = {
+            name: str
+            for name, column in categoricals.items()
+            if column in CATEGORICAL_FEATURES
+        }
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype=dtypes)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._schema = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _table(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+
+        # pandas infers dtypes per chunk (an int column with a gap becomes
+        # float), so pass-through columns are widened to one schema for all
+        for column in chunk.columns:
+            dtype = chunk[column].dtype
+            if pd.api.types.is_integer_dtype(dtype):
+                chunk[column] = chunk[column].astype("float64")
+            elif pd.api.types.is_object_dtype(dtype):
+                chunk[column] = chunk[column].astype("string")
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._schema is None:
+            self._schema = table.schema
+        return table.cast(self._schema)
+
+    def write(self, chunk: pd.DataFrame):
+        if not self.parquet:
+            header = not os.path.exists(self.path)
+            chunk.to_csv(self.path, mode="a", header=header, index=False)
+            return
+        import pyarrow.parquet as pq
+
+        table = self._table(chunk)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def bulk_score(
+    source: str,
+    output: str,
+    workers: int = 1,
+    chunk_rows: int = 100_000,
+    keep: list = None,
+    model_path: str = MODEL_PATH,
+    model_columns_path: str = MODEL_COLS_PATH,
+) -> dict:
+    """Scores source into output; returns rows, seconds and rows/second."""
+    global _model
+
+    with open(model_columns_path) as f:
+        model_columns = json.load(f)
+    _model = None  # loaded here, before the pool forks
+    _init_worker(model_path, model_columns)
+    if workers > 1 and hasattr(_model, "n_jobs"):
+        # The pool is the parallelism: a forest trained with n_jobs=-1 would
+        # start a CPU-sized thread pool in every worker
+        _model.n_jobs = 1
+
+    start = time.perf_counter()
+    rows = 0
+    writer = ChunkWriter(output)
+
+    def emit(scored):
+        nonlocal rows
+        if keep is not None:
+            scored = scored[keep + [SCORE_COLUMN]]
+        writer.write(scored)
+        rows += len(scored)
+
+    try:
+        if workers <= 1:
+            for chunk in read_chunks(source, chunk_rows):
+                emit(score_chunk(chunk))
+        else:
+            # fork shares the parent's loaded model with every worker
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(model_path, model_columns),
+            ) as pool:
+                in_flight = deque()
+                for chunk in read_chunks(source, chunk_rows):
+                    if len(in_flight) >= 2 * workers:
+                        emit(in_flight.popleft().result())
+                    in_flight.append(pool.submit(score_chunk, chunk))
+                while in_flight:
+                    emit(in_flight.popleft().result())
+    finally:
+        writer.close()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a product file in bulk")
+    parser.add_argument("source", help="CSV or Parquet with product features")
+    parser.add_argument("output", help=".csv or .parquet output path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument(
+        "--keep",
+        default=None,
+        help="comma-separated input columns to write next to the score "
+        "(default: all of them)",
+    )
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--model-columns", default=MODEL_COLS_PATH)
+    args = parser.parse_args()
+
+    keep = args.keep.split(",") if args.keep else None
+    result = bulk_score(
+        args.source,
+        args.output,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+        keep=keep,
+        model_path=args.model,
+        model_columns_path=args.model_columns,
+    )
+    print(
+        f"Scored {result['rows']} rows into {args.output} in "
+        f"{result['seconds']:.1f}s ({result['rows_per_second']:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
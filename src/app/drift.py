@@ -0,0 +1,221 @@
+# src/app/drift.py
+"""
+Online drift monitoring over live /predict traffic.
+
+A reference profile (quantile bin edges + bin probabilities for numeric
+features, category frequencies for categorical ones) is computed once from the
+training split and saved to models/drift_reference.json. At serving time
+DriftMonitor keeps fixed-size bin counts for a sliding window of recent
+requests and periodically compares them to the reference with PSI and a
+binned KS statistic.
+
+The window is a ring of N slots: when the active slot fills up, the oldest
+one is cleared and reused, so memory never grows with traffic.
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from .features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TRAINING_TO_API_COLUMNS
+
+REFERENCE_PATH = os.path.join("models", "drift_reference.json")
+PREDICTION_FEATURE = "prediction"
+EPSILON = 1e-4
+
+
+# --- Reference profiles ---
+def numeric_reference(values, n_bins: int = 10) -> dict:
+    """Quantile bin edges (inner edges only) and training bin probabilities."""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    counts = np.bincount(
+        np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1
+    )
+    return {
+        "type": "numeric",
+        "edges": edges.tolist(),
+        "probs": (counts / counts.sum()).tolist(),
+    }
+
+
+def categorical_reference(values) -> dict:
+    values = [str(v) for v in values]
+    categories = sorted(set(values))
+    counts = [values.count(c) for c in categories] + [0]
+    total = sum(counts)
+    return {
+        "type": "categorical",
+        "categories": categories,
+        "probs": [c / total for c in counts],
+    }
+
+
+def build_reference(df, predictions=None, n_bins: int = 10) -> dict:
+    """
+    Builds the reference profile from a frame of raw training rows
+    (training column names) and, optionally, the model's scores on them.
+    Profiles are keyed by API field name so they match ProductFeatures.
+    """
+    reference = {}
+    for column in NUMERIC_FEATURES:
+        reference[TRAINING_TO_API_COLUMNS[column]] = numeric_reference(
+            df[column], n_bins
+        )
+    for column in CATEGORICAL_FEATURES:
+        reference[TRAINING_TO_API_COLUMNS[column]] = categorical_reference(df[column])
+    if predictions is not None:
+        reference[PREDICTION_FEATURE] = numeric_reference(predictions, n_bins)
+    return reference
+
+
+def save_reference(reference: dict, path: str = REFERENCE_PATH):
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+
+
+def load_reference(path: str = REFERENCE_PATH) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# --- Drift statistics ---
+def psi(ref_probs, cur_probs) -> float:
+    """Population Stability Index. < 0.1 stable, 0.1-0.25 moderate, > 0.25 drift."""
+    total = 0.0
+    for r, c in zip(ref_probs, cur_probs):
+        r = max(r, EPSILON)
+        c = max(c, EPSILON)
+        total += (c - r) * math.log(c / r)
+    return total
+
+
+def binned_ks(ref_probs, cur_probs) -> float:
+    """Max distance between the two CDFs, evaluated at the bin edges."""
+    ref_cdf = cur_cdf = worst = 0.0
+    for r, c in zip(ref_probs, cur_probs):
+        ref_cdf += r
+        cur_cdf += c
+        worst = max(worst, abs(ref_cdf - cur_cdf))
+    return worst
+
+
+# --- Online monitor ---
+class DriftMonitor:
+    def __init__(
+        self,
+        reference: dict,
+        window_size: int = 1000,
+        n_slots: int = 10,
+        min_samples: int = 50,
+    ):
+        self.reference = reference
+        self.features = list(reference)
+        self.min_samples = min_samples
+        self.slot_size = max(1, window_size // n_slots)
+
+        # Per-feature bucketing: bisect over edges for numeric features,
+        # a dict lookup (unknown -> last bucket) for categorical ones.
+        self._edges = {}
+        self._category_index = {}
+        n_buckets = {}
+        for name, ref in reference.items():
+            if ref["type"] == "numeric":
+                self._edges[name] = ref["edges"]
+            else:
+                self._category_index[name] = {
+                    c: i for i, c in enumerate(ref["categories"])
+                }
+            n_buckets[name] = len(ref["probs"])
+
+        self._slots = [
+            {name: [0] * n for name, n in n_buckets.items()} for _ in range(n_slots)
+        ]
+        self._slot_totals = [0] * n_slots
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _bucket(self, name: str, value) -> int:
+        edges = self._edges.get(name)
+        if edges is not None:
+            return bisect.bisect_right(edges, value)
+        index = self._category_index[name]
+        return index.get(str(value), len(index))
+
+    def observe(self, features: dict, prediction: float = None):
+        """Hot path: a handful of bisects and list increments per request."""
+        buckets = []
+        for name in self.features:
+            if name == PREDICTION_FEATURE:
+                if prediction is None:
+                    continue
+                value = prediction
+            else:
+                value = features.get(name)
+                if value is None:
+                    continue
+            buckets.append((name, self._bucket(name, value)))
+
+        with self._lock:
+            if self._slot_totals[self._active] >= self.slot_size:
+                self._active = (self._active + 1) % len(self._slots)
+                slot = self._slots[self._active]
+                for counts in slot.values():
+                    counts[:] = [0] * len(counts)
+                self._slot_totals[self._active] = 0
+            slot = self._slots[self._active]
+            for name, bucket in buckets:
+                slot[name][bucket] += 1
+            self._slot_totals[self._active] += 1
+
+    @property
+    def window_count(self) -> int:
+        return sum(self._slot_totals)
+
+    def _window_counts(self, name: str) -> list:
+        counts = [0] * len(self.reference[name]["probs"])
+        for slot in self._slots:
+            for i, c in enumerate(slot[name]):
+                counts[i] += c
+        return counts
+
+    def compute(self) -> dict:
+        """
+        Drift per feature over the current window:
+        {feature: {"psi": ..., "ks": ... (numeric only), "n": ...}}.
+        Returns {} until the window holds min_samples requests.
+        """
+        with self._lock:
+            window = {name: self._window_counts(name) for name in self.features}
+
+        results = {}
+        for name, counts in window.items():
+            n = sum(counts)
+            if n < self.min_samples:
+                continue
+            ref_probs = self.reference[name]["probs"]
+            cur_probs = [c / n for c in counts]
+            stats = {"psi": psi(ref_probs, cur_probs), "n": n}
+            if self.reference[name]["type"] == "numeric":
+                stats["ks"] = binned_ks(ref_probs, cur_probs)
+            results[name] = stats
+        return results
+
+
+if __name__ == "__main__":
+    # Rebuilds models/drift_reference.json from the training split in the
+    # feature store, scored by the current model (same split as train.py).
+    import joblib
+
+    from .feature_store import load_feature_store
+
+    store = load_feature_store()
+    model = joblib.load(os.path.join("models", "model.joblib"))
+    scores = np.clip(model.predict(store.X_frame(store.train_idx)), 1, 100)
+    save_reference(build_reference(store.raw_frame(store.train_idx), scores))
+    print(f"Drift reference saved to {REFERENCE_PATH} ({len(scores)} rows)")
@@ -0,0 +1,199 @@
+# src/app/explain.py
+"""
+Exact per-prediction feature attributions (SHAP values) for tree ensembles.
+
+TreeExplainer implements path-dependent TreeSHAP (Lundberg et al., 2018)
+for sklearn regression forests and trees. Every prediction is split into
+expected_value + one contribution per feature, and the contributions sum
+exactly to the model's raw output.
+
+A leaf's contributions depend on the row only through which of the leaf's
+path features the row "follows" (meets every split on that feature along
+the path). With d distinct features on a path there are 2**d such patterns.
+So everything else is computed once, up front (Fast TreeSHAP v2, Yang 2021):
+
+- per node: the slot of its feature within the path, so a bitmask over
+  slots can be pushed down the trees;
+- per leaf and pattern: the TreeSHAP contributions, from the EXTEND/UNWIND
+  weight recurrences over the path's zero fractions (training cover).
+
+Explaining a batch is then one level-by-level pass over the trees, with
+vectorized split decisions for all rows, followed by a table lookup per
+leaf. There is no per-row or per-node Python loop. Leaf groups whose table
+would be too large run the recurrences at request time instead,
+vectorized over rows x leaves.
+"""
+
+import numpy as np
+
+_STATE_ELEMENTS = 4_000_000  # rows x nodes per block of rows
+_TABLE_ELEMENTS = 2**23  # per path-length group; larger groups skip the table
+
+
+def _trees(model) -> list:
+    if hasattr(model, "estimators_"):
+        return [est.tree_ for est in model.estimators_]
+    if hasattr(model, "tree_"):
+        return [model.tree_]
+    raise TypeError(f"Not a tree model: {type(model).__name__}")
+
+
+class _PathGroup:
+    """All leaf paths with the same number d of distinct features."""
+
+    def __init__(self, leaves: list, n_models: int, n_features: int):
+        import scipy.sparse as sp
+
+        # leaves: [(global node id, value, [features], [zero fractions])]
+        d = len(leaves[0][2])
+        self.depth = d
+        self.leaf_ids = np.array([leaf[0] for leaf in leaves], dtype=np.intp)
+        self.values = np.array([leaf[1] for leaf in leaves]) / n_models
+        self.features = np.array([leaf[2] for leaf in leaves], dtype=np.intp)
+        self.zero = np.array([leaf[3] for leaf in leaves], dtype=np.float64)
+        self.features = self.features.reshape(len(leaves), d)
+        self.zero = self.zero.reshape(len(leaves), d)
+        # Sums (leaf, path slot) contributions into their features
+        self.scatter = sp.csr_matrix(
+            (
+                np.ones(self.features.size),
+                (np.arange(self.features.size), self.features.ravel()),
+            ),
+            shape=(self.features.size, n_features),
+        )
+        self.table = None
+        if (2**d) * self.features.size <= _TABLE_ELEMENTS:
+            patterns = (np.arange(2**d)[:, None] >> np.arange(d)) & 1
+            one = np.broadcast_to(patterns[:, None, :], (2**d, len(leaves), d))
+            # Row (leaf * 2**d + pattern) holds that leaf's contributions
+            table = self.contributions(one.astype(np.float64)).transpose(1, 0, 2)
+            self.table = np.ascontiguousarray(table).reshape(-1, d)
+            self.offsets = np.arange(len(leaves)) * 2**d
+
+    def contributions(self, one: np.ndarray) -> np.ndarray:
+        """
+        TreeSHAP weight recurrences for one fractions of shape (rows, leaves,
+        d). Returns the (rows, leaves, d) contribution of each path slot.
+        """
+        d, zero = self.depth, self.zero
+
+        # EXTEND: the dummy root element, then each path feature in turn
+        w = np.zeros(one.shape[:2] + (d + 1,))
+        w[..., 0] = 1.0
+        for k in range(d):
+            length = k + 1
+            o, z = one[..., k], zero[:, k]
+            for i in range(length - 1, -1, -1):
+                w[..., i + 1] += o * w[..., i] * (i + 1) / (length + 1)
+                w[..., i] = z * w[..., i] * (length - i) / (length + 1)
+
+        # UNWIND each feature to sum the weights of the paths without it
+        contributions = np.empty_like(one)
+        for k in range(d):
+            o, z = one[..., k], zero[:, k]
+            safe_o = np.where(o > 0, o, 1.0)
+            carry = w[..., d].copy()
+            total = np.zeros_like(o)
+            for j in range(d - 1, -1, -1):
+                if_one = carry * (d + 1) / ((j + 1) * safe_o)
+                if_zero = w[..., j] * (d + 1) / (z * (d - j))
+                total += np.where(o > 0, if_one, if_zero)
+                carry = w[..., j] - if_one * z * (d - j) / (d + 1)
+            contributions[..., k] = total * (o - z) * self.values
+        return contributions
+
+    def shap_values(self, state: np.ndarray, out: np.ndarray):
+        """Adds this group's contributions into out, given the node states."""
+        if self.depth == 0:  # a stump: the leaf is the expected value
+            return
+        pattern = state[:, self.leaf_ids] & (2**self.depth - 1)
+        if self.table is not None:
+            contributions = self.table[self.offsets + pattern]
+        else:
+            one = (pattern[..., None] >> np.arange(self.depth)) & 1
+            contributions = self.contributions(one.astype(np.float64))
+        out += contributions.reshape(len(out), -1) @ self.scatter
+
+
+class TreeExplainer:
+    def __init__(self, model):
+        trees = _trees(model)
+        self.n_features = int(getattr(model, "n_features_in_", trees[0].n_features))
+        self.feature_names = list(getattr(model, "feature_names_in_", []))
+        # Each tree's root value is its cover-weighted mean leaf value
+        self.expected_value = float(np.mean([t.value[0, 0, 0] for t in trees]))
+
+        # Number the nodes of all trees; splits are grouped by tree level
+        levels, leaves, self.roots = [], [], []
+        self.n_nodes = 0
+        for tree in trees:
+            self.roots.append(self.n_nodes)
+            # (node, global id, level, path features, path zero fractions)
+            stack = [(0, self.n_nodes, 0, [], [])]
+            self.n_nodes += 1
+            while stack:
+                node, gid, level, features, zero = stack.pop()
+                left, right = tree.children_left[node], tree.children_right[node]
+                if left == -1:
+                    leaves.append((gid, tree.value[node, 0, 0], features, zero))
+                    continue
+                feature = tree.feature[node]
+                # A feature split on twice along a path is one SHAP element
+                if feature in features:
+                    slot = features.index(feature)
+                else:
+                    slot = len(features)
+                    features, zero = features + [feature], zero + [1.0]
+                cover = tree.weighted_n_node_samples
+                children = []
+                for child in (left, right):
+                    child_zero = list(zero)
+                    child_zero[slot] *= cover[child] / cover[node]
+                    stack.append((child, self.n_nodes, level + 1, features, child_zero))
+                    children.append(self.n_nodes)
+                    self.n_nodes += 1
+                while len(levels) <= level:
+                    levels.append([])
+                levels[level].append(
+                    (gid, feature, tree.threshold[node], slot, *children)
+                )
+        # Per level: arrays of (node, feature, threshold, slot, left, right)
+        self.levels = [tuple(np.array(col) for col in zip(*level)) for level in levels]
+
+        by_depth = {}
+        for leaf in leaves:
+            by_depth.setdefault(len(leaf[2]), []).append(leaf)
+        self.groups = [
+            _PathGroup(group, len(trees), self.n_features)
+            for _, group in sorted(by_depth.items())
+        ]
+        self.n_leaves = len(leaves)
+
+    def _node_states(self, X: np.ndarray) -> np.ndarray:
+        """
+        (rows, nodes) bitmasks: bit k stays set while the row meets every
+        split on the path's k-th feature. Pushed down one tree level at a time.
+        """
+        state = np.zeros((len(X), self.n_nodes), dtype=np.int64)
+        state[:, self.roots] = -1
+        for node, feature, threshold, slot, left, right in self.levels:
+            goes_left = (X[:, feature] <= threshold).astype(np.int64)
+            parent = state[:, node]
+            state[:, left] = parent & ~((1 - goes_left) << slot)
+            state[:, right] = parent & ~(goes_left << slot)
+        return state
+
+    def shap_values(self, X) -> np.ndarray:
+        """(rows, features) contributions; each row sums to f(x) - expected."""
+        # sklearn compares float32 features against its split thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.zeros((len(X), self.n_features))
+        chunk = max(1, _STATE_ELEMENTS // self.n_nodes)
+        for start in range(0, len(X), chunk):
+            block = slice(start, start + chunk)
+            state = self._node_states(X[block])
+            for group in self.groups:
+                group.shap_values(state, out[block])
+        return out
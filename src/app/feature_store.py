@@ -0,0 +1,159 @@
+# src/app/feature_store.py
+"""
+Cached columnar feature store shared by training, drift reporting and
+benchmarks.
+
+The raw product CSV is parsed, cleaned and encoded once, with compact
+explicit dtypes, into a directory keyed by a hash of the source file:
+
+    data/feature_store/<hash>/
+        features.parquet   float32 numerics, uint8 one-hots, int16 category codes
+        X.npy / y.npy      float32 model matrix and target (memory-mappable)
+        train_idx.npy      row indices of the train/test split used by train.py
+        test_idx.npy
+        meta.json          columns, category levels, source, row count
+
+Loading is a memory map plus a JSON read; the CSV is only parsed again when
+its contents (or the store format) change.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from .features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET_COLUMN
+
+DATA_PATH = os.path.join("data", "raw", "Top_Selling_Product_Data.csv")
+STORE_DIR = os.path.join("data", "feature_store")
+STORE_VERSION = 1
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+
+def source_hash(path: str) -> str:
+    digest = hashlib.sha256(f"v{STORE_VERSION}".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class FeatureStore:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.columns = self.meta["columns"]
+        self.categories = self.meta["categories"]
+        self.X = np.load(os.path.join(path, "X.npy"), mmap_mode="r")
+        self.y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+        self.train_idx = np.load(os.path.join(path, "train_idx.npy"))
+        self.test_idx = np.load(os.path.join(path, "test_idx.npy"))
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def X_frame(self, rows=None) -> pd.DataFrame:
+        """Model matrix (model_columns order) as a DataFrame, for sklearn."""
+        X = self.X if rows is None else self.X[rows]
+        return pd.DataFrame(np.asarray(X), columns=self.columns)
+
+    def y_series(self, rows=None) -> pd.Series:
+        y = self.y if rows is None else self.y[rows]
+        return pd.Series(np.asarray(y), name=TARGET_COLUMN)
+
+    def frame(self, rows=None, columns=None) -> pd.DataFrame:
+        """The compact columnar table (one-hots, codes and target)."""
+        df = pd.read_parquet(
+            os.path.join(self.path, "features.parquet"), columns=columns
+        )
+        return df if rows is None else df.iloc[rows].reset_index(drop=True)
+
+    def raw_frame(self, rows=None) -> pd.DataFrame:
+        """Training-named raw features, with categories decoded from codes."""
+        codes = [f"{c} code" for c in CATEGORICAL_FEATURES]
+        df = self.frame(rows, columns=NUMERIC_FEATURES + codes)
+        for column in CATEGORICAL_FEATURES:
+            df[column] = pd.Categorical.from_codes(
+                df.pop(f"{column} code"), self.categories[column]
+            )
+        return df
+
+
+def build_feature_store(source: str = DATA_PATH, store_dir: str = STORE_DIR) -> str:
+    from sklearn.model_selection import train_test_split
+
+    key = source_hash(source)
+    path = os.path.join(store_dir, key)
+    start = time.time()
+
+    dtypes = {c: "float32" for c in NUMERIC_FEATURES + [TARGET_COLUMN]}
+    dtypes.update({c: "category" for c in CATEGORICAL_FEATURES})
+    df = pd.read_csv(source, usecols=list(dtypes), dtype=dtypes)
+    df = df.dropna().reset_index(drop=True)
+
+    table = {c: df[c].to_numpy(np.float32) for c in NUMERIC_FEATURES}
+    categories = {}
+    for column in CATEGORICAL_FEATURES:
+        # Levels seen only in rows dropped above must not become columns
+        levels = sorted(df[column].cat.remove_unused_categories().cat.categories)
+        codes = pd.Categorical(df[column], categories=levels).codes.astype(np.int16)
+        categories[column] = levels
+        table[f"{column} code"] = codes
+        # Same columns as pd.get_dummies(drop_first=True) in the original train.py
+        for i, level in enumerate(levels[1:], start=1):
+            table[f"{column}_{level}"] = (codes == i).astype(np.uint8)
+    table[TARGET_COLUMN] = df[TARGET_COLUMN].clip(0, 100).to_numpy(np.float32)
+    frame = pd.DataFrame(table)
+
+    columns = NUMERIC_FEATURES + [
+        f"{c}_{level}" for c in CATEGORICAL_FEATURES for level in categories[c][1:]
+    ]
+    train_idx, test_idx = train_test_split(
+        np.arange(len(frame)), test_size=TEST_SIZE, random_state=RANDOM_STATE
+    )
+
+    tmp = path + ".tmp"
+    os.makedirs(tmp, exist_ok=True)
+    frame.to_parquet(os.path.join(tmp, "features.parquet"), index=False)
+    np.save(os.path.join(tmp, "X.npy"), frame[columns].to_numpy(np.float32))
+    np.save(os.path.join(tmp, "y.npy"), frame[TARGET_COLUMN].to_numpy(np.float32))
+    np.save(os.path.join(tmp, "train_idx.npy"), train_idx)
+    np.save(os.path.join(tmp, "test_idx.npy"), test_idx)
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(
+            {
+                "source": source,
+                "hash": key,
+                "rows": len(frame),
+                "columns": columns,
+                "categories": categories,
+                "built_at": time.time(),
+            },
+            f,
+            indent=2,
+        )
+    try:
+        os.replace(tmp, path)  # readers never see a half-written store
+    except OSError:
+        shutil.rmtree(tmp)  # another process finished the same build first
+    print(f"Feature store built at {path} in {time.time() - start:.2f}s")
+    return path
+
+
+def load_feature_store(source: str = DATA_PATH, store_dir: str = STORE_DIR):
+    """Loads the store for the current contents of source, building it if needed."""
+    path = os.path.join(store_dir, source_hash(source))
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        path = build_feature_store(source, store_dir)
+    return FeatureStore(path)
+
+
+if __name__ == "__main__":
+    store = load_feature_store()
+    print(f"{store.path}: {len(store)} rows x {len(store.columns)} columns")
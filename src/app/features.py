@@ -0,0 +1,70 @@
+# src/app/features.py
+"""
+Single place for the product feature schema shared by training, serving and
+monitoring. The API uses snake_case field names (ProductFeatures); the raw CSV
+and the trained model use the original column names with spaces.
+"""
+
+import pandas as pd
+
+# API field name -> raw/training column name
+API_TO_TRAINING_COLUMNS = {
+    "Original_Price": "Original Price",
+    "Discount_Price": "Discount Price",
+    "Number_of_Ratings": "Number of Ratings",
+    "Positive_Seller_Ratings": "Positive Seller Ratings",
+    "Ship_On_Time": "Ship On Time",
+    "Chat_Response_Rate": "Chat Response Rate",
+    "No_of_products_to_be_sold": "No. of products to be sold",
+    "Category": "Category",
+    "Delivery_Type": "Delivery Type",
+    "Flagship_Store": "Flagship Store",
+}
+TRAINING_TO_API_COLUMNS = {v: k for k, v in API_TO_TRAINING_COLUMNS.items()}
+
+NUMERIC_FEATURES = [
+    "Original Price",
+    "Discount Price",
+    "Number of Ratings",
+    "Positive Seller Ratings",
+    "Ship On Time",
+    "Chat Response Rate",
+    "No. of products to be sold",
+]
+CATEGORICAL_FEATURES = ["Category", "Delivery Type", "Flagship Store"]
+TARGET_COLUMN = "Sell percentage to increase"
+
+
+def encode_features(df: pd.DataFrame, model_columns: list) -> pd.DataFrame:
+    """
+    One-hot encodes a frame of raw (training-named) features and aligns it to
+    the model's columns. Levels the model never saw (including the level
+    dropped by drop_first at training time) simply end up as all zeros.
+    """
+    encoded = pd.get_dummies(df, columns=CATEGORICAL_FEATURES)
+    return encoded.reindex(columns=model_columns, fill_value=0)
+
+
+def encode_payload(record: dict, model_columns: list) -> pd.DataFrame:
+    """A single API-named record (ProductFeatures.model_dump()), encoded."""
+    renamed = {API_TO_TRAINING_COLUMNS[k]: v for k, v in record.items()}
+    return encode_features(pd.DataFrame([renamed]), model_columns)
+
+
+def encode_payloads(records: list, model_columns: list) -> pd.DataFrame:
+    """A batch of API-named records, encoded in one pass."""
+    renamed = [{API_TO_TRAINING_COLUMNS[k]: v for k, v in r.items()} for r in records]
+    return encode_features(pd.DataFrame(renamed), model_columns)
+
+
+def api_field_of(column: str) -> str:
+    """
+    The API field a model column came from; one-hot columns like
+    "Category_Watches, Bags, Jewellery" map back to "Category".
+    """
+    if column in TRAINING_TO_API_COLUMNS:
+        return TRAINING_TO_API_COLUMNS[column]
+    for feature in CATEGORICAL_FEATURES:
+        if column.startswith(feature + "_"):
+            return TRAINING_TO_API_COLUMNS[feature]
+    return column
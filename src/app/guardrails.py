@@ -1,10 +1,46 @@
 # src/app/guardrails.py
+import os
 import re
 from typing import Tuple, Optional
 
+try:  # google-re2 guarantees linear-time matching for any pattern
+    import re2 as _regex_backend
+except ImportError:
+    _regex_backend = None
+
+# Inputs are rejected before any scanning beyond these lengths (characters)
+MAX_INPUT_CHARS = int(os.getenv("GUARDRAIL_MAX_INPUT_CHARS", "2000"))
+MAX_OUTPUT_CHARS = int(os.getenv("GUARDRAIL_MAX_OUTPUT_CHARS", "20000"))
+
+
+def compile_pattern(pattern: str):
+    """
+    Compiles with RE2 when installed. Python's `re` backtracks, so patterns
+    here must also be linear under it: every search start may only do a
+    bounded amount of work, or run over characters that can't be part of a
+    match at a later start (see the Email pattern).
+    """
+    if _regex_backend is not None:
+        try:
+            return _regex_backend.compile(pattern)
+        except Exception as e:  # syntax RE2 doesn't support
+            print(f"Guardrail pattern {pattern!r} falls back to re: {e}")
+    return re.compile(pattern)
+
+
+def regex_backend() -> str:
+    return "re2" if _regex_backend is not None else "re"
+
 
 class CustomGuardrails:
-    def __init__(self):
+    def __init__(self, max_input_chars: int = None, max_output_chars: int = None):
+        self.max_input_chars = (
+            MAX_INPUT_CHARS if max_input_chars is None else max_input_chars
+        )
+        self.max_output_chars = (
+            MAX_OUTPUT_CHARS if max_output_chars is None else max_output_chars
+        )
+
         # 1. Input Validation Rules
         self.injection_keywords = [
             "ignore previous instructions",
@@ -18,7 +54,14 @@ class CustomGuardrails:
         self.pii_patterns = {
             "CNIC": r"\d{5}-\d{7}-\d{1}",  # Matches 12345-1234567-1
             "Phone": r"(\+92|0)?3\d{9}",  # Matches +923001234567 or 03001234567
-            "Email": r"[^@]+@[^@]+\.[^@]+",  # Basic email pattern
+            # One char before the '@' is enough to prove a match exists. The
+            # old `[^@]+@[^@]+\.[^@]+` rescanned the rest of the input from
+            # every start, which is quadratic on a long query without an '@'.
+            "Email": r"[^@\s]@[^@\s.]+\.[^@\s.]",  # Matches user@mail.com
+        }
+        self._pii_regexes = {
+            pii_type: compile_pattern(pattern)
+            for pii_type, pattern in self.pii_patterns.items()
         }
 
         # 2. Output Moderation Rules
@@ -39,6 +82,10 @@ class CustomGuardrails:
         Validates User Input.
         Returns: (is_safe: bool, reason: str)
         """
+        # Rule 0: Length cap, before any scanning
+        if len(query) > self.max_input_chars:
+            return False, f"Input too long ({self.max_input_chars} characters max)"
+
         query_lower = query.lower()
 
         # Rule 1: Prompt Injection
@@ -47,8 +94,8 @@ class CustomGuardrails:
                 return False, f"Prompt Injection Detected: '{keyword}'"
 
         # Rule 2: PII Detection
-        for pii_type, pattern in self.pii_patterns.items():
-            if re.search(pattern, query):
+        for pii_type, regex in self._pii_regexes.items():
+            if regex.search(query):
                 return False, f"PII Detected ({pii_type}) - Request Blocked"
 
         return True, None
@@ -58,6 +105,9 @@ class CustomGuardrails:
         Validates Model Output.
         Returns: (is_safe: bool, reason: str)
         """
+        if len(response) > self.max_output_chars:
+            return False, f"Response too long ({self.max_output_chars} characters max)"
+
         response_lower = response.lower()
 
         # Rule 3: Toxicity / Banned Content
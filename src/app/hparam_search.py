@@ -0,0 +1,212 @@
+# src/app/hparam_search.py
+"""
+Parallel hyperparameter search for the product success forest.
+
+- Folds are computed once, up front, over the feature store's train split.
+- Trials run in a process pool. Workers memory-map the store's X.npy/y.npy,
+  so the feature arrays are shared through the OS page cache, not pickled.
+- Each trial reports CV RMSE and the measured single-row inference latency.
+  Candidates are ranked by objective = rmse + latency_weight * latency_ms.
+- All trials are logged to MLflow in batched calls at the end.
+
+Methods: "grid", "random", and "halving" (successive halving over training
+set size: every rung keeps the best 1/eta candidates and gives them eta
+times more rows).
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+from .feature_store import FeatureStore
+
+GRID = {
+    "n_estimators": [10, 25, 50, 100],
+    "max_depth": [5, 8, 12, None],
+    "min_samples_leaf": [1, 5],
+    "max_features": [1.0, 0.5],
+}
+RANDOM_SPACE = {
+    "n_estimators": (10, 150),
+    "max_depth": [4, 5, 6, 8, 10, 12, 16, None],
+    "min_samples_leaf": (1, 20),
+    "max_features": [1.0, 0.7, 0.5, 0.3],
+}
+LATENCY_REPEATS = 50
+
+# --- Worker state (set once per process by _init_worker) ---
+_store = None
+_folds = None
+
+
+def _init_worker(store_path: str, folds: list):
+    global _store, _folds
+    _store = FeatureStore(store_path)
+    _folds = folds
+
+
+def _single_row_latency_ms(model, row) -> float:
+    timings = []
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e3)
+
+
+def evaluate(params: dict, fraction: float = 1.0, seed: int = 42) -> dict:
+    """Runs one trial in the current worker: CV over the precomputed folds."""
+    start = time.process_time()
+    rng = np.random.default_rng(seed)
+    errors = []
+    model = None
+    for train_rows, val_rows in _folds:
+        if fraction < 1.0:
+            size = max(10, int(len(train_rows) * fraction))
+            train_rows = rng.choice(train_rows, size, replace=False)
+        model = RandomForestRegressor(**params, random_state=42, n_jobs=1)
+        model.fit(_store.X[train_rows], _store.y[train_rows])
+        predictions = model.predict(_store.X[val_rows])
+        errors.append(np.sqrt(mean_squared_error(_store.y[val_rows], predictions)))
+
+    latency = _single_row_latency_ms(model, np.asarray(_store.X[:1]))
+    return {
+        "params": params,
+        "fraction": fraction,
+        "rmse": float(np.mean(errors)),
+        "latency_ms": latency,
+        "cpu_seconds": time.process_time() - start,
+    }
+
+
+# --- Candidate generation ---
+def grid_candidates() -> list:
+    keys = list(GRID)
+    return [dict(zip(keys, values)) for values in itertools.product(*GRID.values())]
+
+
+def random_candidates(n: int, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    candidates = []
+    for _ in range(n):
+        params = {}
+        for key, space in RANDOM_SPACE.items():
+            if isinstance(space, tuple):
+                params[key] = int(rng.integers(space[0], space[1] + 1))
+            else:
+                params[key] = space[int(rng.integers(len(space)))]
+        candidates.append(params)
+    return candidates
+
+
+# --- Search ---
+class HyperparameterSearch:
+    def __init__(
+        self,
+        store: FeatureStore,
+        n_folds: int = 3,
+        workers: int = None,
+        latency_weight: float = 1.0,
+        seed: int = 42,
+    ):
+        self.store = store
+        self.workers = workers or os.cpu_count()
+        self.latency_weight = latency_weight
+        self.seed = seed
+        kfold = KFold(n_splits=n_folds, shuffle=True, random_state=seed)
+        self.folds = [
+            (store.train_idx[train], store.train_idx[val])
+            for train, val in kfold.split(store.train_idx)
+        ]
+        self.trials = []
+
+    def objective(self, trial: dict) -> float:
+        return trial["rmse"] + self.latency_weight * trial["latency_ms"]
+
+    def _run_batch(self, pool, candidates: list, fraction: float) -> list:
+        futures = [pool.submit(evaluate, c, fraction, self.seed) for c in candidates]
+        results = [f.result() for f in futures]
+        for result in results:
+            result["objective"] = self.objective(result)
+        self.trials.extend(results)
+        return results
+
+    def run(self, method: str = "random", n_trials: int = 20, eta: int = 3) -> dict:
+        start = time.perf_counter()
+        # fork keeps train.py (a flat script) from being re-run in each worker
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.store.path, self.folds),
+        ) as pool:
+            if method == "grid":
+                candidates = grid_candidates()
+                results = self._run_batch(pool, candidates, 1.0)
+            elif method == "random":
+                candidates = random_candidates(n_trials, self.seed)
+                results = self._run_batch(pool, candidates, 1.0)
+            elif method == "halving":
+                candidates = random_candidates(n_trials, self.seed)
+                rungs = max(1, int(np.floor(np.log(len(candidates)) / np.log(eta))))
+                fraction = 1.0 / eta**rungs
+                while True:
+                    results = self._run_batch(pool, candidates, fraction)
+                    if len(candidates) <= 1 or fraction >= 1.0:
+                        break
+                    results.sort(key=lambda r: r["objective"])
+                    candidates = [r["params"] for r in results[: len(results) // eta]]
+                    candidates = candidates or [results[0]["params"]]
+                    fraction = min(1.0, fraction * eta)
+            else:
+                raise ValueError(f"Unknown search method: {method}")
+        wall = time.perf_counter() - start
+
+        best = min(results, key=lambda r: r["objective"])
+        serial = sum(t["cpu_seconds"] for t in self.trials)  # 1-worker estimate
+        return {
+            "method": method,
+            "best": best,
+            "trials": len(self.trials),
+            "wall_seconds": wall,
+            "trials_per_minute": len(self.trials) / wall * 60,
+            "speedup_vs_serial": serial / wall,
+            "workers": self.workers,
+        }
+
+    def log_to_mlflow(self, summary: dict):
+        """Every trial in a few log_batch calls instead of one call per value."""
+        import mlflow
+        from mlflow.entities import Metric, Param
+
+        run_id = mlflow.active_run().info.run_id
+        now = int(time.time() * 1000)
+        metrics = []
+        for step, trial in enumerate(self.trials):
+            for key in ("rmse", "latency_ms", "objective", "fraction"):
+                metrics.append(Metric(f"trial_{key}", trial[key], now, step))
+        for key in ("trials_per_minute", "speedup_vs_serial", "wall_seconds"):
+            metrics.append(Metric(f"search_{key}", summary[key], now, 0))
+        params = [
+            Param("search_method", summary["method"]),
+            Param("search_workers", str(summary["workers"])),
+            Param("search_latency_weight", str(self.latency_weight)),
+            Param("search_best_params", json.dumps(summary["best"]["params"])),
+        ]
+
+        client = mlflow.tracking.MlflowClient()
+        for i in range(0, len(metrics), 1000):  # MLflow's per-batch limit
+            client.log_batch(
+                run_id, metrics=metrics[i : i + 1000], params=params if i == 0 else []
+            )
+        mlflow.log_dict({"trials": self.trials}, "hparam_search_trials.json")
@@ -0,0 +1,116 @@
+# src/app/incremental.py
+"""
+Warm-start retraining of the product success forest (train.py --incremental).
+
+A full retrain refits every tree on the whole, ever-growing dataset. Here the
+current forest is kept, and new trees are fitted on the new rows only
+(optionally with a window of the most recent old rows). sklearn's warm_start
+fits just the added estimators. With a cap on the number of trees, the
+oldest ones are dropped, so the forest slowly follows recent data instead of
+growing without bound.
+
+New rows are encoded against the existing model_columns.json, exactly as
+/predict encodes requests. Category levels the model has never seen become
+all-zero one-hots, so the served columns never change. The updated forest
+is only promoted if its holdout RMSE is no worse than the current model's,
+within a tolerance.
+"""
+
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from .features import (
+    API_TO_TRAINING_COLUMNS,
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    TARGET_COLUMN,
+    encode_features,
+)
+
+
+def read_rows(path: str) -> pd.DataFrame:
+    """New labelled rows from a CSV or Parquet file, with raw or API names."""
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    return df.rename(columns=API_TO_TRAINING_COLUMNS)
+
+
+def encode_rows(df: pd.DataFrame, model_columns: list):
+    """
+    (X, y) aligned to the existing model columns, cleaned like the feature
+    store (rows with missing values dropped, target clipped to [0, 100]).
+    """
+    raw = df[NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN]].dropna()
+    X = encode_features(raw.drop(columns=[TARGET_COLUMN]), model_columns)
+    y = raw[TARGET_COLUMN].clip(0, 100).astype(np.float32)
+    return X.astype(np.float32).reset_index(drop=True), y.reset_index(drop=True)
+
+
+def unseen_levels(df: pd.DataFrame, categories: dict) -> dict:
+    """Category levels in df that were not in the training data."""
+    unseen = {}
+    for column in CATEGORICAL_FEATURES:
+        levels = set(df[column].dropna().unique()) - set(categories[column])
+        if levels:
+            unseen[column] = sorted(levels)
+    return unseen
+
+
+def grow_forest(model, X, y, new_trees: int, max_trees: int = None):
+    """
+    A copy of the forest with new_trees more trees fitted on (X, y). With
+    max_trees, the oldest trees beyond the cap are dropped.
+    """
+    grown = copy.deepcopy(model)
+    grown.set_params(warm_start=True, n_estimators=len(model.estimators_) + new_trees)
+    grown.fit(X, y)
+    if max_trees is not None and len(grown.estimators_) > max_trees:
+        grown.estimators_ = grown.estimators_[-max_trees:]
+        grown.n_estimators = max_trees
+    grown.set_params(warm_start=False)
+    return grown
+
+
+def evaluate(model, X, y) -> dict:
+    pred = model.predict(X)
+    mse = mean_squared_error(y, pred)
+    return {
+        "mse": mse,
+        "rmse": float(np.sqrt(mse)),
+        "mae": mean_absolute_error(y, pred),
+        "r2": r2_score(y, pred),
+    }
+
+
+def incremental_update(
+    model,
+    X_new,
+    y_new,
+    X_holdout,
+    y_holdout,
+    new_trees: int,
+    max_trees: int = None,
+    tolerance: float = 0.0,
+):
+    """
+    Grows the forest on the new rows and compares it with the current model
+    on the holdout. Returns (candidate, report); report["promote"] is True
+    when the candidate's RMSE is within (1 + tolerance) of the current one.
+    """
+    start = time.perf_counter()
+    candidate = grow_forest(model, X_new, y_new, new_trees, max_trees)
+    fit_seconds = time.perf_counter() - start
+
+    current = evaluate(model, X_holdout, y_holdout)
+    updated = evaluate(candidate, X_holdout, y_holdout)
+    return candidate, {
+        "current": current,
+        "candidate": updated,
+        "fit_seconds": fit_seconds,
+        "new_rows": len(X_new),
+        "trees": len(candidate.estimators_),
+        "promote": updated["rmse"] <= current["rmse"] * (1 + tolerance),
+    }
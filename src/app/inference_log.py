@@ -0,0 +1,208 @@
+# src/app/inference_log.py
+"""
+Non-blocking inference log for /predict and /ask.
+
+Handlers call InferenceLogger.log(kind, record), which only appends to an
+in-memory deque (well under a microsecond). A background thread drains the
+queue in batches and appends them as row groups to Parquet files, one
+directory per kind, rotated by row count and age:
+
+    <INFERENCE_LOG_DIR>/predictions/predictions-20260101-120000-<pid>.parquet
+    <INFERENCE_LOG_DIR>/queries/queries-20260101-120000-<pid>.parquet
+
+Backpressure: above the high-water mark records are sampled at sample_rate,
+and at max_queue they are dropped. Both are counted, never blocking the
+handler. A batch that fails to write (bad record, disk error) is counted as
+failed and its file is rotated; the writer thread keeps going. Parquet
+files only become readable once rotated or closed.
+"""
+
+import atexit
+import os
+import random
+import threading
+import time
+import typing
+from collections import deque
+
+from .instrumentation import log_inference_log_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ARROW_READY = True
+except ImportError:
+    ARROW_READY = False
+
+_ARROW_TYPES = {float: "float64", int: "int64", str: "string", bool: "bool"}
+
+
+def schema_from_model(model, extra: dict = None):
+    """
+    Arrow schema mirroring a Pydantic model's fields (plus extra fields),
+    with a leading "timestamp" column.
+    """
+    fields = [pa.field("timestamp", pa.timestamp("ms"))]
+    annotations = {name: f.annotation for name, f in model.model_fields.items()}
+    annotations.update(extra or {})
+    for name, annotation in annotations.items():
+        if typing.get_origin(annotation) in (list, typing.List):
+            (item,) = typing.get_args(annotation)
+            arrow_type = pa.list_(_ARROW_TYPES[item])
+        else:
+            arrow_type = pa.type_for_alias(_ARROW_TYPES[annotation])
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class InferenceLogger:
+    def __init__(
+        self,
+        directory: str,
+        schemas: dict,
+        batch_size: int = 1000,
+        flush_interval: float = 5.0,
+        max_queue: int = 50_000,
+        high_water: float = 0.8,
+        sample_rate: float = 0.1,
+        rotate_rows: int = 500_000,
+        rotate_seconds: float = 3600.0,
+    ):
+        self.directory = directory
+        self.schemas = schemas
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.high_water = int(max_queue * high_water)
+        self.sample_rate = sample_rate
+        self.rotate_rows = rotate_rows
+        self.rotate_seconds = rotate_seconds
+
+        self._queue = deque()
+        self._writers = {}  # kind -> (ParquetWriter, path, rows, opened_at)
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Plain ints on the hot path; the writer thread exports them
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+        self.failed = 0
+        self._exported = {"dropped": 0, "sampled_out": 0, "written": 0, "failed": 0}
+
+    # --- Hot path ---
+    def log(self, kind: str, record: dict):
+        queued = len(self._queue)
+        if queued >= self.high_water:
+            if queued >= self.max_queue:
+                self.dropped += 1
+                return
+            if random.random() >= self.sample_rate:
+                self.sampled_out += 1
+                return
+        record["timestamp"] = time.time()
+        self._queue.append((kind, record))
+
+    # --- Background writer ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="inference-log-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stop.wait(0.05):
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if due or len(self._queue) >= self.batch_size:
+                try:
+                    self.flush()
+                except Exception as e:  # never let the writer thread die
+                    print(f"Inference log flush failed: {e}")
+                last_flush = time.monotonic()
+
+    def flush(self):
+        with self._flush_lock:
+            while self._queue:
+                batches = {}
+                for _ in range(min(self.batch_size, len(self._queue))):
+                    kind, record = self._queue.popleft()
+                    batches.setdefault(kind, []).append(record)
+                for kind, records in batches.items():
+                    try:
+                        self._write(kind, records)
+                    except Exception as e:
+                        self._write_failed(kind, records, e)
+            self._rotate_expired()
+            self._export_counters()
+
+    def _write(self, kind: str, records: list):
+        schema = self.schemas[kind]
+        columns = []
+        for field in schema:
+            values = [r.get(field.name) for r in records]
+            if field.name == "timestamp":
+                values = [int(v * 1000) for v in values]
+            columns.append(pa.array(values, type=field.type))
+        table = pa.Table.from_arrays(columns, schema=schema)
+
+        writer = self._writers.get(kind)
+        if writer is None:
+            writer = self._open(kind)
+        writer[0].write_table(table)
+        writer[2] += len(records)
+        self.written += len(records)
+        if writer[2] >= self.rotate_rows:
+            self._close_writer(kind)
+
+    def _write_failed(self, kind: str, records: list, error: Exception):
+        self.failed += len(records)
+        print(f"Inference log: {len(records)} {kind} records lost: {error}")
+        # The file may be half-written; later batches start a new one
+        try:
+            self._close_writer(kind)
+        except Exception:
+            self._writers.pop(kind, None)
+
+    def _open(self, kind: str):
+        kind_dir = os.path.join(self.directory, kind)
+        os.makedirs(kind_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(kind_dir, f"{kind}-{stamp}-{os.getpid()}.parquet")
+        writer = [pq.ParquetWriter(path, self.schemas[kind]), path, 0, time.time()]
+        self._writers[kind] = writer
+        return writer
+
+    def _close_writer(self, kind: str):
+        writer = self._writers.pop(kind, None)
+        if writer is not None:
+            writer[0].close()
+
+    def _rotate_expired(self):
+        now = time.time()
+        for kind in list(self._writers):
+            if now - self._writers[kind][3] >= self.rotate_seconds:
+                self._close_writer(kind)
+
+    def _export_counters(self):
+        for outcome in self._exported:
+            value = getattr(self, outcome)
+            delta = value - self._exported[outcome]
+            if delta:
+                log_inference_log_records(outcome, delta)
+                self._exported[outcome] = value
+
+    def close(self):
+        """Flushes everything queued and closes open files (rotation point)."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+        with self._flush_lock:
+            for kind in list(self._writers):
+                self._close_writer(kind)
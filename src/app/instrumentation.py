@@ -1,5 +1,8 @@
+from fastapi import Response
 from prometheus_fastapi_instrumentator import Instrumentator
-from prometheus_client import Counter, Histogram
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram
+
+from .multiproc_metrics import collect_latest, multiproc_dir
 
 # --- Custom Metrics ---
 
@@ -30,6 +33,122 @@ TOKEN_COUNTER = Counter(
 
 COST_COUNTER = Counter("llm_cost_total", "Total estimated cost in USD", ["model"])
 
+# D4: Online Drift (live /predict traffic vs. training reference)
+# Each worker has its own drift window; with several workers (see
+# multiproc_metrics.py) the gauges report the live worker that updated last.
+FEATURE_DRIFT_PSI = Gauge(
+    "feature_drift_psi",
+    "Population Stability Index of live inputs vs. training reference",
+    ["feature"],
+    multiprocess_mode="livemostrecent",
+)
+
+FEATURE_DRIFT_KS = Gauge(
+    "feature_drift_ks",
+    "Binned KS statistic of live inputs vs. training reference",
+    ["feature"],
+    multiprocess_mode="livemostrecent",
+)
+
+DRIFT_WINDOW_SIZE = Gauge(
+    "feature_drift_window_requests",
+    "Requests in the current drift window",
+    multiprocess_mode="livemostrecent",
+)
+
+# Inference log (src/app/inference_log.py)
+INFERENCE_LOG_COUNTER = Counter(
+    "inference_log_records_total",
+    "Inference log records by outcome",
+    ["outcome"],  # Labels: written, sampled_out, dropped, failed
+)
+
+# Prediction result cache (src/app/prediction_cache.py)
+PREDICTION_CACHE_COUNTER = Counter(
+    "prediction_cache_requests_total",
+    "Prediction cache lookups by result",
+    ["result"],  # Labels: hit, miss
+)
+
+PREDICTION_CACHE_SAVED = Counter(
+    "prediction_cache_saved_seconds_total",
+    "Inference time saved by prediction cache hits",
+)
+
+# Shadow scoring / canary routing (src/app/shadow.py)
+MODEL_LATENCY = Histogram(
+    "model_inference_latency_seconds",
+    "Per-row model inference latency",
+    ["model", "path"],  # path: served (request path) or shadow (background)
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+SHADOW_DELTA = Histogram(
+    "shadow_score_delta",
+    "Shadow model score minus the served score, per request",
+    ["model"],
+    buckets=[-20, -10, -5, -2, -1, -0.5, 0, 0.5, 1, 2, 5, 10, 20],
+)
+
+SHADOW_DROPPED = Counter(
+    "shadow_requests_dropped_total", "Requests not shadow-scored (queue full)"
+)
+
+# /ask request coalescing (src/app/single_flight.py)
+SINGLE_FLIGHT_COUNTER = Counter(
+    "ask_single_flight_requests_total",
+    "/ask requests by coalescing role",
+    ["role"],  # Labels: leader, follower, timeout
+)
+
+LLM_CALLS_SAVED = Counter(
+    "llm_calls_saved_total",
+    "RAG/LLM calls avoided by sharing an identical in-flight request",
+)
+
+# LLM call policy (src/rag/hedging.py)
+LLM_CALL_EVENTS = Counter(
+    "llm_call_events_total",
+    "LLM call policy events",
+    [
+        "event"
+    ],  # Labels: hedge_fired, hedge_won, retry, attempt_timeout, budget_exhausted
+)
+
+# Degraded /ask answers (src/rag/degraded.py)
+ASK_DEGRADED = Counter(
+    "ask_degraded_total",
+    "/ask answers built extractively instead of by the LLM",
+    ["reason"],  # Labels: deadline, llm_error, circuit_open
+)
+
+# Local sentiment classifier (src/app/sentiment.py)
+SENTIMENT_REVIEWS = Counter(
+    "sentiment_reviews_total", "Reviews classified by /sentiment", ["label"]
+)
+
+# Feature attributions (src/app/explain.py)
+EXPLAINED_PREDICTIONS = Counter(
+    "explained_predictions_total", "Predictions explained by /predict/explain"
+)
+
+# What-if sweeps (src/app/sweep.py)
+SWEEP_VARIANTS = Counter(
+    "sweep_variants_total", "Product variants scored by /predict/sweep"
+)
+
+# Query embedding micro-batches (src/rag/micro_batch.py)
+EMBED_BATCH_SIZE = Histogram(
+    "embedding_batch_size",
+    "Queries per micro-batched embedding forward pass",
+    buckets=[1, 2, 4, 8, 16, 32, 64],
+)
+EMBED_BATCH_WAIT = Histogram(
+    "embedding_batch_wait_seconds",
+    "Time the first query of a batch waited before the forward pass",
+    buckets=[0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
 
 # --- Standard Instrumentation ---
 def setup_instrumentation(app):
@@ -41,13 +160,33 @@ def setup_instrumentation(app):
         excluded_handlers=["/metrics"],
     )
     instrumentator.instrument(app)
-    instrumentator.expose(app)
+    if multiproc_dir():
+        # Several workers: merge every worker's metric files on each scrape
+        @app.get("/metrics", include_in_schema=False)
+        def metrics():
+            return Response(collect_latest(), media_type=CONTENT_TYPE_LATEST)
+
+        print(f"Multi-process metrics enabled ({multiproc_dir()})")
+    else:
+        instrumentator.expose(app)
     print("Instrumentation setup complete.")
 
 
+# metric.labels(...) validates and looks up the child under a lock on every
+# call, which costs more than the increment itself on the /predict hot path
+_children = {}
+
+
+def _child(metric, *labelvalues):
+    child = _children.get((metric, labelvalues))
+    if child is None:
+        child = _children[(metric, labelvalues)] = metric.labels(*labelvalues)
+    return child
+
+
 # --- Helper functions ---
-def observe_prediction():
-    PREDICTIONS_COUNTER.labels(model_version="v1.0").inc()
+def observe_prediction(model_version: str = "v1.0"):
+    _child(PREDICTIONS_COUNTER, model_version).inc()
 
 
 def log_guardrail_event(event_type: str, action: str):
@@ -71,3 +210,69 @@ def log_llm_metrics(latency: float, input_tokens: int, output_tokens: int):
     total_cost = input_cost + output_cost
 
     COST_COUNTER.labels(model="llama3-8b").inc(total_cost)
+
+
+def log_feature_drift(results: dict, window_count: int):
+    """
+    Exports the output of DriftMonitor.compute() as per-feature gauges.
+    """
+    DRIFT_WINDOW_SIZE.set(window_count)
+    for feature, stats in results.items():
+        FEATURE_DRIFT_PSI.labels(feature=feature).set(stats["psi"])
+        if "ks" in stats:
+            FEATURE_DRIFT_KS.labels(feature=feature).set(stats["ks"])
+
+
+def log_inference_log_records(outcome: str, count: int):
+    INFERENCE_LOG_COUNTER.labels(outcome=outcome).inc(count)
+
+
+def log_prediction_cache(result: str, saved_seconds: float = 0.0):
+    _child(PREDICTION_CACHE_COUNTER, result).inc()
+    if saved_seconds:
+        PREDICTION_CACHE_SAVED.inc(saved_seconds)
+
+
+def log_model_latency(model: str, seconds: float, path: str = "served"):
+    _child(MODEL_LATENCY, model, path).observe(seconds)
+
+
+def log_shadow_score(model: str, delta: float, seconds: float):
+    SHADOW_DELTA.labels(model=model).observe(delta)
+    MODEL_LATENCY.labels(model=model, path="shadow").observe(seconds)
+
+
+def log_shadow_dropped():
+    SHADOW_DROPPED.inc()
+
+
+def log_single_flight(role: str):
+    SINGLE_FLIGHT_COUNTER.labels(role=role).inc()
+    if role == "follower":
+        LLM_CALLS_SAVED.inc()
+
+
+def log_llm_call_event(event: str):
+    LLM_CALL_EVENTS.labels(event=event).inc()
+
+
+def log_ask_degraded(reason: str):
+    ASK_DEGRADED.labels(reason=reason).inc()
+
+
+def log_sentiment(counts: dict):
+    for label, count in counts.items():
+        SENTIMENT_REVIEWS.labels(label=label).inc(count)
+
+
+def log_explanations(count: int):
+    EXPLAINED_PREDICTIONS.inc(count)
+
+
+def log_sweep(variants: int):
+    SWEEP_VARIANTS.inc(variants)
+
+
+def log_embed_batch(size: int, waited: float):
+    EMBED_BATCH_SIZE.observe(size)
+    EMBED_BATCH_WAIT.observe(waited)
@@ -1,12 +1,14 @@
 # src/app/main.py
-import joblib
-import pandas as pd
+import hmac
 import json
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, ConfigDict
-import numpy as np
+import math
 import os
-from typing import List
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional, Union
 from dotenv import load_dotenv
 
 import time  # Add this import
@@ -15,8 +17,26 @@ from .instrumentation import (
     observe_prediction,
     log_guardrail_event,
     log_llm_metrics,  # Import the new logger
+    log_feature_drift,
+    log_model_latency,
+    log_single_flight,
+    log_ask_degraded,
+    log_sentiment,
+    log_explanations,
+    log_sweep,
 )
 from .guardrails import CustomGuardrails
+from .profiler import ProfilerBusy, SamplingProfiler, collapsed
+from .prediction_cache import PredictionCache, model_version_of
+from .single_flight import CoalesceTimeout, SingleFlight, normalize_question
+from .shadow import PRIMARY, CanaryRouter, ShadowScorer, load_candidates, parse_spec
+
+# Heavy subsystems (pandas/sklearn and the model, pyarrow, the RAG stack) are
+# loaded on first use, or in the background by the lifespan hook, so that
+# importing this module and answering /health stay fast.
+STARTUP_TIMINGS = {}
+_load_lock = threading.Lock()
+_loaded = False
 
 # Force reload from the current directory
 load_dotenv()
@@ -24,24 +44,95 @@ load_dotenv()
 key = os.getenv("GROQ_API_KEY")
 print(f"DEBUG: API Key Loaded? {key is not None}")
 
-# D2 RAG Import (safe)
-# D2 RAG Import (safe)
-try:
-    from src.rag.query import ask_rag
-
-    RAG_READY = True
-    print("RAG system loaded successfully!")
-except ImportError as e:
-    print(f"RAG not ready: {e} — Run 'make rag' first")
-    RAG_READY = False
-
-    # FIX: Define a dummy function so tests don't crash with AttributeError
-    def ask_rag(query):
-        return {"answer": "RAG is unavailable", "sources": [], "latency_seconds": 0.0}
+# D2 RAG Import (safe, deferred to load_rag())
+# With RAG_POOL_ADDRESS set, /ask is forwarded to a separate RAG process pool
+# (src/app/rag_pool.py) and this process never imports torch or llama_index.
+RAG_POOL_ADDRESS = os.getenv("RAG_POOL_ADDRESS")
+RAG_READY = False
+ask_rag = None
+_rag_lock = threading.Lock()
+
+# Concurrent identical questions share one RAG call; duplicates wait up to
+# SINGLE_FLIGHT_TIMEOUT seconds for it (0 disables coalescing)
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "60"))
+ask_flight = SingleFlight(SINGLE_FLIGHT_TIMEOUT) if SINGLE_FLIGHT_TIMEOUT > 0 else None
+
+# Latency budget for /ask (callers may ask for less): past it, the answer is
+# built extractively from the retrieved reviews instead of by the LLM
+ASK_BUDGET_SECONDS = float(os.getenv("ASK_BUDGET_SECONDS", "10"))
+
+
+def load_rag():
+    global ask_rag, RAG_READY
+    with _rag_lock:
+        if ask_rag is not None:
+            return
+        start = time.perf_counter()
+        if RAG_POOL_ADDRESS:
+            from .rag_pool import RAGClient
+
+            rag_fn = RAGClient(RAG_POOL_ADDRESS).ask
+            RAG_READY = True
+            print(f"Forwarding /ask to the RAG pool at {RAG_POOL_ADDRESS}")
+        else:
+            try:
+                from src.rag.query import ask_rag as rag_fn
+
+                RAG_READY = True
+                print("RAG system loaded successfully!")
+            except ImportError as e:
+                print(f"RAG not ready: {e} — Run 'make rag' first")
+                RAG_READY = False
+
+                # FIX: Define a dummy function so tests don't crash with AttributeError
+                def rag_fn(query, budget_seconds=None):
+                    return {
+                        "answer": "RAG is unavailable",
+                        "sources": [],
+                        "latency_seconds": 0.0,
+                    }
+
+        ask_rag = rag_fn
+        STARTUP_TIMINGS["rag"] = time.perf_counter() - start
+
+
+# Local sentiment classifier (src/app/sentiment.py, trained by train_sentiment.py)
+SENTIMENT_MODEL_PATH = "models/sentiment.npz"
+SENTIMENT_MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", "10000"))
+sentiment_model = None
+_sentiment_lock = threading.Lock()
+
+
+def load_sentiment():
+    global sentiment_model
+    with _sentiment_lock:
+        if sentiment_model is not None or not os.path.exists(SENTIMENT_MODEL_PATH):
+            return
+        start = time.perf_counter()
+        from .sentiment import SentimentClassifier
+
+        sentiment_model = SentimentClassifier.load(SENTIMENT_MODEL_PATH)
+        STARTUP_TIMINGS["sentiment"] = time.perf_counter() - start
+        print("Sentiment classifier loaded successfully.")
+
+
+def warm_up():
+    """Loads everything up front; run by the lifespan hook in a background thread."""
+    ensure_loaded()
+    load_sentiment()
+    load_rag()
+    print("Startup report (seconds): " + json.dumps(STARTUP_TIMINGS))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # /health is served while the model and RAG stack warm up in the background
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
 
 
 # Initialize API and Load Artifacts ---
-app = FastAPI(title="Daraz Product Success Predictor")
+app = FastAPI(title="Daraz Product Success Predictor", lifespan=lifespan)
 
 # Setup instrumentation
 setup_instrumentation(app)
@@ -49,22 +140,96 @@ setup_instrumentation(app)
 # Initialize Guardrails Engine (New)
 guardrails = CustomGuardrails()
 
-# Load the trained model.
-try:
-    model = joblib.load("models/model.joblib")
-    print("Model loaded successfully.")
-except FileNotFoundError:
-    print("Error: model.joblib not found.")
-    model = None
+MODEL_PATH = "models/model.joblib"
+MODEL_COLS_PATH = "models/model_columns.json"
+
+# Result cache for repeated /predict payloads (PREDICTION_CACHE_SIZE=0 disables)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+prediction_cache = None
+if PREDICTION_CACHE_SIZE > 0:
+    prediction_cache = PredictionCache(
+        maxsize=PREDICTION_CACHE_SIZE,
+        ttl=float(os.getenv("PREDICTION_CACHE_TTL", "300")),
+        shared_path=os.getenv("PREDICTION_CACHE_PATH"),
+    )
+
+# Candidate models scored off the hot path, optionally serving a canary share
+SHADOW_MODELS = os.getenv("SHADOW_MODELS", "")
+canary_router = CanaryRouter(
+    {name: float(w) for name, w in parse_spec(os.getenv("CANARY_WEIGHTS")).items()}
+)
+candidates = {}
+shadow_scorer = None
+model = None
+model_columns = []
+
+# What-if grids for /predict/sweep
+SWEEP_MAX_VARIANTS = int(os.getenv("SWEEP_MAX_VARIANTS", "100000"))
 
-# Load the list of model columns (features)
-try:
-    with open("models/model_columns.json", "r") as f:
-        model_columns = json.load(f)
-    print("Model columns loaded successfully.")
-except FileNotFoundError:
-    print("Error: model_columns.json not found.")
-    model_columns = []
+# Feature attributions for /predict/explain, built on first use per model
+EXPLAIN_MAX_BATCH = int(os.getenv("EXPLAIN_MAX_BATCH", "10000"))
+explainer = None
+_explainer_lock = threading.Lock()
+
+
+def load_model():
+    """(Re)loads the model and its columns; invalidates cached predictions."""
+    global model, model_columns, candidates, shadow_scorer, explainer
+    import joblib
+
+    start = time.perf_counter()
+    # Load the trained model.
+    try:
+        model = joblib.load(MODEL_PATH)
+        print("Model loaded successfully.")
+    except FileNotFoundError:
+        print("Error: model.joblib not found.")
+        model = None
+
+    # Load the list of model columns (features)
+    try:
+        with open(MODEL_COLS_PATH, "r") as f:
+            model_columns = json.load(f)
+        print("Model columns loaded successfully.")
+    except FileNotFoundError:
+        print("Error: model_columns.json not found.")
+        model_columns = []
+    explainer = None
+
+    if prediction_cache is not None and model is not None:
+        prediction_cache.set_model_version(model_version_of(MODEL_PATH))
+
+    if SHADOW_MODELS and model is not None:
+        candidates = load_candidates(SHADOW_MODELS, model_columns)
+    if candidates:
+        models = {PRIMARY: model, **candidates}
+        if shadow_scorer is None:
+            shadow_scorer = ShadowScorer(models, model_columns).start()
+        else:
+            shadow_scorer.restart(models, model_columns)
+    STARTUP_TIMINGS["model"] = time.perf_counter() - start
+
+
+# Online drift monitor over live /predict traffic (reference built by train.py)
+DRIFT_REFRESH_EVERY = int(os.getenv("DRIFT_REFRESH_EVERY", "100"))
+drift_monitor = None
+_drift_observed = 0
+
+
+def load_drift_monitor():
+    global drift_monitor
+    from .drift import DriftMonitor, load_reference
+
+    start = time.perf_counter()
+    try:
+        drift_monitor = DriftMonitor(
+            load_reference(), window_size=int(os.getenv("DRIFT_WINDOW", "1000"))
+        )
+        print("Drift reference loaded successfully.")
+    except FileNotFoundError:
+        print("Warning: drift_reference.json not found, online drift disabled.")
+        drift_monitor = None
+    STARTUP_TIMINGS["drift"] = time.perf_counter() - start
 
 
 # Define Input Data Shape (Pydantic BaseModel) ---
@@ -107,15 +272,108 @@ class PredictionOut(BaseModel):
     predicted_success_score: float
 
 
+class Explanation(BaseModel):
+    predicted_success_score: float
+    raw_prediction: float
+    expected_value: float
+    contributions: Dict[str, float]
+
+
+class ExplanationOut(BaseModel):
+    explanations: List[Explanation]
+
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    step: Optional[float] = None
+    num: Optional[int] = Field(default=None, gt=0)
+
+
+class SweepBounds(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class SweepRequest(BaseModel):
+    base: ProductFeatures
+    grid: Dict[str, Union[SweepRange, List[Union[float, str]]]]
+    constraints: Dict[str, SweepBounds] = {}
+
+
+class SweepOut(BaseModel):
+    axes: Dict[str, List[Union[float, str]]]
+    shape: List[int]
+    scores: List[float]
+    feasible: int
+    best: Optional[Dict[str, Union[float, str]]] = None
+    best_score: Optional[float] = None
+
+
+class SentimentBatch(BaseModel):
+    reviews: List[str]
+
+
+class SentimentOut(BaseModel):
+    labels: List[str]
+    counts: Dict[str, int]
+
+
 # D2 RAG Schema
 class AskQuery(BaseModel):
     question: str
+    budget_seconds: Optional[float] = Field(default=None, gt=0)
 
 
 class RAGResponse(BaseModel):
     answer: str
     sources: List[str]
     latency_seconds: float
+    degraded: bool = False
+    degraded_reason: str = ""
+
+
+# Inference log: request/response records batched to Parquet in the background
+INFERENCE_LOG_DIR = os.getenv("INFERENCE_LOG_DIR")
+inference_log = None
+
+
+def start_inference_log():
+    global inference_log
+    if not INFERENCE_LOG_DIR:
+        return
+    from .inference_log import ARROW_READY, InferenceLogger, schema_from_model
+
+    if not ARROW_READY:
+        print("Warning: pyarrow not installed, inference log disabled.")
+        return
+    inference_log = InferenceLogger(
+        INFERENCE_LOG_DIR,
+        schemas={
+            "predictions": schema_from_model(
+                ProductFeatures, extra={"predicted_success_score": float}
+            ),
+            "queries": schema_from_model(
+                RAGResponse,
+                extra={"question": str, "server_latency_seconds": float},
+            ),
+        },
+        sample_rate=float(os.getenv("INFERENCE_LOG_SAMPLE_RATE", "0.1")),
+    ).start()
+    print(f"Inference log enabled, writing to {INFERENCE_LOG_DIR}")
+
+
+def ensure_loaded():
+    """Model, drift monitor and inference log, loaded once on first use."""
+    global _loaded
+    if _loaded:
+        return
+    with _load_lock:
+        if not _loaded:
+            load_model()
+            load_drift_monitor()
+            start_inference_log()
+            _loaded = True
 
 
 # Create API Endpoints ---
@@ -126,6 +384,9 @@ def home():
         "endpoints": {
             "D1": "POST /predict → Product Success Score",
             "D2": "POST /ask → RAG Chatbot with Guardrails",
+            "Explain": "POST /predict/explain → Per-feature contributions",
+            "Sweep": "POST /predict/sweep → What-if grid over product fields",
+            "Sentiment": "POST /sentiment → Batch review sentiment",
             "Health": "GET /health",
         },
     }
@@ -138,35 +399,193 @@ def health():
         "canary": os.getenv("CANARY", "false"),
         "d1_model": model is not None,
         "d2_rag": RAG_READY,
+        "candidates": list(candidates),
     }
 
 
 @app.post("/predict", response_model=PredictionOut)
 def predict(features: ProductFeatures):
-    data_dict = features.model_dump()
-    data_dict_renamed = {
-        "Original Price": data_dict["Original_Price"],
-        "Discount Price": data_dict["Discount_Price"],
-        "Number of Ratings": data_dict["Number_of_Ratings"],
-        "Positive Seller Ratings": data_dict["Positive_Seller_Ratings"],
-        "Ship On Time": data_dict["Ship_On_Time"],
-        "Chat Response Rate": data_dict["Chat_Response_Rate"],
-        "No. of products to be sold": data_dict["No_of_products_to_be_sold"],
-        "Category": data_dict["Category"],
-        "Delivery Type": data_dict["Delivery_Type"],
-        "Flagship Store": data_dict["Flagship_Store"],
-    }
-    input_df = pd.DataFrame([data_dict_renamed])
-    input_df_encoded = pd.get_dummies(input_df, drop_first=True)
-    input_df_aligned = input_df_encoded.reindex(columns=model_columns, fill_value=0)
+    ensure_loaded()
+    from .features import encode_payload  # pandas; already imported by ensure_loaded
 
+    data_dict = features.model_dump()
     if model is None or not model_columns:
         return {"error": "Model or columns not loaded."}
 
-    prediction = np.clip(model.predict(input_df_aligned)[0], 1, 100)
-    observe_prediction()
+    # Canary traffic bypasses the cache, which only holds primary scores
+    served = canary_router.choose() if candidates else PRIMARY
+    if served not in candidates:
+        served = PRIMARY
+
+    cache_key = prediction = None
+    if prediction_cache is not None and served == PRIMARY:
+        cache_key = prediction_cache.key(data_dict)
+        prediction = prediction_cache.get(cache_key)
+
+    if prediction is None:
+        start = time.perf_counter()
+        input_df_aligned = encode_payload(data_dict, model_columns)
+        served_model = model if served == PRIMARY else candidates[served]
+        predict_start = time.perf_counter()
+        prediction = float(min(max(served_model.predict(input_df_aligned)[0], 1), 100))
+        log_model_latency(served, time.perf_counter() - predict_start)
+        if cache_key is not None:
+            prediction_cache.put(cache_key, prediction, time.perf_counter() - start)
+        if shadow_scorer is not None:
+            shadow_scorer.submit(served, prediction, input_df_aligned.to_numpy()[0])
+
+    if served == PRIMARY:
+        observe_prediction()
+    else:
+        observe_prediction(model_version=served)
+    observe_drift(data_dict, prediction)
+    if inference_log is not None:
+        inference_log.log(
+            "predictions", {**data_dict, "predicted_success_score": prediction}
+        )
+
+    return {"predicted_success_score": prediction}
+
+
+@app.post("/predict/sweep", response_model=SweepOut)
+def predict_sweep(request: SweepRequest):
+    """
+    Scores every combination of the grid's values on top of the base product,
+    in one model pass, and picks the best-scoring variant that satisfies the
+    min/max constraints.
+    """
+    ensure_loaded()
+    import numpy as np
+    import pandas as pd
+
+    from .features import encode_payload
+    from .sweep import SweepError, build_variants, expand_axis, feasible_mask
+
+    if model is None or not model_columns:
+        raise HTTPException(status_code=503, detail="Model or columns not loaded.")
+    base = request.base.model_dump()
+    try:
+        for field in request.grid:
+            if field not in base:
+                raise SweepError(f"{field}: not a ProductFeatures field")
+        axes = {f: expand_axis(f, spec) for f, spec in request.grid.items()}
+        # Python ints: np.prod wraps around at 2**63 and can pass the cap
+        variants = math.prod(len(values) for values in axes.values())
+        if variants > SWEEP_MAX_VARIANTS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{variants} variants; at most {SWEEP_MAX_VARIANTS}",
+            )
+        base_row = encode_payload(base, model_columns).to_numpy(dtype=float)[0]
+        X, shape = build_variants(base_row, axes, model_columns)
+        feasible = feasible_mask(axes, shape, base, request.constraints)
+    except SweepError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    scores = np.clip(model.predict(pd.DataFrame(X, columns=model_columns)), 1, 100)
+    log_sweep(len(scores))
+
+    best = best_score = None
+    if feasible.any():
+        i = int(np.flatnonzero(feasible)[np.argmax(scores[feasible])])
+        position = np.unravel_index(i, shape)
+        best = {f: axes[f][p] for f, p in zip(axes, position)}
+        best_score = float(scores[i])
+    return {
+        "axes": axes,
+        "shape": list(shape),
+        "scores": scores.tolist(),
+        "feasible": int(feasible.sum()),
+        "best": best,
+        "best_score": best_score,
+    }
+
+
+def get_explainer():
+    global explainer
+    with _explainer_lock:
+        if explainer is None and model is not None:
+            from .explain import TreeExplainer
+
+            explainer = TreeExplainer(model)
+        return explainer
+
 
-    return {"predicted_success_score": float(prediction)}
+@app.post("/predict/explain", response_model=ExplanationOut)
+def predict_explain(features: Union[ProductFeatures, List[ProductFeatures]]):
+    """
+    Exact SHAP contributions of each input field to the primary model's score:
+    expected_value + sum(contributions) == raw_prediction (before clipping).
+    """
+    ensure_loaded()
+    from .features import api_field_of, encode_payloads
+
+    items = features if isinstance(features, list) else [features]
+    if len(items) > EXPLAIN_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {EXPLAIN_MAX_BATCH} items per request",
+        )
+    if model is None or not model_columns:
+        raise HTTPException(status_code=503, detail="Model or columns not loaded.")
+    try:
+        tree_explainer = get_explainer()
+    except TypeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    X = encode_payloads([item.model_dump() for item in items], model_columns)
+    shap_values = tree_explainer.shap_values(X.to_numpy(dtype=float))
+    expected = tree_explainer.expected_value
+    fields = [api_field_of(column) for column in model_columns]
+
+    explanations = []
+    for row in shap_values:
+        contributions = dict.fromkeys(ProductFeatures.model_fields, 0.0)
+        for field, value in zip(fields, row):
+            contributions[field] += float(value)
+        raw = expected + float(row.sum())
+        explanations.append(
+            {
+                "predicted_success_score": min(max(raw, 1), 100),
+                "raw_prediction": raw,
+                "expected_value": expected,
+                "contributions": contributions,
+            }
+        )
+    log_explanations(len(explanations))
+    return {"explanations": explanations}
+
+
+def observe_drift(data_dict: dict, prediction: float):
+    global _drift_observed
+    if drift_monitor is None:
+        return
+    drift_monitor.observe(data_dict, prediction)
+    _drift_observed += 1
+    if _drift_observed % DRIFT_REFRESH_EVERY == 0:
+        log_feature_drift(drift_monitor.compute(), drift_monitor.window_count)
+
+
+@app.post("/sentiment", response_model=SentimentOut)
+def sentiment(batch: SentimentBatch):
+    if len(batch.reviews) > SENTIMENT_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {SENTIMENT_MAX_BATCH} reviews per request",
+        )
+    if sentiment_model is None:
+        load_sentiment()
+    if sentiment_model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Sentiment model not trained — run: python train_sentiment.py",
+        )
+    labels = sentiment_model.predict(batch.reviews)
+    counts = {}
+    for label in labels:
+        counts[label] = counts.get(label, 0) + 1
+    log_sentiment(counts)
+    return {"labels": labels, "counts": counts}
 
 
 # D2 RAG Chatbot Endpoint (Updated with Guardrails)
@@ -185,21 +604,52 @@ def ask(query: AskQuery):
         print(f"GUARDRAIL ALERT: {reason}")
         raise HTTPException(status_code=400, detail=f"Request blocked: {reason}")
 
+    if ask_rag is None:
+        load_rag()
     if not RAG_READY:
         raise HTTPException(status_code=503, detail="RAG not ready — run: make rag")
 
     try:
-        # Get answer from RAG
-        result = ask_rag(question)
+        # Get answer from RAG (or from an identical request already in flight)
+        budget = min(query.budget_seconds or ASK_BUDGET_SECONDS, ASK_BUDGET_SECONDS)
+        budget -= time.time() - start_time
+
+        def rag_call():
+            return ask_rag(question, budget_seconds=budget)
+
+        # Only default-budget requests coalesce: a shared call runs with the
+        # leader's budget, which must be the same for every follower
+        default_budget = (
+            query.budget_seconds is None or query.budget_seconds >= ASK_BUDGET_SECONDS
+        )
+        if ask_flight is not None and default_budget:
+            try:
+                result, shared = ask_flight.do(normalize_question(question), rag_call)
+            except CoalesceTimeout as e:
+                log_single_flight("timeout")
+                raise HTTPException(status_code=504, detail=str(e))
+            log_single_flight("follower" if shared else "leader")
+        else:
+            result, shared = rag_call(), False
+        if result.get("degraded"):
+            log_ask_degraded(result.get("degraded_reason") or "unknown")
 
         # --- METRICS CALCULATION (D4) ---
         latency = time.time() - start_time
 
-        # Simple heuristic: 1 token ~= 4 chars (since we don't want to install tiktoken dependency issues)
-        input_chars = len(question)
-        output_chars = len(result["answer"])
-        input_tokens = max(1, int(input_chars / 4))
-        output_tokens = max(1, int(output_chars / 4))
+        # Token counts from the RAG side (question + packed context); handlers
+        # that don't report usage are counted here with the same tokenizer
+        usage = result.get("usage")
+        if usage is None:
+            from src.rag.context import count_tokens
+
+            usage = {
+                "input_tokens": count_tokens(question),
+                "output_tokens": count_tokens(result["answer"]),
+            }
+        input_tokens, output_tokens = usage["input_tokens"], usage["output_tokens"]
+        if shared:  # the leader already counted this call's tokens
+            input_tokens = output_tokens = 0
 
         log_llm_metrics(latency, input_tokens, output_tokens)
         # -------------------------------
@@ -211,7 +661,52 @@ def ask(query: AskQuery):
             print(f"GUARDRAIL ALERT: {reason_out}")
             result["answer"] = "I cannot answer this due to safety guidelines."
 
+        if inference_log is not None:
+            inference_log.log(
+                "queries",
+                {**result, "question": question, "server_latency_seconds": latency},
+            )
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"RAG error: {str(e)}")
+
+
+# Admin: on-demand sampling profile of this worker (src/app/profiler.py).
+# Disabled unless ADMIN_TOKEN is set; costs nothing between profiles.
+profiler = SamplingProfiler()
+
+
+def require_admin(token: Optional[str]):
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected or not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@app.get("/admin/profile")
+def admin_profile(
+    seconds: float = 10.0,
+    interval_ms: float = 5.0,
+    memory: bool = False,
+    top: int = 20,
+    format: str = "json",
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """format=collapsed returns plain collapsed stacks for flamegraph tools."""
+    require_admin(x_admin_token)
+    try:
+        result = profiler.profile(
+            seconds, interval=max(interval_ms, 1.0) / 1000, memory=memory, top=top
+        )
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    stacks = collapsed(result["stacks"])
+    if format == "collapsed":
+        return PlainTextResponse(stacks)
+    return {
+        "samples": result["samples"],
+        "collapsed": stacks,
+        "memory": result["memory"],
+    }
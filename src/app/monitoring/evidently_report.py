@@ -1,95 +1,202 @@
-import pandas as pd
+import argparse
+import json
 import os
+import sys
+
+import pandas as pd
 
-from evidently.report import Report
-from evidently.metric_preset import DataDriftPreset, TargetDriftPreset
-from evidently.metrics import ColumnDriftMetric
+# Adjust path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
-print("--- Evidently Report Script Starting ---\n")
+from src.app.feature_store import load_feature_store  # noqa: E402
+from src.app.features import TARGET_COLUMN  # noqa: E402
+from src.app.monitoring.drift_profiles import (  # noqa: E402
+    compare_profiles,
+    load_profile,
+    profile_chunks,
+    profile_csv,
+    render_evidently,
+    save_profile,
+)
 
 # Paths
-TRAIN_SET_PATH = "data/processed/train_set.csv"
-TEST_SET_PATH = "data/processed/test_set.csv"
 RAW_DATA_PATH = "data/raw/Top_Selling_Product_Data.csv"
 
+PROFILE_DIR = os.path.join("data", "processed", "profiles")
+
 REPORT_DIR = "reports"
 TABULAR_REPORT_PATH = os.path.join(REPORT_DIR, "data_and_target_drift.html")
 TEXT_REPORT_PATH = os.path.join(REPORT_DIR, "retrieval_corpus_drift.html")
+TABULAR_SUMMARY_PATH = os.path.join(REPORT_DIR, "data_and_target_drift.json")
+TEXT_SUMMARY_PATH = os.path.join(REPORT_DIR, "retrieval_corpus_drift.json")
+
+
+def print_summary(result: dict):
+    print(
+        f"   Reference rows: {result['reference_rows']}, "
+        f"Current rows: {result['current_rows']}"
+    )
+    print(
+        f"   Drifted columns: {result['drifted_columns']}/{len(result['columns'])} "
+        f"(dataset drift: {result['dataset_drift']})"
+    )
+    for name, column in result["columns"].items():
+        if column["drift_detected"]:
+            print(f"   - {name}: PSI={column['psi']:.3f}")
+
+
+def _frame_chunks(df, chunksize):
+    return lambda: (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+
+
+def get_reference_profile(store, rebuild: bool = False, chunksize: int = 50_000):
+    """The training reference profile is computed once per feature store."""
+    path = os.path.join(PROFILE_DIR, f"train_reference-{store.meta['hash']}.json")
+    if os.path.exists(path) and not rebuild:
+        print(f"   Using cached reference profile {path}")
+        return load_profile(path)
+
+    print(f"   Building reference profile from feature store {store.path}...")
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    train = _model_frame(store, store.train_idx)
+    reference = profile_chunks(_frame_chunks(train, chunksize))
+    save_profile(reference, path)
+    return reference
+
+
+def _model_frame(store, rows):
+    """Encoded features + target, the columns the model actually sees."""
+    return store.frame(rows, columns=store.columns + [TARGET_COLUMN])
 
-os.makedirs(REPORT_DIR, exist_ok=True)
 
 # ---------------------------------------------------------
-# [1/2] Tabular Data Drift (D1) – already working
+# [1/2] Tabular Data Drift (D1)
 # ---------------------------------------------------------
-print("[1/2] Generating Tabular Drift Report (D1)...")
-try:
-    train_df = pd.read_csv(TRAIN_SET_PATH)
-    test_df = pd.read_csv(TEST_SET_PATH)
-
-    tabular_report = Report(
-        metrics=[
-            DataDriftPreset(),
-            TargetDriftPreset(),
-        ]
-    )
+def tabular_drift(args):
+    print("[1/2] Generating Tabular Drift Report (D1)...")
+    store = load_feature_store(RAW_DATA_PATH)
+    reference = get_reference_profile(store, args.rebuild_reference, args.chunksize)
+
+    if args.current:
+        print(f"   Streaming current data from {args.current}...")
+        current = profile_csv(args.current, args.chunksize, reference=reference)
+    else:
+        print("   Using the held-out test split as current data...")
+        test = _model_frame(store, store.test_idx)
+        current = profile_chunks(_frame_chunks(test, args.chunksize), reference)
 
-    tabular_report.run(reference_data=train_df, current_data=test_df)
-    tabular_report.save_html(TABULAR_REPORT_PATH)
-    print(f"-> Saved to {TABULAR_REPORT_PATH}\n")
+    result = compare_profiles(reference, current)
+    print_summary(result)
+    with open(TABULAR_SUMMARY_PATH, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"-> Saved to {TABULAR_SUMMARY_PATH}")
+
+    if args.evidently:
+        render_evidently(reference, current, TABULAR_REPORT_PATH, target=TARGET_COLUMN)
+        print(f"-> Saved to {TABULAR_REPORT_PATH}")
+    print()
 
-except Exception as e:
-    print(f"Warning: Tabular report failed: {e}\n")
 
 # ---------------------------------------------------------
 # [2/2] Retrieval Corpus Drift (D4)
 # ---------------------------------------------------------
-print("[2/2] Generating Retrieval Corpus Drift Report (D4)...")
-try:
-    raw_df = pd.read_csv(RAW_DATA_PATH)
+def _corpus_chunks(path, text_column, chunksize, start, stop):
+    """Rows [start, stop) of the raw file, with the text column replaced by
+    its length and word count (free text itself has no useful histogram)."""
+    offset = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        lo, hi = max(start - offset, 0), min(stop - offset, len(chunk))
+        offset += len(chunk)
+        if lo >= hi:
+            continue
+        chunk = chunk.iloc[lo:hi].dropna(subset=[text_column])
+        text = chunk.pop(text_column).astype(str)
+        chunk[f"{text_column} length"] = text.str.len()
+        chunk[f"{text_column} words"] = text.str.split().str.len()
+        yield chunk
+
+
+def corpus_drift(args):
+    print("[2/2] Generating Retrieval Corpus Drift Report (D4)...")
+    columns = pd.read_csv(RAW_DATA_PATH, nrows=0).columns
 
     # Choose the best text-like column (Title is usually the richest text)
-    if "Title" in raw_df.columns:
+    if "Title" in columns:
         text_column = "Title"
-    elif "Description" in raw_df.columns:
+    elif "Description" in columns:
         text_column = "Description"
     else:
         text_column = "Category"
-
     print(f"   Using column for drift analysis: '{text_column}'")
 
-    # Clean NaNs in the chosen column
-    raw_df = raw_df.dropna(subset=[text_column]).reset_index(drop=True)
-    print(f"   Rows after dropping NaNs in '{text_column}': {len(raw_df)}")
-
-    if len(raw_df) < 10:
+    # Split into reference (first half) and current (second half), by streaming
+    total = sum(
+        len(c)
+        for c in pd.read_csv(
+            RAW_DATA_PATH, usecols=[text_column], chunksize=args.chunksize
+        )
+    )
+    if total < 10:
         raise ValueError("Not enough data after cleaning")
-
-    # Split into reference (first half) and current (second half)
-    mid = len(raw_df) // 2
-    reference_corpus = raw_df.iloc[:mid].copy()
-    current_corpus = raw_df.iloc[mid:].copy()
-
-    print(
-        f"   Reference rows: {len(reference_corpus)}, Current rows: {len(current_corpus)}"
+    mid = total // 2
+
+    def chunks(start, stop):
+        return lambda: _corpus_chunks(
+            RAW_DATA_PATH, text_column, args.chunksize, start, stop
+        )
+
+    reference = profile_chunks(chunks(0, mid))
+    current = profile_chunks(chunks(mid, total), reference=reference)
+
+    result = compare_profiles(reference, current)
+    print_summary(result)
+    with open(TEXT_SUMMARY_PATH, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"-> Saved to {TEXT_SUMMARY_PATH}")
+
+    if args.evidently:
+        render_evidently(reference, current, TEXT_REPORT_PATH)
+        print(f"-> Saved to {TEXT_REPORT_PATH}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sketch-based drift reports")
+    parser.add_argument(
+        "--current",
+        default=None,
+        help="CSV to compare against the training reference (e.g. logged traffic)."
+        " Defaults to the held-out test split.",
     )
-
-    # Use simple, robust drift detection that works on any column type
-    text_report = Report(
-        metrics=[
-            DataDriftPreset(),  # catches drift in all columns (including text/category)
-            ColumnDriftMetric(
-                column_name=text_column
-            ),  # explicit drift test on the chosen column
-        ]
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument(
+        "--rebuild-reference",
+        action="store_true",
+        help="Recompute the cached training reference profile",
     )
+    parser.add_argument(
+        "--evidently",
+        action="store_true",
+        help="Also render Evidently HTML reports from the profiles",
+    )
+    args = parser.parse_args()
+
+    print("--- Evidently Report Script Starting ---\n")
+    os.makedirs(REPORT_DIR, exist_ok=True)
+
+    try:
+        tabular_drift(args)
+    except Exception as e:
+        print(f"Warning: Tabular report failed: {e}\n")
 
-    text_report.run(reference_data=reference_corpus, current_data=current_corpus)
+    try:
+        corpus_drift(args)
+    except Exception as e:
+        print(f"Error generating D4 report: {e}")
+        import traceback
 
-    text_report.save_html(TEXT_REPORT_PATH)
-    print(f"-> Saved to {TEXT_REPORT_PATH}\n")
+        traceback.print_exc()
 
-except Exception as e:
-    print(f"Error generating D4 report: {e}")
-    import traceback
 
-    traceback.print_exc()
+if __name__ == "__main__":
+    main()
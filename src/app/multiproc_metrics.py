@@ -0,0 +1,102 @@
+# src/app/multiproc_metrics.py
+"""
+Prometheus metrics across several gunicorn/uvicorn workers.
+
+Each worker keeps its own in-memory counters, so with N workers a /metrics
+scrape reports whichever worker answered. Setting PROMETHEUS_MULTIPROC_DIR
+(config/gunicorn.conf.py does) switches prometheus_client to mmap-backed
+values: every worker writes its own `<type>_<pid>.db` files, and /metrics
+merges all of them at scrape time. Recording stays an in-process write to
+an mmapped page; the cost of merging is paid only by the scrape.
+
+Worker restarts leave files behind. Dropping a dead worker's counters
+would make them go backwards, so mark_worker_dead() (gunicorn's child_exit
+hook) folds its counter/histogram/summary files into one
+`<type>_archive.db` per type, and removes its live gauges. The directory
+stays at O(live workers) files however often workers are recycled. Folding
+holds an exclusive flock on the directory, and scrapes hold a shared one,
+so a scrape never sees the dead worker's values both in its own file and in
+the archive.
+"""
+
+import fcntl
+import glob
+import os
+from contextlib import contextmanager
+
+ENV_VAR = "PROMETHEUS_MULTIPROC_DIR"
+ARCHIVED_TYPES = ("counter", "histogram", "summary")
+_LOCK_FILE = ".archive.lock"
+
+
+def multiproc_dir():
+    """The shared metrics directory, or None in single-process mode."""
+    return os.environ.get(ENV_VAR) or None
+
+
+@contextmanager
+def _locked(path: str, exclusive: bool):
+    with open(os.path.join(path, _LOCK_FILE), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def reset_dir(path: str = None):
+    """Create the directory and drop files left by a previous server run."""
+    path = path or multiproc_dir()
+    os.makedirs(path, exist_ok=True)
+    for f in glob.glob(os.path.join(path, "*.db")):
+        os.remove(f)
+
+
+def _archive(path: str, typ: str, pid: int) -> bool:
+    from prometheus_client.mmap_dict import MmapedDict
+
+    dead = os.path.join(path, f"{typ}_{pid}.db")
+    if not os.path.exists(dead):
+        return False
+    archive = os.path.join(path, f"{typ}_archive.db")
+    # Raw per-file values (histogram buckets included) are plain sums
+    totals = {}
+    for f in (archive, dead):
+        if os.path.exists(f):
+            for key, value, _, _ in MmapedDict.read_all_values_from_file(f):
+                totals[key] = totals.get(key, 0.0) + value
+
+    tmp = archive + ".tmp"  # not *.db, so scrapes never read it half-written
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    merged = MmapedDict(tmp)
+    for key, value in totals.items():
+        merged.write_value(key, value, 0.0)
+    merged.close()
+    os.replace(tmp, archive)
+    os.remove(dead)
+    return True
+
+
+def mark_worker_dead(pid: int, path: str = None) -> int:
+    """
+    Bookkeeping for an exited worker. Returns the number of its files folded
+    into the archives.
+    """
+    from prometheus_client import multiprocess
+
+    path = path or multiproc_dir()
+    multiprocess.mark_process_dead(pid, path)  # live* gauges
+    with _locked(path, exclusive=True):
+        return sum(_archive(path, typ, pid) for typ in ARCHIVED_TYPES)
+
+
+def collect_latest(path: str = None) -> bytes:
+    """/metrics payload merged over every worker's files."""
+    from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+    path = path or multiproc_dir()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path)
+    with _locked(path, exclusive=False):
+        return generate_latest(registry)
@@ -0,0 +1,165 @@
+# src/app/prediction_cache.py
+"""
+Result cache for /predict.
+
+Re-scoring jobs and storefront widgets send the same ProductFeatures payload
+over and over. The cache is checked before encoding, and it is keyed by a
+canonical hash of the validated features plus the loaded model's version.
+
+- In-process LRU with a TTL, bounded to maxsize entries.
+- Optional shared tier (PREDICTION_CACHE_PATH): a SQLite file on local disk,
+  so several workers on one host reuse each other's results.
+- set_model_version() drops this worker's in-process entries when the model
+  is reloaded. The shared tier is left alone, since other workers may still
+  serve the old model: entries from another version can never be returned
+  anyway, because the version is part of the key, and they expire by TTL.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .instrumentation import log_prediction_cache
+
+
+def model_version_of(path: str) -> str:
+    """Content hash of a model artifact, so retrained models never share keys."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 300.0,
+        model_version: str = "",
+        shared_path: str = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_version = model_version
+        self.shared_path = shared_path
+
+        self._entries = OrderedDict()  # key -> (expires_at, value, cost_seconds)
+        self._lock = threading.Lock()
+        self._conn = None
+        if shared_path:
+            self._connect()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.shared_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.shared_path, timeout=1.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")  # concurrent worker readers
+        # Only a cache: no fsync per commit on the /predict miss path. With WAL,
+        # a crash can lose the last puts but never corrupts the file
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, value REAL, cost REAL, expires REAL)"
+        )
+        self._conn.commit()
+
+    def key(self, features: dict) -> str:
+        """Canonical hash of the validated feature dict and the model version."""
+        payload = json.dumps(features, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16)
+        digest.update(self.model_version.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                entry = self._shared_get(key, now)
+            if entry is None:
+                self.misses += 1
+                log_prediction_cache("miss")
+                return None
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[2]
+        log_prediction_cache("hit", entry[2])
+        return entry[1]
+
+    def put(self, key: str, value: float, cost_seconds: float = 0.0):
+        entry = (time.time() + self.ttl, value, cost_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            if self._conn is not None:
+                self._shared_put(key, entry)
+
+    def _shared_get(self, key: str, now: float):
+        try:
+            row = self._conn.execute(
+                "SELECT expires, value, cost FROM predictions "
+                "WHERE key = ? AND expires >= ?",
+                (key, now),
+            ).fetchone()
+        except sqlite3.OperationalError:  # locked by another worker, treat as miss
+            return None
+        return tuple(row) if row else None
+
+    def _shared_put(self, key: str, entry: tuple):
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                (key, entry[1], entry[2], entry[0]),
+            )
+            self._conn.commit()
+        except sqlite3.OperationalError:
+            pass
+
+    def set_model_version(self, version: str):
+        """Called on model (re)load; drops this worker's entries for the old model."""
+        with self._lock:
+            if version == self.model_version:
+                return
+            self.model_version = version
+            self._entries.clear()
+            if self._conn is not None:
+                self._shared_purge_expired()
+
+    def _shared_purge_expired(self):
+        """Keeps the shared file from growing; live entries of any version stay."""
+        try:
+            self._conn.execute(
+                "DELETE FROM predictions WHERE expires < ?", (time.time(),)
+            )
+            self._conn.commit()
+        except sqlite3.OperationalError:  # locked by another worker, next reload
+            pass
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": round(self.saved_seconds, 4),
+        }
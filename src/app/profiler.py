@@ -0,0 +1,121 @@
+# src/app/profiler.py
+"""
+On-demand statistical profiler for a live API worker.
+
+GET /admin/profile?seconds=10 samples every thread's Python stack every few
+milliseconds for the given duration. It returns the counts in collapsed-stack
+format, one "root;...;leaf count" line per distinct stack, which
+flamegraph.pl, speedscope and inferno read directly. With memory=true it also
+traces allocations for the same window (tracemalloc) and reports the top-N
+allocation sites.
+
+Nothing runs between profiles: no thread, no sys.setprofile/settrace hook, no
+tracemalloc. Sampling only reads sys._current_frames() from a background
+thread, so requests are never instrumented, only briefly paused for the GIL.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MAX_SECONDS = 60.0
+_PREFIXES = sorted(
+    {p for p in sys.path if p and os.path.isdir(p)} | {os.getcwd()},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1 :]
+    return filename
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile is already running in this worker."""
+
+
+class SamplingProfiler:
+    """One profiling session at a time per process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(
+        self,
+        seconds: float,
+        interval: float = 0.005,
+        memory: bool = False,
+        top: int = 20,
+    ) -> dict:
+        """Blocks for `seconds`; returns {"samples", "stacks", "memory"}."""
+        seconds = min(max(seconds, 0.0), MAX_SECONDS)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("a profile is already running")
+        try:
+            trace_memory = memory and not tracemalloc.is_tracing()
+            if trace_memory:
+                tracemalloc.start()
+            try:
+                stacks, samples = self._sample(seconds, interval)
+                allocations = self._top_allocations(top) if memory else None
+            finally:
+                if trace_memory:
+                    tracemalloc.stop()
+        finally:
+            self._lock.release()
+        return {"samples": samples, "stacks": stacks, "memory": allocations}
+
+    def _sample(self, seconds: float, interval: float):
+        stacks = Counter()
+        samples = 0
+        me = threading.get_ident()
+        labels = {}  # code object -> label, so each sample is just lookups
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stacks[tuple(reversed(stack))] += 1
+            samples += 1
+            time.sleep(interval)
+        return stacks, samples
+
+    @staticmethod
+    def _top_allocations(top: int) -> list:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        return [
+            {
+                "site": f"{_short_path(stat.traceback[0].filename)}:"
+                f"{stat.traceback[0].lineno}",
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top]
+        ]
+
+
+def collapsed(stacks: Counter) -> str:
+    """Brendan Gregg's collapsed-stack format, heaviest stacks first."""
+    return "\n".join(
+        f"{';'.join(stack)} {count}" for stack, count in stacks.most_common()
+    )
@@ -0,0 +1,268 @@
+# src/app/rag_pool.py
+"""
+Out-of-process RAG serving.
+
+RAG (torch MiniLM embeddings, the LlamaIndex index, the Groq client) runs in
+its own pool of processes, sized independently of the API workers:
+
+    python -m src.app.rag_pool --workers 2 --address /tmp/daraz-rag.sock
+
+With RAG_POOL_ADDRESS set, src/app/main.py forwards /ask to the pool over
+that local socket and never imports src.rag.query. Prediction-only API
+workers then stay free of torch and llama_index, and heavy RAG requests no
+longer compete with /predict for the API process's GIL.
+
+Requests and replies are pickled, so every connection is authenticated. A
+TCP address needs RAG_POOL_AUTHKEY on both sides. For a Unix socket without
+it, the server writes a random key next to the socket (<socket>.key, mode
+0600), and clients on the same host read it from there.
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import queue
+import secrets
+import signal
+import socket
+import struct
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import (
+    Client,
+    Listener,
+    answer_challenge,
+    deliver_challenge,
+)
+
+DEFAULT_ADDRESS = os.path.join("/tmp", "daraz-rag.sock")
+DEFAULT_HANDLER = "src.rag.query:ask_rag"
+HANDSHAKE_TIMEOUT = 5.0
+
+
+def parse_address(address: str):
+    """'host:port' -> TCP tuple, anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def key_path(address) -> str:
+    return address + ".key"
+
+
+def _authkey(address, create: bool = False) -> bytes:
+    """
+    RAG_POOL_AUTHKEY, or for a Unix socket the shared key file (written by
+    the server when create is set). Never None: an unauthenticated listener
+    would unpickle whatever a client sends.
+    """
+    key = os.getenv("RAG_POOL_AUTHKEY")
+    if key:
+        return key.encode()
+    if not isinstance(address, str):
+        raise ValueError("A TCP RAG pool address needs RAG_POOL_AUTHKEY")
+    path = key_path(address)
+    if create:
+        key = secrets.token_bytes(32)
+        if os.path.exists(path):
+            os.unlink(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# --- Pool worker state ---
+_handler = None
+
+
+def _init_worker(handler: str):
+    """Imports the RAG stack once per worker, and warms the engine if it has one."""
+    global _handler
+    module_name, name = handler.split(":")
+    module = importlib.import_module(module_name)
+    _handler = getattr(module, name)
+    if hasattr(module, "get_engine"):
+        try:
+            module.get_engine()
+        except Exception as e:  # surfaces again, per request, from the handler
+            print(f"RAG worker warm-up failed: {e}")
+
+
+def _ready() -> bool:
+    return True
+
+
+def _run(request) -> dict:
+    if isinstance(request, dict):  # question plus a latency budget
+        return _handler(request["question"], budget_seconds=request["budget_seconds"])
+    return _handler(request)
+
+
+class RAGPoolServer:
+    def __init__(
+        self,
+        address: str,
+        workers: int = 2,
+        handler: str = DEFAULT_HANDLER,
+        handshake_timeout: float = HANDSHAKE_TIMEOUT,
+    ):
+        self.address = parse_address(address)
+        self.workers = workers
+        self.handler = handler
+        self.handshake_timeout = handshake_timeout
+        self._authkey = None
+        self._listener = None
+        self._pool = None
+
+    def start(self):
+        # Before anything else, so a TCP address without a key fails fast
+        self._authkey = _authkey(self.address, create=True)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)  # stale socket from a previous run
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.handler,),
+        )
+        # Fork every worker now: forked on the first request instead, they
+        # would inherit open connections and keep them alive after close
+        self._pool.submit(_ready).result()
+        # No authkey here: Listener.accept() would run the challenge on the
+        # accept thread, where one silent client blocks every later one
+        self._listener = Listener(self.address)
+        return self
+
+    def serve_forever(self):
+        print(f"RAG pool ({self.workers} workers) listening on {self.address}")
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:  # listener closed
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _authenticate(self, conn) -> bool:
+        """The Listener's authkey handshake, bounded by handshake_timeout."""
+        # SO_RCVTIMEO on a dup of the socket: the fd itself stays blocking
+        sock = socket.socket(fileno=os.dup(conn.fileno()))
+        seconds = int(self.handshake_timeout)
+        micros = int((self.handshake_timeout - seconds) * 1e6)
+        try:
+            sock.setsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_RCVTIMEO,
+                struct.pack("ll", seconds, micros),
+            )
+            deliver_challenge(conn, self._authkey)
+            answer_challenge(conn, self._authkey)
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVTIMEO, struct.pack("ll", 0, 0)
+            )
+            return True
+        except (multiprocessing.AuthenticationError, EOFError, OSError):
+            return False  # wrong key, hung up, or silent past the timeout
+        finally:
+            sock.close()
+
+    def _handle(self, conn):
+        """One API-side connection; requests on it are answered in order."""
+        with conn:
+            if not self._authenticate(conn):
+                return
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = {"result": self._pool.submit(_run, request).result()}
+                except Exception as e:
+                    reply = {"error": str(e)}
+                conn.send(reply)
+
+    def close(self):
+        self._listener.close()
+        self._pool.shutdown(cancel_futures=True)
+        if isinstance(self.address, str) and not os.getenv("RAG_POOL_AUTHKEY"):
+            try:
+                os.unlink(key_path(self.address))
+            except FileNotFoundError:
+                pass
+
+
+class RAGClient:
+    """
+    API-side stub with the same signature as ask_rag. Connections are pooled
+    and reused, so each /ask costs one round trip over the socket.
+    """
+
+    def __init__(self, address: str, timeout: float = 60.0, max_idle: int = 16):
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            # Read per connection: a restarted pool writes a new key file
+            return Client(self.address, authkey=_authkey(self.address))
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def ask(self, question: str, budget_seconds: float = None) -> dict:
+        request = question
+        if budget_seconds is not None:
+            request = {"question": question, "budget_seconds": budget_seconds}
+        conn = self._acquire()
+        try:
+            conn.send(request)
+            if not conn.poll(self.timeout):
+                raise TimeoutError(f"RAG pool did not answer in {self.timeout}s")
+            reply = conn.recv()
+        except BaseException:
+            conn.close()  # the reply may still arrive; never reuse this connection
+            raise
+        self._release(conn)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve /ask from a process pool")
+    parser.add_argument(
+        "--address", default=os.getenv("RAG_POOL_ADDRESS", DEFAULT_ADDRESS)
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--handler",
+        default=DEFAULT_HANDLER,
+        help="module:function answering a question",
+    )
+    args = parser.parse_args()
+    server = RAGPoolServer(args.address, args.workers, args.handler).start()
+    # On container stop, shut the pool down too instead of orphaning workers
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# src/app/sentiment.py
+"""
+Local sentiment classifier for code-mixed (Roman Urdu / English) reviews.
+
+Features are hashed character n-grams (2-5, within word boundaries), which
+cope with the many spellings of the same Roman Urdu word ("acha", "achha",
+"achaaa"), plus hashed word unigrams/bigrams. A linear model on top scores
+thousands of reviews per second on one CPU, vs. ~1 review/s through the LLM
+prompts in experiments/prompts/.
+
+Hashing needs no vocabulary, so the saved artifact is just the weights of
+the feature columns seen in training, plus the hashing config. It is a
+compressed .npz (no pickle), trained by train_sentiment.py.
+"""
+
+import re
+
+import numpy as np
+
+LABELS = ("negative", "neutral", "positive")
+N_FEATURES = 2**18  # per vectorizer
+_REPEATS_RE = re.compile(r"(.)\1{2,}")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and cap character runs at two ("goooood" -> "good")."""
+    return _REPEATS_RE.sub(r"\1\1", str(text).lower())
+
+
+def _vectorizers(n_features: int = N_FEATURES):
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    common = dict(
+        n_features=n_features,
+        alternate_sign=False,
+        preprocessor=normalize,
+        dtype=np.float32,
+    )
+    return (
+        HashingVectorizer(analyzer="char_wb", ngram_range=(2, 5), **common),
+        HashingVectorizer(
+            analyzer="word",
+            ngram_range=(1, 2),
+            token_pattern=r"(?u)\b\w+\b|[^\w\s]",  # keep emoji and "!" as tokens
+            **common,
+        ),
+    )
+
+
+class SentimentClassifier:
+    def __init__(self, weights=None, intercept=None, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self.weights = weights  # (2 * n_features, len(LABELS)) float32
+        self.intercept = intercept
+        self._vectors = _vectorizers(n_features)
+
+    def features(self, texts):
+        import scipy.sparse as sp
+
+        char, word = self._vectors
+        return sp.hstack([char.transform(texts), word.transform(texts)]).tocsr()
+
+    def fit(self, texts, labels, C: float = 0.5):
+        from sklearn.svm import LinearSVC
+
+        model = LinearSVC(C=C).fit(self.features(texts), labels)
+        order = [list(model.classes_).index(label) for label in LABELS]
+        self.weights = np.ascontiguousarray(model.coef_[order].T, dtype=np.float32)
+        self.intercept = model.intercept_[order].astype(np.float32)
+        return self
+
+    def decision_function(self, texts) -> np.ndarray:
+        return self.features(texts) @ self.weights + self.intercept
+
+    def predict(self, texts) -> list:
+        if len(texts) == 0:
+            return []
+        scores = self.decision_function(texts)
+        return [LABELS[i] for i in scores.argmax(axis=1)]
+
+    def save(self, path: str):
+        # Only hash buckets seen in training have non-zero weights
+        rows = np.flatnonzero(self.weights.any(axis=1)).astype(np.int32)
+        np.savez_compressed(
+            path,
+            rows=rows,
+            values=self.weights[rows],
+            intercept=self.intercept,
+            n_features=self.n_features,
+            labels=np.array(LABELS),
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            if tuple(data["labels"]) != LABELS:
+                raise ValueError(f"{path} was trained for labels {data['labels']}")
+            n_features = int(data["n_features"])
+            weights = np.zeros((2 * n_features, len(LABELS)), dtype=np.float32)
+            weights[data["rows"]] = data["values"]
+            return cls(weights, data["intercept"], n_features)
@@ -0,0 +1,209 @@
+# src/app/shadow.py
+"""
+Shadow scoring and canary routing for candidate models.
+
+The app loads the primary models/model.joblib plus candidates from
+SHADOW_MODELS ("name=path,name=path"). On each request:
+
+- CanaryRouter picks the model whose score is returned. This is the primary,
+  unless CANARY_WEIGHTS ("name=0.05,...") routes a share of traffic to a
+  candidate.
+- ShadowScorer.submit() queues the already-encoded row. A background worker
+  scores it with every other model in batches and records score deltas and
+  per-model latency. The request path only pays for a non-blocking put; when
+  the queue is full, rows are dropped and counted instead.
+"""
+
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+from .instrumentation import log_shadow_dropped, log_shadow_score
+
+PRIMARY = "primary"
+
+
+def parse_spec(spec: str) -> dict:
+    """'a=x,b=y' -> {'a': 'x', 'b': 'y'}"""
+    pairs = [item.split("=", 1) for item in (spec or "").split(",") if item.strip()]
+    return {name.strip(): value.strip() for name, value in pairs}
+
+
+def load_candidates(spec: str, model_columns: list) -> dict:
+    """Loads candidate models that accept the primary's encoded input."""
+    import joblib  # imported on model load, not with the API module
+
+    candidates = {}
+    for name, path in parse_spec(spec).items():
+        try:
+            model = joblib.load(path)
+        except FileNotFoundError:
+            print(f"Warning: candidate model {name} not found at {path}, skipping.")
+            continue
+        features = list(getattr(model, "feature_names_in_", model_columns))
+        if features != list(model_columns):
+            print(f"Warning: candidate {name} uses different columns, skipping.")
+            continue
+        if hasattr(model, "n_jobs"):
+            model.n_jobs = 1  # shadow work stays on one core
+        candidates[name] = model
+        print(f"Candidate model {name} loaded from {path}.")
+    return candidates
+
+
+class CanaryRouter:
+    def __init__(self, weights: dict):
+        total = sum(weights.values())
+        if total > 1:
+            raise ValueError(f"Canary weights add up to {total} > 1")
+        self.weights = weights
+
+    def choose(self) -> str:
+        draw = random.random()
+        for name, weight in self.weights.items():
+            if draw < weight:
+                return name
+            draw -= weight
+        return PRIMARY
+
+
+def _shadow_worker(models, model_columns, requests, results, batch_size, niceness):
+    """Child process: scores queued rows with every model except the served one."""
+    os.nice(niceness)  # request-path work always wins the CPU
+    while True:
+        batch = [requests.get()]
+        if batch[0] is None:
+            return
+        while len(batch) < batch_size:
+            try:
+                batch.append(requests.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            results.put((len(batch), score_batch(models, model_columns, batch)))
+        except Exception as e:  # never let a bad candidate kill the worker
+            print(f"Shadow scoring failed: {e}")
+            results.put((len(batch), []))
+
+
+def score_batch(models: dict, model_columns: list, batch: list) -> list:
+    """[(model, deltas vs. served score, per-row seconds), ...] for one batch."""
+    import pandas as pd
+
+    X = pd.DataFrame(np.vstack([row for _, _, row in batch]), columns=model_columns)
+    served = np.array([name for name, _, _ in batch])
+    served_scores = np.array([score for _, score, _ in batch])
+    scored = []
+    for name, model in models.items():
+        mask = served != name
+        if not mask.any():
+            continue
+        start = time.perf_counter()
+        scores = np.clip(model.predict(X[mask]), 1, 100)
+        per_row = (time.perf_counter() - start) / mask.sum()
+        scored.append((name, (scores - served_scores[mask]).tolist(), per_row))
+    return scored
+
+
+class ShadowScorer:
+    """
+    Shadow scoring runs in a separate, niced process, so it neither holds the
+    API's GIL nor competes with request handling for a core. A small thread in
+    the API process only turns the worker's results into Prometheus metrics.
+    """
+
+    def __init__(
+        self,
+        models: dict,
+        model_columns: list,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        niceness: int = 19,
+    ):
+        self.models = models  # name -> model, including PRIMARY
+        self.model_columns = model_columns
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.niceness = niceness
+        self._process = None
+        self._requests = self._results = None
+        self.submitted = 0
+        self.scored = 0
+        self.dropped = 0
+
+    def start(self):
+        # fork shares the loaded models with the worker instead of pickling them
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._requests = context.Queue(maxsize=self.max_queue)
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=_shadow_worker,
+            args=(
+                self.models,
+                self.model_columns,
+                self._requests,
+                self._results,
+                self.batch_size,
+                self.niceness,
+            ),
+            name="shadow-scorer",
+            daemon=True,
+        )
+        self._process.start()
+        threading.Thread(
+            target=self._collect,
+            args=(self._results,),
+            name="shadow-metrics",
+            daemon=True,
+        ).start()
+        return self
+
+    def restart(self, models: dict, model_columns: list):
+        """Picks up reloaded models by replacing the worker process."""
+        self.stop()
+        self.models, self.model_columns = models, model_columns
+        return self.start()
+
+    def stop(self):
+        if self._process is not None:
+            self._requests.put(None)
+            self._process.join(timeout=5)
+            self._results.put(None)
+            self._process = None
+
+    # --- Hot path ---
+    def submit(self, served: str, score: float, row: np.ndarray):
+        if self._requests is None:
+            self.dropped += 1
+            log_shadow_dropped()
+            return
+        try:
+            self._requests.put_nowait((served, score, row))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped += 1
+            log_shadow_dropped()
+
+    # --- Metrics ---
+    def _collect(self, results):
+        while True:
+            item = results.get()
+            if item is None:
+                return
+            rows, scored = item
+            for name, deltas, per_row in scored:
+                for delta in deltas:
+                    log_shadow_score(name, delta, per_row)
+            self.scored += rows
+
+    def join(self, timeout: float = 30.0):
+        """Blocks until everything submitted so far has been scored."""
+        deadline = time.monotonic() + timeout
+        while self.scored < self.submitted and time.monotonic() < deadline:
+            time.sleep(0.01)
@@ -0,0 +1,142 @@
+# src/app/single_flight.py
+"""
+Request coalescing ("single flight") for /ask.
+
+When a question trends, many identical /ask requests arrive at once, and each
+would run embedding, retrieval and a full LLM completion. SingleFlight lets
+the first request for a key (the leader) do the work while concurrent
+duplicates (followers) wait for its result:
+
+    flight = SingleFlight(timeout=60)
+    result, shared = flight.do(normalize_question(q), ask_rag, q)
+
+- Followers get a shallow copy of the leader's result, so per-request edits
+  (e.g. output moderation) don't leak between them.
+- If the leader raises, every follower raises the same exception. Nothing is
+  cached: the next request after completion starts a fresh call.
+- Followers wait at most `timeout` seconds, then raise CoalesceTimeout. The
+  leader itself is never cut short.
+
+do() blocks the calling thread (sync endpoints run in FastAPI's threadpool).
+do_async() is the coroutine version for async callers. Both share the same
+in-flight table, so sync and async requests for a key coalesce with each
+other.
+"""
+
+import asyncio
+import copy
+import re
+import threading
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+class CoalesceTimeout(TimeoutError):
+    """A follower gave up waiting for the leader's result."""
+
+
+def normalize_question(question: str) -> str:
+    """Key for coalescing: case, whitespace and trailing punctuation ignored."""
+    return _SPACE_RE.sub(" ", question.casefold()).strip().rstrip("?!. ")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.async_waiters = []  # (loop, future) pairs, woken on completion
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(self, timeout: float = 60.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        # Plain counters for tests/benchmarks; Prometheus is fed by main.py
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def _join(self, key, async_waiter=None):
+        """Returns (call, is_leader)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                return call, True
+            call.waiters += 1
+            if async_waiter is not None:
+                call.async_waiters.append(async_waiter)
+            return call, False
+
+    def _finish(self, key, call, result=None, error=None):
+        with self._lock:
+            del self._calls[key]  # later requests start a new call
+            async_waiters = call.async_waiters
+        call.result, call.error = result, error
+        call.done.set()
+        for loop, future in async_waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:  # that waiter's loop has since closed
+                pass
+
+    def _outcome(self, call):
+        if call.error is not None:
+            if isinstance(call.error, asyncio.CancelledError):
+                raise RuntimeError("coalesced call was cancelled")
+            raise call.error
+        self.shared += 1
+        return copy.copy(call.result), True
+
+    def _timed_out(self):
+        self.timeouts += 1
+        return CoalesceTimeout(
+            f"identical request still in flight after {self.timeout}s"
+        )
+
+    def do(self, key, fn, *args):
+        """fn(*args) once per key at a time. Returns (result, shared)."""
+        call, leader = self._join(key)
+        if not leader:
+            if not call.done.wait(self.timeout):
+                raise self._timed_out()
+            return self._outcome(call)
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result=result)
+        return result, False
+
+    async def do_async(self, key, fn, *args):
+        """await fn(*args) once per key at a time. Returns (result, shared)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        call, leader = self._join(key, (loop, future))
+        if not leader:
+            try:
+                await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                raise self._timed_out() from None
+            return self._outcome(call)
+        try:
+            result = await fn(*args)
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result=result)
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,59 @@
+# src/app/startup_report.py
+"""
+Where API startup time goes. Run from the repo root:
+
+    python -m src.app.startup_report
+
+1. Import-time profile of src.app.main (python -X importtime), as self time
+   grouped by top-level package. Everything listed here is paid before the
+   first /health.
+2. Time spent in each deferred loader (model, drift, rag). These run in the
+   background after startup, or on the first request that needs them.
+"""
+
+import subprocess
+import sys
+from collections import defaultdict
+
+MODULE = "src.app.main"
+
+
+def import_profile(module: str = MODULE):
+    """Returns (total seconds, {top-level package: self seconds})."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    packages = defaultdict(float)
+    total = 0.0
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1e6
+        if name.strip() == module:
+            total = int(cumulative_us) / 1e6
+    return total, dict(packages)
+
+
+def loader_timings() -> dict:
+    from src.app import main
+
+    main.warm_up()
+    return dict(main.STARTUP_TIMINGS)
+
+
+def main(top: int = 15):
+    total, packages = import_profile()
+    print(f"Import of {MODULE}: {total:.3f}s")
+    for name, seconds in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {name:<28} {seconds:.3f}s")
+
+    print("Deferred loaders:")
+    for phase, seconds in loader_timings().items():
+        print(f"  {phase:<28} {seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# src/app/sweep.py
+"""
+What-if sweeps for /predict/sweep.
+
+A sweep is a base product plus one axis of values per swept field. Pricing
+jobs used to send one /predict call per variant. Here the base product is
+encoded once, and every variant is built by writing each axis's encoded
+columns into a copy of that row:
+
+- numeric field: one model column, the value itself;
+- categorical field: its one-hot block, one row per level (all zeros for a
+  level the model has no column for, as encode_features does).
+
+The full grid is then one broadcasted assignment per axis and one model
+pass. Scores are returned as a flat list in C order over the axes, so
+score i belongs to np.unravel_index(i, shape).
+"""
+
+import numpy as np
+
+from .features import API_TO_TRAINING_COLUMNS, CATEGORICAL_FEATURES
+
+CATEGORICAL_FIELDS = [
+    api
+    for api, column in API_TO_TRAINING_COLUMNS.items()
+    if column in CATEGORICAL_FEATURES
+]
+MAX_RANGE_POINTS = 100_000
+
+
+class SweepError(ValueError):
+    """A sweep that can't be built; reported to the client as a 422."""
+
+
+def expand_axis(field: str, spec) -> list:
+    """
+    Values of one axis: an explicit list, or {"start", "stop"} plus either
+    "step" or "num" (stop included).
+    """
+    if isinstance(spec, list):
+        values = spec
+    else:
+        if (spec.step is None) == (spec.num is None):
+            raise SweepError(f"{field}: give exactly one of step or num")
+        if spec.num is not None:
+            count = spec.num
+        else:
+            if spec.step <= 0 or spec.stop < spec.start:
+                raise SweepError(f"{field}: need step > 0 and stop >= start")
+            # Still a float here: a tiny step can make this inf
+            count = np.floor((spec.stop - spec.start) / spec.step + 1e-9) + 1
+        # Checked before anything of that size is allocated
+        if count > MAX_RANGE_POINTS:
+            raise SweepError(f"{field}: more than {MAX_RANGE_POINTS} points")
+        if spec.num is not None:
+            values = np.linspace(spec.start, spec.stop, spec.num).tolist()
+        else:
+            values = (spec.start + spec.step * np.arange(int(count))).tolist()
+    if not values:
+        raise SweepError(f"{field}: no values")
+    categorical = field in CATEGORICAL_FIELDS
+    for value in values:
+        if categorical != isinstance(value, str):
+            kind = "strings" if categorical else "numbers"
+            raise SweepError(f"{field}: values must be {kind}")
+    return values
+
+
+def axis_block(field: str, values: list, model_columns: list):
+    """(model column indices, (len(values), len(indices)) encoded values)."""
+    column = API_TO_TRAINING_COLUMNS[field]
+    if field not in CATEGORICAL_FIELDS:
+        if column not in model_columns:  # the model ignores this field
+            return [], np.zeros((len(values), 0))
+        return [model_columns.index(column)], np.array(values, dtype=float)[:, None]
+    prefix = column + "_"
+    indices = [i for i, c in enumerate(model_columns) if c.startswith(prefix)]
+    levels = [model_columns[i][len(prefix) :] for i in indices]
+    block = np.array([[value == level for level in levels] for value in values])
+    return indices, block.astype(float).reshape(len(values), len(indices))
+
+
+def build_variants(base_row: np.ndarray, axes: dict, model_columns: list):
+    """The (variants, columns) matrix for every combination of axis values."""
+    shape = tuple(len(values) for values in axes.values())
+    X = np.empty(shape + (len(base_row),))
+    X[...] = base_row
+    for dim, (field, values) in enumerate(axes.items()):
+        indices, block = axis_block(field, values, model_columns)
+        # Broadcast this axis's block along every other axis
+        view = [1] * len(shape) + [len(indices)]
+        view[dim] = len(values)
+        X[..., indices] = block.reshape(view)
+    return X.reshape(-1, len(base_row)), shape
+
+
+def feasible_mask(axes: dict, shape: tuple, base: dict, constraints: dict):
+    """True for variants whose numeric fields are within every min/max bound."""
+    mask = np.ones(shape, dtype=bool)
+    for field, bounds in constraints.items():
+        if field in CATEGORICAL_FIELDS or field not in API_TO_TRAINING_COLUMNS:
+            raise SweepError(f"{field}: constraints need a numeric field")
+        if field in axes:
+            dim = list(axes).index(field)
+            values = np.array(axes[field], dtype=float)
+            values = values.reshape([-1 if d == dim else 1 for d in range(len(shape))])
+        else:
+            values = np.array(float(base[field]))
+        if bounds.min is not None:
+            mask &= values >= bounds.min
+        if bounds.max is not None:
+            mask &= values <= bounds.max
+    return mask.ravel()
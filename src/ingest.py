@@ -49,4 +49,9 @@ index = VectorStoreIndex(nodes, show_progress=True)
 print("Saving to 'faiss_index'...")
 index.storage_context.persist(persist_dir="faiss_index")
 
+# 5. Compact copy that query.py loads lazily (src/rag/compact_store.py)
+from rag.compact_store import compact_index  # noqa: E402
+
+print(f"Compact store written to {compact_index('faiss_index')}")
+
 print("SUCCESS: Index built! Now run 'make run' or 'python main.py'")
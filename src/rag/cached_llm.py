@@ -0,0 +1,87 @@
+# src/rag/cached_llm.py
+"""
+LlamaIndex LLM wrapper that puts the record/replay cache (llm_cache.py)
+underneath the RAG engine's LLM. Kept separate from llm_cache.py so the
+experiment scripts can use the cache without importing llama_index.
+"""
+
+from typing import Any, Sequence
+
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    CompletionResponse,
+    CompletionResponseGen,
+    LLMMetadata,
+)
+from llama_index.core.llms import CustomLLM
+from llama_index.core.llms.callbacks import llm_chat_callback, llm_completion_callback
+from pydantic import PrivateAttr
+
+from .llm_cache import LLMCache
+
+
+class CachedLLM(CustomLLM):
+    _inner: Any = PrivateAttr()
+    _cache: LLMCache = PrivateAttr()
+
+    def __init__(self, inner, cache: LLMCache = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._inner = inner
+        self._cache = cache or LLMCache()
+
+    @property
+    def cache(self) -> LLMCache:
+        return self._cache
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self._inner.metadata
+
+    def _model_and_params(self, kwargs: dict):
+        model = getattr(self._inner, "model", type(self._inner).__name__)
+        params = {
+            "temperature": getattr(self._inner, "temperature", None),
+            "max_tokens": getattr(self._inner, "max_tokens", None),
+            **kwargs,
+        }
+        return model, params
+
+    @llm_chat_callback()
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        model, params = self._model_and_params(kwargs)
+        serialized = [
+            {"role": str(m.role.value), "content": m.content} for m in messages
+        ]
+
+        text = self._cache.call(
+            model,
+            serialized,
+            params,
+            lambda: self._inner.chat(messages, **kwargs).message.content,
+        )
+        return ChatResponse(message=ChatMessage(role="assistant", content=text))
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        model, params = self._model_and_params(kwargs)
+        text = self._cache.call(
+            model,
+            [{"role": "user", "content": prompt}],
+            params,
+            lambda: self._inner.complete(prompt, formatted=formatted, **kwargs).text,
+        )
+        return CompletionResponse(text=text)
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        # Streaming is not cached; it is never used by the query engine here.
+        return self._inner.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "cached_llm"
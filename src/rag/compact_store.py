@@ -0,0 +1,254 @@
+# src/rag/compact_store.py
+"""
+Compact, lazily loaded storage for the persisted review index.
+
+load_index_from_storage(StorageContext.from_defaults(persist_dir=...)) parses
+docstore.json, index_store.json and default__vector_store.json in full, in
+every worker. That turns every node's text, metadata and relationships, and
+every embedding, into Python objects, though a query only reads the text of
+its top-k nodes. compact_index() converts a persisted index once:
+
+    python -m src.rag.compact_store faiss_index    # -> faiss_index/compact/
+
+    compact/
+        store.sqlite     docstore and index store, one row per key
+        embeddings.npy   float32 (nodes, dim), memory-mapped
+        ids.json         node id of each embedding row
+        source.json      size, mtime and hash of the JSON stores it came from
+
+- SQLiteKVStore backs LlamaIndex's own KVDocumentStore/KVIndexStore, so
+  nodes are read from SQLite (primary-key lookups) only when retrieved.
+- CompactVectorStore memory-maps the embeddings and ranks them by cosine
+  similarity with one matrix-vector product (as SimpleVectorStore's default
+  mode does, without the per-node Python lists). It stores no text, so
+  retrievers fetch the top-k nodes from the docstore by id.
+
+The compact store is read-only: rebuild the index with src/ingest.py and
+convert it again. is_current() checks source.json against the JSON stores,
+so an index persisted again without converting is detected, not served stale.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from llama_index.core.storage.kvstore.types import DEFAULT_COLLECTION, BaseKVStore
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from pydantic import PrivateAttr
+
+COMPACT_DIR = "compact"
+DB_FILE = "store.sqlite"
+EMBEDDINGS_FILE = "embeddings.npy"
+IDS_FILE = "ids.json"
+SOURCE_FILE = "source.json"
+_JSON_STORES = ("docstore.json", "index_store.json")
+_VECTOR_STORE = "default__vector_store.json"
+
+
+class SQLiteKVStore(BaseKVStore):
+    """Key-value collections in one SQLite table; values are JSON text."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (collection TEXT, key TEXT, value TEXT,"
+            " PRIMARY KEY (collection, key)) WITHOUT ROWID"
+        )
+
+    def put(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION):
+        self.put_all([(key, val)], collection)
+
+    def put_all(self, kv_pairs, collection: str = DEFAULT_COLLECTION, batch_size=1):
+        rows = [(collection, key, json.dumps(val)) for key, val in kv_pairs]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO kv VALUES (?, ?, ?)", rows)
+
+    def get(self, key: str, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE collection = ? AND key = ?",
+                (collection, key),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM kv WHERE collection = ?", (collection,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM kv WHERE collection = ? AND key = ?", (collection, key)
+            )
+        return cursor.rowcount > 0
+
+    async def aput(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION):
+        self.put(key, val, collection)
+
+    async def aget(self, key: str, collection: str = DEFAULT_COLLECTION):
+        return self.get(key, collection)
+
+    async def aget_all(self, collection: str = DEFAULT_COLLECTION):
+        return self.get_all(collection)
+
+    async def adelete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        return self.delete(key, collection)
+
+
+class CompactVectorStore(BasePydanticVectorStore):
+    """Read-only cosine top-k over memory-mapped float32 embeddings."""
+
+    stores_text: bool = False
+    _ids: List[str] = PrivateAttr()
+    _embeddings: np.ndarray = PrivateAttr()
+    _norms: np.ndarray = PrivateAttr()
+
+    def __init__(self, path: str):
+        super().__init__()
+        with open(os.path.join(path, IDS_FILE)) as f:
+            self._ids = json.load(f)
+        self._embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        self._norms = None  # computed on the first query
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CompactVectorStore"
+
+    @property
+    def client(self) -> Any:
+        return None
+
+    def add(self, nodes, **kwargs) -> List[str]:
+        raise NotImplementedError("Compact stores are read-only; see compact_index()")
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        raise NotImplementedError("Compact stores are read-only; see compact_index()")
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        if query.filters is not None or query.mode != VectorStoreQueryMode.DEFAULT:
+            raise NotImplementedError("Only unfiltered default-mode queries")
+        if self._norms is None:
+            self._norms = np.linalg.norm(self._embeddings, axis=1)
+        q = np.asarray(query.query_embedding, dtype=np.float32)
+        scores = (self._embeddings @ q) / np.maximum(
+            self._norms * np.linalg.norm(q), 1e-12
+        )
+        if query.node_ids is not None:
+            allowed = set(query.node_ids)
+            mask = np.array([node_id in allowed for node_id in self._ids])
+            scores = np.where(mask, scores, -np.inf)
+        k = min(query.similarity_top_k, int(np.isfinite(scores).sum()))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=int)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return VectorStoreQueryResult(
+            similarities=scores[top].tolist(), ids=[self._ids[i] for i in top]
+        )
+
+
+_SOURCES = _JSON_STORES + (_VECTOR_STORE,)
+
+
+def _fingerprint(persist_dir: str, name: str, digest: bool = False) -> dict:
+    path = os.path.join(persist_dir, name)
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if digest:
+        with open(path, "rb") as f:
+            fingerprint["blake2b"] = hashlib.file_digest(f, "blake2b").hexdigest()
+    return fingerprint
+
+
+def is_current(persist_dir: str, compact_dir: str = None) -> bool:
+    """
+    True if compact_dir was converted from the JSON stores now in persist_dir.
+    Size and mtime are checked first; a file with a new mtime but the same
+    size (e.g. copied) is hashed, so only real changes count as stale.
+    """
+    compact_dir = compact_dir or os.path.join(persist_dir, COMPACT_DIR)
+    try:
+        with open(os.path.join(compact_dir, SOURCE_FILE)) as f:
+            recorded = json.load(f)
+        for name in _SOURCES:
+            current = _fingerprint(persist_dir, name)
+            if current["size"] != recorded[name]["size"]:
+                return False
+            if current["mtime_ns"] != recorded[name]["mtime_ns"]:
+                digest = _fingerprint(persist_dir, name, digest=True)["blake2b"]
+                if digest != recorded[name]["blake2b"]:
+                    return False
+    except (OSError, KeyError, ValueError):  # no source.json, or no JSON stores
+        return False
+    return True
+
+
+def compact_index(persist_dir: str, out_dir: str = None) -> str:
+    """Converts a default persisted (JSON) index; returns the compact dir."""
+    out_dir = out_dir or os.path.join(persist_dir, COMPACT_DIR)
+    tmp = out_dir + ".tmp"
+    os.makedirs(tmp, exist_ok=True)
+    db = os.path.join(tmp, DB_FILE)
+    if os.path.exists(db):
+        os.remove(db)
+
+    kvstore = SQLiteKVStore(db)
+    for name in _JSON_STORES:
+        with open(os.path.join(persist_dir, name)) as f:
+            collections = json.load(f)
+        for collection, values in collections.items():
+            kvstore.put_all(values.items(), collection)
+    kvstore._conn.close()
+
+    with open(os.path.join(persist_dir, _VECTOR_STORE)) as f:
+        embedding_dict = json.load(f)["embedding_dict"]
+    ids = list(embedding_dict)
+    embeddings = np.array([embedding_dict[i] for i in ids], dtype=np.float32)
+    np.save(os.path.join(tmp, EMBEDDINGS_FILE), embeddings)
+    with open(os.path.join(tmp, IDS_FILE), "w") as f:
+        json.dump(ids, f)
+    with open(os.path.join(tmp, SOURCE_FILE), "w") as f:
+        json.dump(
+            {name: _fingerprint(persist_dir, name, digest=True) for name in _SOURCES},
+            f,
+            indent=2,
+        )
+
+    if os.path.exists(out_dir):
+        import shutil
+
+        shutil.rmtree(out_dir)
+    os.replace(tmp, out_dir)
+    return out_dir
+
+
+def compact_storage_context(path: str):
+    """A StorageContext over a compact dir, for load_index_from_storage()."""
+    from llama_index.core import StorageContext
+    from llama_index.core.storage.docstore.keyval_docstore import KVDocumentStore
+    from llama_index.core.storage.index_store.keyval_index_store import KVIndexStore
+
+    kvstore = SQLiteKVStore(os.path.join(path, DB_FILE))
+    return StorageContext.from_defaults(
+        docstore=KVDocumentStore(kvstore),
+        index_store=KVIndexStore(kvstore),
+        vector_store=CompactVectorStore(path),
+    )
+
+
+if __name__ == "__main__":
+    persist_dir = sys.argv[1] if len(sys.argv) > 1 else "faiss_index"
+    print(f"Compact index written to {compact_index(persist_dir)}")
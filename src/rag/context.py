@@ -0,0 +1,184 @@
+# src/rag/context.py
+"""
+Token-budgeted context packing for RAG prompts.
+
+Retrieval returns the top-k review chunks verbatim. Many are near-duplicates
+or mostly emoji and filler, so pack_context() decides what the LLM actually
+sees:
+
+1. drop passages with too few real words (emoji, "ok", "👍👍👍"),
+2. drop near-duplicates of a higher-scored passage (word-shingle Jaccard),
+3. trim each passage to its sentences most relevant to the question,
+4. fill the token budget greedily in retrieval-score order.
+
+Token counts come from a real tokenizer, with encodings cached per text:
+TOKENIZER_PATH (a HuggingFace tokenizer.json, loaded with `tokenizers`),
+otherwise tiktoken's cl100k_base, otherwise the tokenizer.json that ships
+with the embedding model at EMBED_MODEL_PATH. Only when none of these is
+available does it fall back to the old 4-characters-per-token estimate.
+
+Nothing here imports llama_index; see context_postprocessor.py for the
+query-engine hook.
+"""
+
+import os
+import re
+import threading
+from functools import lru_cache
+
+WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+SENTENCE_RE = re.compile(r"(?<=[.!?।])\s+|\n+")
+LABEL_RE = re.compile(r"^\s*[\w ]{1,20}:\s*\S+\s*$")  # "Sentiment: positive"
+STOPWORDS = frozenset(
+    "a an and are as at be but by do does for from has have how i if in is it "
+    "its me my of on or so that the their there this to was what when which who "
+    "why will with you your".split()
+)
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def _from_tokenizer_json(path: str):
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        from tokenizers import Tokenizer
+
+        tokenizer = Tokenizer.from_file(path)
+    except Exception:
+        return None
+    return (
+        f"tokenizers:{path}",
+        lambda text: tokenizer.encode(text, add_special_tokens=False).ids,
+    )
+
+
+def _from_tiktoken():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:  # not installed, or the BPE file can't be fetched offline
+        return None
+    return "tiktoken:cl100k_base", encoding.encode_ordinary
+
+
+def _load_tokenizer():
+    """(name, encode function) for the best tokenizer available offline."""
+    embed_tokenizer = os.path.join(os.getenv("EMBED_MODEL_PATH", ""), "tokenizer.json")
+    for candidate in (
+        lambda: _from_tokenizer_json(os.getenv("TOKENIZER_PATH")),
+        _from_tiktoken,
+        lambda: _from_tokenizer_json(embed_tokenizer),
+    ):
+        found = candidate()
+        if found:
+            return found
+    print("Warning: no tokenizer available, estimating 4 characters per token.")
+    return "chars/4", None
+
+
+def tokenizer_name() -> str:
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                _tokenizer = _load_tokenizer()
+    return _tokenizer[0]
+
+
+@lru_cache(maxsize=16_384)
+def count_tokens(text: str) -> int:
+    """Token count of text; the same chunks are retrieved over and over, so cached."""
+    tokenizer_name()
+    encode = _tokenizer[1]
+    if encode is None:
+        return max(1, len(text) // 4) if text else 0
+    return len(encode(text))
+
+
+def _words(text: str) -> list:
+    return WORD_RE.findall(text.lower())
+
+
+def _shingles(words: list, n: int = 3) -> set:
+    if len(words) < n:
+        return {tuple(words)}
+    return {tuple(words[i : i + n]) for i in range(len(words) - n + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def trim_passage(text: str, query_terms: set, max_sentences: int) -> str:
+    """Keeps the max_sentences sentences sharing most terms with the query, in
+    their original order. Short "label: value" lines are always kept."""
+    sentences = [s.strip() for s in SENTENCE_RE.split(text) if s and s.strip()]
+    if len(sentences) <= max_sentences:
+        return text.strip()
+    labels = {i for i, s in enumerate(sentences) if LABEL_RE.match(s)}
+    body = [i for i in range(len(sentences)) if i not in labels]
+    ranked = sorted(
+        body,
+        key=lambda i: (-len(query_terms & set(_words(sentences[i]))), i),
+    )
+    keep = sorted(labels | set(ranked[:max_sentences]))
+    return "\n".join(sentences[i] for i in keep)
+
+
+def pack_context(
+    query: str,
+    passages: list,
+    budget_tokens: int = 600,
+    max_sentences: int = 3,
+    duplicate_threshold: float = 0.7,
+    min_words: int = 3,
+):
+    """
+    passages: [(text, score)] as retrieved. Returns ([(index, packed_text)],
+    stats), in descending score order, with the packed texts' total token
+    count within budget_tokens.
+    """
+    query_terms = set(_words(query)) - STOPWORDS
+    order = sorted(range(len(passages)), key=lambda i: -(passages[i][1] or 0.0))
+    stats = {
+        "passages": len(passages),
+        "tokens_before": sum(count_tokens(text) for text, _ in passages),
+        "filler": 0,
+        "duplicates": 0,
+        "trimmed": 0,
+        "over_budget": 0,
+    }
+
+    packed, kept_shingles, used = [], [], 0
+    for i in order:
+        text = passages[i][0]
+        words = _words(text)
+        if len([w for w in words if len(w) > 1]) < min_words:
+            stats["filler"] += 1
+            continue
+        shingles = _shingles(words)
+        if any(jaccard(shingles, s) >= duplicate_threshold for s in kept_shingles):
+            stats["duplicates"] += 1
+            continue
+
+        trimmed = trim_passage(text, query_terms, max_sentences)
+        limit = max_sentences
+        while count_tokens(trimmed) > budget_tokens - used and limit > 1:
+            limit -= 1
+            trimmed = trim_passage(text, query_terms, limit)
+        tokens = count_tokens(trimmed)
+        if tokens > budget_tokens - used:
+            stats["over_budget"] += 1
+            continue
+
+        stats["trimmed"] += trimmed != text.strip()
+        packed.append((i, trimmed))
+        kept_shingles.append(shingles)
+        used += tokens
+
+    stats["kept"] = len(packed)
+    stats["tokens_after"] = used
+    return packed, stats
@@ -0,0 +1,41 @@
+# src/rag/context_postprocessor.py
+"""
+Query-engine hook for context.pack_context(): runs between retrieval and
+prompt construction, so only the packed passages reach the LLM. Kept apart
+from context.py so the packing logic and its tests don't need llama_index.
+"""
+
+from typing import List, Optional
+
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+from .context import pack_context
+
+
+class ContextBudgetPostprocessor(BaseNodePostprocessor):
+    budget_tokens: int = 600
+    max_sentences: int = 3
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ContextBudgetPostprocessor"
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+    ) -> List[NodeWithScore]:
+        query = query_bundle.query_str if query_bundle else ""
+        packed, _ = pack_context(
+            query,
+            [(n.node.get_content(), n.score) for n in nodes],
+            budget_tokens=self.budget_tokens,
+            max_sentences=self.max_sentences,
+        )
+        result = []
+        for i, text in packed:
+            node = nodes[i].node.model_copy()  # the docstore's node stays intact
+            node.set_content(text)
+            result.append(NodeWithScore(node=node, score=nodes[i].score))
+        return result
@@ -0,0 +1,166 @@
+# src/rag/degraded.py
+"""
+Deadline-aware answering with an extractive fallback.
+
+/ask used to wait for LLM synthesis however long it took, and returned a 500
+when the LLM failed. answer_within_budget() instead:
+
+1. retrieves as usual (local and fast),
+2. runs LLM synthesis with whatever is left of the latency budget,
+3. if synthesis can't finish in time, fails, or the circuit breaker says the
+   LLM is down, answers extractively from the retrieved reviews. The answer
+   is the sentences that best match the question plus a tally of the
+   reviews' sentiment labels, with degraded=True.
+
+The circuit breaker opens after `failure_threshold` consecutive LLM failures
+or slow calls and skips the LLM entirely for `reset_seconds`. After that, a
+single probe request is let through to test recovery.
+
+Nothing here imports llama_index: retrieve/synthesize are passed in by
+query.py, and nodes only need .node.get_content() and .node.metadata.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+from .context import LABEL_RE, SENTENCE_RE, STOPWORDS, _words, count_tokens
+
+SENTIMENT_RE = re.compile(r"^\s*Sentiment:\s*(\w+)", re.IGNORECASE | re.MULTILINE)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"  # closed -> open -> half_open -> closed/open
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            # One probe per reset period, until one of them succeeds
+            self.state, self._opened_at = "half_open", time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures = "closed", 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state, self._opened_at = "open", time.monotonic()
+
+
+def _sentiment(text: str, metadata: dict) -> str:
+    label = (metadata or {}).get("sentiment")
+    if not label:
+        match = SENTIMENT_RE.search(text)
+        label = match.group(1) if match else "unknown"
+    return str(label).lower()
+
+
+def extractive_answer(question: str, passages: list, max_sentences: int = 3):
+    """
+    passages: [(text, metadata)] in retrieval order. Returns (answer, tally):
+    the sentences sharing most terms with the question (earlier passages win
+    ties) and the count of each sentiment label among the passages.
+    """
+    if not passages:
+        return "No matching reviews were found for this question.", {}
+    tally = Counter(_sentiment(text, metadata) for text, metadata in passages)
+    query_terms = set(_words(question)) - STOPWORDS
+
+    candidates, seen = [], set()
+    for rank, (text, _) in enumerate(passages):
+        for sentence in SENTENCE_RE.split(text):
+            sentence = (sentence or "").strip()
+            if sentence.lower().startswith("review:"):
+                sentence = sentence[len("review:") :].strip()
+            key = sentence.lower()
+            if not sentence or LABEL_RE.match(sentence) or key in seen:
+                continue
+            seen.add(key)
+            overlap = len(query_terms & set(_words(sentence)))
+            candidates.append((-overlap, rank, sentence))
+    best = [sentence for *_, sentence in sorted(candidates)[:max_sentences]]
+
+    summary = ", ".join(f"{n} {label}" for label, n in tally.most_common())
+    lines = [f"From {len(passages)} matching reviews ({summary}):"]
+    lines += [f'- "{sentence}"' for sentence in best]
+    return "\n".join(lines), dict(tally)
+
+
+def answer_within_budget(
+    question: str,
+    retrieve,
+    synthesize,
+    budget_seconds: float = None,
+    breaker: CircuitBreaker = None,
+    executor=None,
+    slow_call_seconds: float = 1.0,
+) -> dict:
+    """
+    retrieve() -> retrieved nodes; synthesize(nodes) -> the LLM's answer.
+    Synthesis runs on `executor` so it can be abandoned at the deadline. A
+    deadline miss counts against the breaker only if the LLM had at least
+    slow_call_seconds, so one caller's tiny budget can't open it for everyone.
+    """
+    start = time.monotonic()
+    nodes = retrieve()
+    remaining = None
+    if budget_seconds is not None:
+        remaining = budget_seconds - (time.monotonic() - start)
+
+    answer, reason = None, ""
+    if remaining is not None and remaining <= 0:
+        reason = "deadline"
+    elif breaker is not None and not breaker.allow():
+        reason = "circuit_open"
+    else:
+        try:
+            if executor is None or remaining is None:
+                answer = str(synthesize(nodes))
+            else:
+                answer = str(executor.submit(synthesize, nodes).result(remaining))
+        except Exception as e:
+            timed_out = isinstance(e, TimeoutError)
+            reason = "deadline" if timed_out else "llm_error"
+            print(f"LLM synthesis {reason}, answering extractively: {e!r}")
+            short_budget = (
+                timed_out and remaining is not None and remaining < slow_call_seconds
+            )
+            if breaker is not None and not short_budget:
+                breaker.record_failure()
+        else:
+            if breaker is not None:
+                breaker.record_success()
+
+    contexts = [n.node.get_content() for n in nodes]
+    if answer is None:
+        answer, _ = extractive_answer(
+            question, [(c, n.node.metadata) for c, n in zip(contexts, nodes)]
+        )
+        usage = {"input_tokens": 0, "output_tokens": 0}  # no LLM tokens spent
+    else:
+        # Question plus the context that actually went into the prompt
+        usage = {
+            "input_tokens": count_tokens(question) + sum(map(count_tokens, contexts)),
+            "output_tokens": count_tokens(answer),
+        }
+    return {
+        "answer": answer,
+        "sources": [c[:200] + "..." for c in contexts],
+        "latency_seconds": round(time.monotonic() - start, 2),
+        "usage": usage,
+        "degraded": bool(reason),
+        "degraded_reason": reason,
+    }
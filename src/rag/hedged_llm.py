@@ -0,0 +1,76 @@
+# src/rag/hedged_llm.py
+"""
+LlamaIndex LLM wrapper that sends the RAG engine's LLM calls through a
+CallPolicy (hedging.py): per-attempt deadlines, jittered retries, hedging.
+Kept separate from hedging.py so the policy and its tests don't need
+llama_index.
+"""
+
+from typing import Any, Sequence
+
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    CompletionResponse,
+    CompletionResponseGen,
+    LLMMetadata,
+)
+from llama_index.core.llms import CustomLLM
+from llama_index.core.llms.callbacks import llm_chat_callback, llm_completion_callback
+from pydantic import PrivateAttr
+
+from .hedging import CallPolicy
+
+
+class HedgedLLM(CustomLLM):
+    _inner: Any = PrivateAttr()
+    _policy: CallPolicy = PrivateAttr()
+
+    def __init__(self, inner, policy: CallPolicy = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._inner = inner
+        self._policy = policy or CallPolicy.from_env()
+
+    @property
+    def policy(self) -> CallPolicy:
+        return self._policy
+
+    # Same model/params as the inner LLM, so LLM cache keys don't change
+    @property
+    def model(self):
+        return getattr(self._inner, "model", type(self._inner).__name__)
+
+    @property
+    def temperature(self):
+        return getattr(self._inner, "temperature", None)
+
+    @property
+    def max_tokens(self):
+        return getattr(self._inner, "max_tokens", None)
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self._inner.metadata
+
+    @llm_chat_callback()
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        return self._policy.call(self._inner.chat, messages, **kwargs)
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        return self._policy.call(
+            self._inner.complete, prompt, formatted=formatted, **kwargs
+        )
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        # A stream can't be hedged or retried once it has started yielding.
+        return self._inner.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "hedged_llm"
@@ -0,0 +1,178 @@
+# src/rag/hedging.py
+"""
+Call policy for LLM requests: per-attempt deadlines, jittered retries and
+hedging.
+
+A single slow or failed upstream response used to become the /ask p99, or a
+500. CallPolicy.call(fn, ...) instead:
+
+- gives every attempt its own deadline (attempt_timeout). An attempt that
+  misses it is abandoned and counts as a retryable failure;
+- retries retryable errors (timeouts, connection errors, 408/409/429/5xx)
+  after a full-jitter exponential backoff;
+- hedges: when an attempt is still running after the observed p95 latency,
+  it fires a second, identical request and takes whichever finishes first;
+- caps the extra load from retries and hedges with a token bucket. Each call
+  earns `extra_load` tokens (up to `burst`), and each extra attempt spends
+  one, so during an outage retries can't multiply upstream traffic.
+
+Attempts run on a persistent thread pool, so a hedge doesn't need a new
+thread, and the wrapped client keeps its pooled HTTP connections across
+calls. Nothing here imports llama_index; see hedged_llm.py for the wrapper
+around the RAG engine's LLM.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # groq/openai SDK errors without a status: APIConnectionError, APITimeoutError
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class AttemptTimeout(TimeoutError):
+    """An LLM attempt (including its hedge) missed its deadline."""
+
+
+class CallPolicy:
+    def __init__(
+        self,
+        attempt_timeout: float = 15.0,
+        retries: int = 2,
+        backoff: float = 0.25,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay: float = 0.05,
+        extra_load: float = 0.1,
+        burst: float = 5.0,
+        window: int = 200,
+        min_samples: int = 20,
+        max_workers: int = 32,
+        on_event=None,
+    ):
+        self.attempt_timeout = attempt_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.extra_load = extra_load
+        self.burst = burst
+        self.min_samples = min_samples
+        self.on_event = on_event  # callback(event), e.g. for Prometheus
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="llm-call")
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._tokens = burst
+        self.counts = {
+            "calls": 0,
+            "hedge_fired": 0,
+            "hedge_won": 0,
+            "retry": 0,
+            "attempt_timeout": 0,
+            "budget_exhausted": 0,
+        }
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        return cls(
+            attempt_timeout=float(os.getenv("LLM_ATTEMPT_TIMEOUT", "15")),
+            retries=int(os.getenv("LLM_RETRIES", "2")),
+            hedge=os.getenv("LLM_HEDGE", "1") != "0",
+            extra_load=float(os.getenv("LLM_EXTRA_LOAD", "0.1")),
+            **kwargs,
+        )
+
+    def _event(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+        if self.on_event is not None:
+            self.on_event(name)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+        self._event("budget_exhausted")
+        return False
+
+    def hedge_delay(self):
+        """Observed latency quantile, or None until there are enough samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(int(self.hedge_quantile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.min_hedge_delay)
+
+    def _timed(self, fn, args, kwargs):
+        start = time.monotonic()
+        result = fn(*args, **kwargs)
+        with self._lock:  # every success, hedges and abandoned attempts included
+            self._latencies.append(time.monotonic() - start)
+        return result
+
+    def _attempt(self, fn, args, kwargs):
+        start = time.monotonic()
+        deadline = start + self.attempt_timeout
+        primary = self._pool.submit(self._timed, fn, args, kwargs)
+        pending, hedge = {primary}, None
+        delay = self.hedge_delay() if self.hedge else None
+        error = None
+        while pending:
+            until = deadline if delay is None else min(start + delay, deadline)
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, until - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._event("hedge_won")
+                    return future.result()
+                error = future.exception()
+            if time.monotonic() >= deadline:
+                break
+            if delay is not None and not done and pending:
+                delay = None  # hedge at most once per attempt
+                if self._spend():
+                    self._event("hedge_fired")
+                    hedge = self._pool.submit(self._timed, fn, args, kwargs)
+                    pending.add(hedge)
+        if pending:
+            self._event("attempt_timeout")
+            raise AttemptTimeout(f"LLM attempt exceeded {self.attempt_timeout}s")
+        raise error
+
+    def call(self, fn, *args, **kwargs):
+        with self._lock:
+            self.counts["calls"] += 1
+            self._tokens = min(self.burst, self._tokens + self.extra_load)
+        for attempt in range(self.retries + 1):
+            try:
+                return self._attempt(fn, args, kwargs)
+            except Exception as e:
+                if attempt == self.retries or not is_retryable(e) or not self._spend():
+                    raise
+            self._event("retry")
+            time.sleep(random.uniform(0, self.backoff * 2**attempt))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,189 @@
+# src/rag/llm_cache.py
+"""
+Content-addressed record/replay cache for LLM calls.
+
+Every call is keyed by a SHA-256 of (model, messages, sampling params), so an
+identical prompt at temperature 0.0 is only ever paid for once. Responses live
+in a single SQLite file as zlib-compressed JSON.
+
+Modes (env LLM_CACHE_MODE):
+    passthrough - no caching at all (default, production behaviour)
+    record      - serve hits from the cache, call the LLM on misses and store them
+    replay      - serve hits only, raise CacheMiss on a miss (offline CI)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+MODES = ("passthrough", "record", "replay")
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite")
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode when a request has never been recorded."""
+
+
+def make_key(model: str, messages, params: dict) -> str:
+    """Stable hash of everything that can change the LLM's answer."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str = None, mode: str = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.mode = (mode or os.getenv("LLM_CACHE_MODE", "passthrough")).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"LLM cache mode must be one of {MODES}, got {self.mode}")
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._conn = None
+        if self.mode != "passthrough":
+            self._connect()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response BLOB, "
+            "latency REAL, created REAL)"
+        )
+        self._conn.commit()
+
+    # --- Storage ---
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def put(self, key: str, model: str, response, latency: float = 0.0):
+        blob = zlib.compress(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, model, blob, latency, time.time()),
+            )
+            self._conn.commit()
+
+    # --- Main entry point ---
+    def call(self, model: str, messages, params: dict, fn):
+        """
+        Returns the cached response for (model, messages, params), or calls
+        fn() and records it. fn must return something JSON-serializable.
+        """
+        if self.mode == "passthrough":
+            return fn()
+
+        key = make_key(model, messages, params)
+        cached = self.get(key)
+        if cached is not None:
+            response, latency = cached
+            with self._lock:
+                self.hits += 1
+                self.saved_seconds += latency or 0.0
+            return response
+
+        with self._lock:
+            self.misses += 1
+        if self.mode == "replay":
+            raise CacheMiss(f"No recorded LLM response for key {key[:12]}")
+
+        start = time.time()
+        response = fn()
+        self.put(key, model, response, time.time() - start)
+        return response
+
+    # --- Reporting ---
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "saved_seconds": round(self.saved_seconds, 2),
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (
+            f"LLM cache [{s['mode']}]: {s['hits']} hits / {s['misses']} misses "
+            f"(hit rate {s['hit_rate']:.0%}, ~{s['saved_seconds']}s of LLM time saved)"
+        )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# --- Groq SDK wrapper (used by experiments/prompts/*.py) ---
+def _to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
+
+class _CachedCompletions:
+    def __init__(self, client, cache: LLMCache):
+        self._client = client
+        self._cache = cache
+
+    def create(self, model: str, messages: list, **params):
+        def _call():
+            response = self._client.chat.completions.create(
+                model=model, messages=messages, **params
+            )
+            return response.model_dump(mode="json")
+
+        return _to_namespace(self._cache.call(model, messages, params, _call))
+
+
+class CachedGroqClient:
+    """
+    Drop-in for groq.Groq that routes chat.completions.create through the cache.
+    Responses come back as attribute-style namespaces, so existing code using
+    response.choices[0].message.content and response.usage keeps working.
+    """
+
+    def __init__(self, client, cache: LLMCache = None):
+        self.cache = cache or LLMCache()
+        self.chat = SimpleNamespace(completions=_CachedCompletions(client, self.cache))
+
+
+if __name__ == "__main__":
+    cache_path = os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not os.path.exists(cache_path):
+        print(f"No LLM cache at {cache_path}")
+    else:
+        conn = sqlite3.connect(cache_path)
+        rows, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(response)), 0) FROM responses"
+        ).fetchone()
+        print(f"{cache_path}: {rows} responses, {size / 1024:.1f} KiB compressed")
+        for model, count in conn.execute(
+            "SELECT model, COUNT(*) FROM responses GROUP BY model"
+        ):
+            print(f"  {model}: {count}")
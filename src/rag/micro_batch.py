@@ -0,0 +1,175 @@
+# src/rag/micro_batch.py
+"""
+Dynamic micro-batching of query embeddings across concurrent /ask requests.
+
+Every /ask embeds its question with a separate single-sentence forward pass.
+On CPU, a forward pass over 16-32 short queries costs little more than one,
+so under concurrent load most embedding compute is wasted. MicroBatcher puts
+a queue in front of the embedder:
+
+- Callers block in submit() while a background thread collects pending
+  queries, until max_batch_size are waiting or max_wait_seconds have passed
+  since the first one arrived.
+- The batch runs as one forward pass, and each waiter gets back its own row.
+  An error, or a result count that doesn't match the batch, fails every
+  query in that batch. The batch thread itself keeps running.
+- While a batch runs, new queries pile up in the queue, so busy periods
+  produce full batches without waiting at all. An idle server adds at most
+  max_wait_seconds to a lone query.
+
+MicroBatchedEmbedding wraps any LlamaIndex embedding model so retrievers pick
+this up via Settings.embed_model. Document (text) embeddings pass straight
+through.
+"""
+
+import inspect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002,
+        on_batch: Optional[Callable[[int, float], None]] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.on_batch = on_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Plain counters for tests/benchmarks; Prometheus is fed via on_batch
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        """Blocks until item's result is ready (or re-raises the batch error)."""
+        if self._thread is None:
+            self._start()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future.result()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="embed-micro-batch", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:  # past the deadline: take only what is already queued
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        # The only thread resolving futures: it must never die, and every
+        # future it takes off the queue must be resolved, or callers hang
+        while True:
+            batch = self._collect()
+            try:
+                self._process(batch)
+            except Exception as e:
+                print(f"Embedding micro-batch failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, batch: list):
+        waited = time.perf_counter() - batch[0][2]
+        try:
+            results = list(self.batch_fn([item for item, _, _ in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} inputs"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        self.batches += 1
+        self.items += len(batch)
+        if self.on_batch is not None:
+            self.on_batch(len(batch), waited)
+
+
+def query_batch_fn(embed_model) -> Callable[[List[str]], list]:
+    """
+    One forward pass for many queries, equivalent to calling
+    _get_query_embedding on each. HuggingFaceEmbedding embeds queries with
+    _embed(..., prompt_name="query"); other models fall back to a loop.
+    """
+    embed = getattr(embed_model, "_embed", None)
+    if embed is not None and "prompt_name" in inspect.signature(embed).parameters:
+        return lambda queries: embed(queries, prompt_name="query")
+    return lambda queries: [embed_model._get_query_embedding(q) for q in queries]
+
+
+class MicroBatchedEmbedding(BaseEmbedding):
+    """Query embeddings through a MicroBatcher; everything else delegated."""
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _batcher: MicroBatcher = PrivateAttr()
+
+    def __init__(
+        self,
+        inner: BaseEmbedding,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002,
+        on_batch: Optional[Callable[[int, float], None]] = None,
+        batch_fn: Optional[Callable[[List[str]], list]] = None,
+    ):
+        super().__init__(
+            model_name=inner.model_name, embed_batch_size=inner.embed_batch_size
+        )
+        self._inner = inner
+        self._batcher = MicroBatcher(
+            batch_fn or query_batch_fn(inner),
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_seconds,
+            on_batch=on_batch,
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MicroBatchedEmbedding"
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        return self._batcher
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._batcher.submit(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        import asyncio
+
+        return await asyncio.to_thread(self._batcher.submit, query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._inner._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._inner._get_text_embeddings(texts)
@@ -0,0 +1,166 @@
+# src/rag/packed_prompts.py
+"""
+Packed prompts for bulk LLM sentiment classification.
+
+The prompt experiments (experiments/prompts/) send one chat completion per
+review. Each call repeats the whole instruction + few-shot preamble, so most
+input tokens are overhead. classify_packed() instead puts up to `pack_size`
+reviews into one prompt behind a single shared preamble, and asks for a
+JSON array of {"id": ..., "sentiment": ...} objects keyed by item ID.
+
+Parsing is strict. The reply must contain one JSON array. An item is
+accepted only if its id was asked for, appears exactly once, and its label
+is one of LABELS. Only the items that fail this check are re-classified
+with single-review calls, so one malformed reply doesn't cost a whole pack.
+
+Nothing here talks to an API: callers pass complete(prompt, max_tokens)
+returning (text, usage) and classify_one(review) returning (label, usage),
+so the experiments can route both through the LLM cache.
+"""
+
+import json
+import re
+import time
+
+LABELS = ("negative", "neutral", "positive")
+TOKENS_PER_ITEM = 16  # output budget per review: {"id": 12, "sentiment": "neutral"}
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_SPACE_RE = re.compile(r"\s+")
+
+INSTRUCTIONS = """Classify each Daraz review below as positive, negative, or neutral.
+Reviews are numbered [1], [2], ... and may mix Roman Urdu and English.
+Return ONLY a JSON array with one object per review, in the same order:
+[{"id": 1, "sentiment": "positive"}, {"id": 2, "sentiment": "negative"}]"""
+
+
+def _one_line(review: str) -> str:
+    return _SPACE_RE.sub(" ", str(review)).strip()
+
+
+def _numbered(reviews) -> str:
+    return "\n".join(f"[{i}] {_one_line(r)}" for i, r in enumerate(reviews, 1))
+
+
+def build_preamble(examples=(), instructions: str = INSTRUCTIONS) -> str:
+    """examples: [(review, label)], shown once as an already-answered pack."""
+    if not examples:
+        return instructions
+    reviews, labels = zip(*examples)
+    answer = json.dumps(
+        [{"id": i, "sentiment": label} for i, label in enumerate(labels, 1)]
+    )
+    return f"{instructions}\n\nExample:\n{_numbered(reviews)}\nAnswer: {answer}"
+
+
+def build_prompt(preamble: str, reviews) -> str:
+    return f"{preamble}\n\nNow classify these reviews:\n{_numbered(reviews)}\nAnswer:"
+
+
+def parse_packed(output: str, n_items: int) -> dict:
+    """
+    Returns {item_id: label} for the items 1..n_items that came back valid.
+    Anything outside the first '[' to the last ']' (e.g. "Here you go:") is
+    ignored. Inside it, the reply must be a JSON array of objects.
+    """
+    text = _FENCE_RE.sub("", output.strip())
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return {}
+    try:
+        items = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    labels, seen = {}, set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id, label = item.get("id"), item.get("sentiment")
+        if isinstance(item_id, str) and item_id.strip().isdigit():
+            item_id = int(item_id)
+        if not isinstance(item_id, int) or isinstance(item_id, bool):
+            continue
+        if item_id in seen:
+            labels.pop(item_id, None)  # answered twice: trust neither
+            continue
+        seen.add(item_id)
+        if 1 <= item_id <= n_items and isinstance(label, str):
+            label = label.strip().lower()
+            if label in LABELS:
+                labels[item_id] = label
+    return labels
+
+
+def _tokens(usage) -> tuple:
+    usage = usage or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def classify_packed(
+    reviews,
+    complete,
+    classify_one,
+    pack_size: int = 10,
+    preamble: str = None,
+    on_call=None,
+):
+    """
+    Returns (labels, stats), labels in input order. pack_size=1 skips packing
+    and calls classify_one for every review, i.e. the existing experiments.
+    on_call() runs after every API call (e.g. rate-limit sleeps).
+    """
+    preamble = build_preamble() if preamble is None else preamble
+    labels = [None] * len(reviews)
+    stats = {
+        "reviews": len(reviews),
+        "pack_size": pack_size,
+        "packed_calls": 0,
+        "single_calls": 0,
+        "fallback_items": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+    }
+    start = time.perf_counter()
+
+    def count(usage):
+        prompt_tokens, completion_tokens = _tokens(usage)
+        stats["input_tokens"] += prompt_tokens
+        stats["output_tokens"] += completion_tokens
+        if on_call is not None:
+            on_call()
+
+    retry = list(range(len(reviews))) if pack_size <= 1 else []
+    for offset in range(0, len(reviews) if pack_size > 1 else 0, pack_size):
+        pack = reviews[offset : offset + pack_size]
+        try:
+            output, usage = complete(
+                build_prompt(preamble, pack),
+                max_tokens=TOKENS_PER_ITEM * len(pack) + 16,
+            )
+        except Exception as e:
+            print(f"Pack at row {offset} failed, classifying singly: {e}")
+            output, usage = "", None
+        stats["packed_calls"] += 1
+        count(usage)
+        parsed = parse_packed(output, len(pack))
+        for i in range(len(pack)):
+            if i + 1 in parsed:
+                labels[offset + i] = parsed[i + 1]
+            else:
+                retry.append(offset + i)
+
+    if pack_size > 1:
+        stats["fallback_items"] = len(retry)
+    for index in retry:
+        label, usage = classify_one(reviews[index])
+        stats["single_calls"] += 1
+        count(usage)
+        labels[index] = label
+
+    n = max(len(reviews), 1)
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["input_tokens_per_review"] = stats["input_tokens"] / n
+    stats["tokens_per_review"] = (stats["input_tokens"] + stats["output_tokens"]) / n
+    return labels, stats
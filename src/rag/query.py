@@ -4,13 +4,49 @@ import os
 
 # 1. FORCE OFFLINE MODE
 os.environ["HF_HUB_OFFLINE"] = "1"
-from llama_index.core import StorageContext, Settings, load_index_from_storage
+from llama_index.core import (
+    QueryBundle,
+    StorageContext,
+    Settings,
+    load_index_from_storage,
+)
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.llms.groq import Groq
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .degraded import CircuitBreaker, answer_within_budget
 
 _engine = None
+_llm_cache = None
+
+# LLM synthesis runs here so /ask can give up on it at its deadline; the
+# breaker skips the LLM for a while after repeated failures
+_synthesis_pool = ThreadPoolExecutor(
+    int(os.getenv("RAG_SYNTHESIS_WORKERS", "8")), thread_name_prefix="rag-synthesis"
+)
+_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    reset_seconds=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+)
+
+
+def _policy_metrics():
+    """Prometheus hook for the LLM call policy, when running inside the API."""
+    try:
+        from src.app.instrumentation import log_llm_call_event
+    except ImportError:
+        return None
+    return log_llm_call_event
+
+
+def _embed_batch_metrics():
+    """Prometheus hook for embedding micro-batches, when running inside the API."""
+    try:
+        from src.app.instrumentation import log_embed_batch
+    except ImportError:
+        return None
+    return log_embed_batch
 
 
 def get_engine():
@@ -20,25 +56,96 @@ def get_engine():
         model_path = os.getenv(
             "EMBED_MODEL_PATH", "sentence-transformers/all-MiniLM-L6-v2"
         )
-        Settings.embed_model = HuggingFaceEmbedding(model_name=model_path)
-        Settings.llm = Groq(
-            model="llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY")
+        embed_model = HuggingFaceEmbedding(model_name=model_path)
+        # Concurrent /ask queries share embedding forward passes
+        # (EMBED_BATCH_MAX=1 embeds each query on its own, as before)
+        max_batch = int(os.getenv("EMBED_BATCH_MAX", "32"))
+        if max_batch > 1:
+            from .micro_batch import MicroBatchedEmbedding
+
+            embed_model = MicroBatchedEmbedding(
+                embed_model,
+                max_batch_size=max_batch,
+                max_wait_seconds=float(os.getenv("EMBED_BATCH_WAIT_MS", "2")) / 1000,
+                on_batch=_embed_batch_metrics(),
+            )
+        Settings.embed_model = embed_model
+        # Retries and per-attempt deadlines are owned by the call policy below;
+        # the client keeps one pooled HTTP connection set across calls
+        attempt_timeout = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "15"))
+        llm = Groq(
+            model="llama-3.1-8b-instant",
+            api_key=os.getenv("GROQ_API_KEY"),
+            timeout=attempt_timeout,
+            max_retries=0,
+            reuse_client=True,
         )
+        if os.getenv("LLM_POLICY", "on") != "off":
+            from .hedged_llm import HedgedLLM
+            from .hedging import CallPolicy
+
+            llm = HedgedLLM(llm, CallPolicy.from_env(on_event=_policy_metrics()))
 
-        storage_context = StorageContext.from_defaults(persist_dir="faiss_index")
+        # Record/replay cache for LLM calls (off unless LLM_CACHE_MODE is set)
+        if os.getenv("LLM_CACHE_MODE", "passthrough") != "passthrough":
+            from .cached_llm import CachedLLM
+
+            global _llm_cache
+            llm = CachedLLM(llm)
+            _llm_cache = llm.cache
+        Settings.llm = llm
+
+        # The compact store (python -m src.rag.compact_store) loads nodes only
+        # when retrieved; RAG_COMPACT_STORE=off parses the JSON stores instead
+        compact_dir = os.path.join("faiss_index", "compact")
+        storage_context = None
+        if os.getenv("RAG_COMPACT_STORE", "on") != "off" and os.path.isdir(compact_dir):
+            from .compact_store import compact_storage_context, is_current
+
+            if is_current("faiss_index", compact_dir):
+                storage_context = compact_storage_context(compact_dir)
+            else:
+                print(
+                    "WARNING: faiss_index/compact is older than the JSON stores; "
+                    "loading those instead (run: python -m src.rag.compact_store)"
+                )
+        if storage_context is None:
+            storage_context = StorageContext.from_defaults(persist_dir="faiss_index")
         index = load_index_from_storage(storage_context)
-        _engine = index.as_query_engine(similarity_top_k=5)
+        # Pack retrieved chunks into a token budget before they reach the
+        # prompt (RAG_CONTEXT_TOKENS=0 sends them verbatim, as before)
+        postprocessors = []
+        budget = int(os.getenv("RAG_CONTEXT_TOKENS", "600"))
+        if budget > 0:
+            from .context_postprocessor import ContextBudgetPostprocessor
+
+            postprocessors.append(ContextBudgetPostprocessor(budget_tokens=budget))
+        _engine = index.as_query_engine(
+            similarity_top_k=int(os.getenv("RAG_TOP_K", "5")),
+            node_postprocessors=postprocessors,
+        )
         print("RAG engine ready!")
     return _engine
 
 
-def ask_rag(question: str) -> dict:
-    start = time.time()
-    response = get_engine().query(question)
-    latency = time.time() - start
-    sources = [node.node.get_text()[:200] + "..." for node in response.source_nodes]
-    return {
-        "answer": str(response),
-        "sources": sources,
-        "latency_seconds": round(latency, 2),
-    }
+def ask_rag(question: str, budget_seconds: float = None) -> dict:
+    """
+    Answers within budget_seconds when given: falls back to an extractive
+    answer from the retrieved reviews (degraded=True) if LLM synthesis can't
+    finish in time, fails, or the circuit breaker is open.
+    """
+    engine = get_engine()
+    query = QueryBundle(question)
+    return answer_within_budget(
+        question,
+        retrieve=lambda: engine.retrieve(query),
+        synthesize=lambda nodes: engine.synthesize(query, nodes),
+        budget_seconds=budget_seconds,
+        breaker=_breaker,
+        executor=_synthesis_pool,
+    )
+
+
+def get_llm_cache():
+    """The active LLMCache, or None when caching is off."""
+    return _llm_cache
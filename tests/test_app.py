@@ -70,3 +70,25 @@ def test_ask_profanity():
     response = client.post("/ask", json=payload)
     assert response.status_code == 400
     assert "Prompt Injection Detected" in response.json()["detail"]
+
+
+def test_repeated_prediction_is_served_from_cache():
+    from app import main
+
+    payload = {
+        "Original_Price": 999,
+        "Discount_Price": 500,
+        "Number_of_Ratings": 12,
+        "Positive_Seller_Ratings": 90,
+        "Ship_On_Time": 95,
+        "Chat_Response_Rate": 80,
+        "No_of_products_to_be_sold": 40,
+        "Category": "Groceries",
+        "Delivery_Type": "Free Delivery",
+        "Flagship_Store": "Yes",
+    }
+    first = client.post("/predict", json=payload).json()
+    hits = main.prediction_cache.hits
+    second = client.post("/predict", json=payload).json()
+    assert second == first
+    assert main.prediction_cache.hits == hits + 1
@@ -0,0 +1,71 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import bulk_score
+from app.features import TRAINING_TO_API_COLUMNS, encode_payload
+
+MODEL_PATH = "models/model.joblib"
+MODEL_COLS_PATH = "models/model_columns.json"
+SOURCE = "data/raw/Top_Selling_Product_Data.csv"
+
+
+def _expected(df: pd.DataFrame) -> np.ndarray:
+    """What /predict would return for each row, one payload at a time."""
+    model = joblib.load(MODEL_PATH)
+    with open(MODEL_COLS_PATH) as f:
+        columns = json.load(f)
+    scores = []
+    for record in df.rename(columns=TRAINING_TO_API_COLUMNS).to_dict("records"):
+        payload = {k: record[k] for k in TRAINING_TO_API_COLUMNS.values()}
+        prediction = model.predict(encode_payload(payload, columns))[0]
+        scores.append(min(max(prediction, 1), 100))
+    return np.array(scores)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bulk_scores_match_predict(tmp_path, workers):
+    source = tmp_path / "products.csv"
+    df = pd.read_csv(SOURCE, nrows=300)
+    df.to_csv(source, index=False)
+    output = tmp_path / "scores.csv"
+
+    result = bulk_score.bulk_score(
+        str(source), str(output), workers=workers, chunk_rows=64, keep=["Title"]
+    )
+    scored = pd.read_csv(output)
+    assert result["rows"] == 300
+    assert list(scored.columns) == ["Title", bulk_score.SCORE_COLUMN]
+    assert scored["Title"].tolist() == df["Title"].tolist()  # input order kept
+    np.testing.assert_allclose(scored[bulk_score.SCORE_COLUMN], _expected(df))
+    # Forked workers inherit the model: one core each, not n_jobs=-1
+    if workers > 1:
+        assert bulk_score._model.n_jobs == 1
+
+
+def test_parquet_api_names_and_missing_values(tmp_path):
+    df = pd.read_csv(SOURCE, nrows=200).rename(columns=TRAINING_TO_API_COLUMNS)
+    df.loc[5, "Category"] = None
+    df.loc[150, "Number_of_Ratings"] = None  # a missing numeric feature
+    source = tmp_path / "products.parquet"
+    df.to_parquet(source, index=False)
+    output = tmp_path / "scores.parquet"
+
+    bulk_score.bulk_score(str(source), str(output), workers=2, chunk_rows=50)
+    scored = pd.read_parquet(output)
+    assert len(scored) == 200
+    assert list(scored.columns) == list(df.columns) + [bulk_score.SCORE_COLUMN]
+    scores = scored[bulk_score.SCORE_COLUMN]
+    assert scores.isna().tolist() == [i in (5, 150) for i in range(200)]
+    valid = df.drop(index=[5, 150])
+    np.testing.assert_allclose(scores.drop(index=[5, 150]), _expected(valid))
+
+
+def test_missing_feature_column_is_an_error(tmp_path):
+    source = tmp_path / "products.csv"
+    pd.read_csv(SOURCE, nrows=10).drop(columns=["Category"]).to_csv(source)
+    with pytest.raises(ValueError, match="Category"):
+        bulk_score.bulk_score(str(source), str(tmp_path / "out.csv"))
@@ -0,0 +1,122 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+from llama_index.core import (
+    Document,
+    QueryBundle,
+    StorageContext,
+    VectorStoreIndex,
+    load_index_from_storage,
+)
+from llama_index.core.embeddings import MockEmbedding
+
+from rag.compact_store import (
+    SQLiteKVStore,
+    compact_index,
+    compact_storage_context,
+    is_current,
+)
+
+DIM = 16
+
+
+@pytest.fixture
+def persisted(tmp_path):
+    rng = np.random.default_rng(0)
+    reviews = [
+        f"Review {i}: {'acha' if i % 2 else 'bakwas'} product" for i in range(60)
+    ]
+    nodes = []
+    for i, text in enumerate(reviews):
+        node = Document(
+            text=text, metadata={"sentiment": ("negative", "positive")[i % 2]}
+        )
+        node.embedding = rng.normal(size=DIM).tolist()
+        nodes.append(node)
+    index = VectorStoreIndex(nodes, embed_model=MockEmbedding(embed_dim=DIM))
+    index.storage_context.persist(str(tmp_path / "index"))
+    return str(tmp_path / "index")
+
+
+def _retrieve(index, embedding, k=5):
+    retriever = index.as_retriever(similarity_top_k=k)
+    return retriever.retrieve(QueryBundle("q", embedding=embedding))
+
+
+def test_compact_index_retrieves_like_json_store(persisted):
+    embed = MockEmbedding(embed_dim=DIM)
+    json_index = load_index_from_storage(
+        StorageContext.from_defaults(persist_dir=persisted), embed_model=embed
+    )
+    compact = load_index_from_storage(
+        compact_storage_context(compact_index(persisted)), embed_model=embed
+    )
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        query = rng.normal(size=DIM).tolist()
+        expected = _retrieve(json_index, query)
+        got = _retrieve(compact, query)
+        assert [n.node.node_id for n in got] == [n.node.node_id for n in expected]
+        assert [n.score for n in got] == pytest.approx([n.score for n in expected])
+        assert [n.node.text for n in got] == [n.node.text for n in expected]
+        assert got[0].node.metadata == expected[0].node.metadata
+
+
+def test_nodes_are_only_read_when_retrieved(persisted, monkeypatch):
+    path = compact_index(persisted)
+    reads, scans = [], []
+    get, get_all = SQLiteKVStore.get, SQLiteKVStore.get_all
+
+    def counting_get(self, key, collection="data"):
+        reads.append(collection)
+        return get(self, key, collection)
+
+    def counting_get_all(self, collection="data"):
+        scans.append(collection)
+        return get_all(self, collection)
+
+    monkeypatch.setattr(SQLiteKVStore, "get", counting_get)
+    monkeypatch.setattr(SQLiteKVStore, "get_all", counting_get_all)
+    index = load_index_from_storage(
+        compact_storage_context(path), embed_model=MockEmbedding(embed_dim=DIM)
+    )
+    _retrieve(index, [1.0] * DIM, k=3)
+    assert reads.count("docstore/data") == 3
+    assert scans == ["index_store/data"]  # the docstore is never scanned
+
+
+def test_compact_store_is_stale_once_the_index_is_persisted_again(persisted, tmp_path):
+    compact_dir = compact_index(persisted)
+    assert is_current(persisted, compact_dir)
+
+    # Copied elsewhere (new mtimes, same content): still current
+    copy = str(tmp_path / "copy")
+    shutil.copytree(persisted, copy)
+    os.utime(os.path.join(copy, "docstore.json"), ns=(1, 1))
+    assert is_current(copy, os.path.join(copy, "compact"))
+
+    # Re-persisted with one more node, without converting again
+    index = load_index_from_storage(
+        StorageContext.from_defaults(persist_dir=persisted),
+        embed_model=MockEmbedding(embed_dim=DIM),
+    )
+    extra = Document(text="Review 60: naya product")
+    extra.embedding = [0.0] * DIM
+    index.insert_nodes([extra])
+    index.storage_context.persist(persisted)
+    assert not is_current(persisted, compact_dir)
+
+    shutil.rmtree(compact_dir)
+    assert not is_current(persisted, compact_dir)
+
+
+def test_sqlite_kvstore_roundtrip(tmp_path):
+    store = SQLiteKVStore(str(tmp_path / "kv.sqlite"))
+    store.put("a", {"x": 1})
+    store.put_all([("b", {"y": 2}), ("a", {"x": 3})], collection="other")
+    assert store.get("a") == {"x": 1}
+    assert store.get_all("other") == {"a": {"x": 3}, "b": {"y": 2}}
+    assert store.get("missing") is None
+    assert store.delete("a") and not store.delete("a")
@@ -0,0 +1,66 @@
+from rag import context
+from rag.context import count_tokens, pack_context, trim_passage
+
+QUESTION = "What is the return policy for a defective watch?"
+LONG = (
+    "Review: The watch looked nice in the pictures. Delivery took two weeks. "
+    "It stopped working after three days. The return was accepted and the "
+    "refund arrived in 7 days. Box was damaged.\nSentiment: negative"
+)
+
+
+def test_filler_and_duplicates_are_dropped():
+    passages = [
+        (LONG, 0.9),
+        (LONG.replace("The watch", "the WATCH"), 0.8),  # near-duplicate
+        ("👍👍👍 ok", 0.7),
+        ("Review: Cap quality is good and colour matches\nSentiment: positive", 0.6),
+    ]
+    packed, stats = pack_context(QUESTION, passages, budget_tokens=1000)
+    assert [i for i, _ in packed] == [0, 3]
+    assert stats["filler"] == 1 and stats["duplicates"] == 1
+
+
+def test_trim_keeps_relevant_sentences_and_labels():
+    trimmed = trim_passage(LONG, {"return", "refund", "watch"}, max_sentences=1)
+    assert "refund arrived" in trimmed
+    assert "Box was damaged" not in trimmed
+    assert trimmed.endswith("Sentiment: negative")
+
+
+def test_packed_context_fits_budget():
+    passages = [
+        (LONG.replace("watch", f"watch {i} model"), 1 - i / 10) for i in range(8)
+    ]
+    for budget in (20, 60, 200):
+        packed, stats = pack_context(QUESTION, passages, budget_tokens=budget)
+        assert stats["tokens_after"] == sum(count_tokens(t) for _, t in packed)
+        assert stats["tokens_after"] <= budget
+    assert stats["tokens_after"] < stats["tokens_before"]
+
+
+def test_count_tokens_falls_back_without_tokenizer(monkeypatch):
+    monkeypatch.setattr(context, "_tokenizer", ("chars/4", None))
+    count_tokens.cache_clear()
+    try:
+        assert count_tokens("x" * 40) == 10
+        assert count_tokens("") == 0
+    finally:
+        count_tokens.cache_clear()
+
+
+def test_postprocessor_rewrites_copies_of_nodes():
+    from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+    from rag.context_postprocessor import ContextBudgetPostprocessor
+
+    nodes = [
+        NodeWithScore(node=TextNode(text=LONG), score=0.9),
+        NodeWithScore(node=TextNode(text="ok 👍"), score=0.8),
+    ]
+    out = ContextBudgetPostprocessor(max_sentences=1).postprocess_nodes(
+        nodes, QueryBundle("How long does a refund take?")
+    )
+    assert len(out) == 1
+    assert "refund arrived" in out[0].node.get_content()
+    assert nodes[0].node.get_content() == LONG
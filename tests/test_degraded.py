@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from rag.degraded import CircuitBreaker, answer_within_budget, extractive_answer
+
+REVIEWS = [
+    (
+        "Review: Watch is stylish. Refund took 7 days after return.\nSentiment: neutral",
+        {"sentiment": "neutral"},
+    ),
+    ("Review: Delivery was fast. Return policy is easy.\nSentiment: positive", {}),
+    ("Review: Strap broke in a week.\nSentiment: negative", {"sentiment": "negative"}),
+]
+NODES = [
+    NodeWithScore(node=TextNode(text=t, metadata=m), score=1.0) for t, m in REVIEWS
+]
+
+
+def _ask(synthesize, budget=None, breaker=None):
+    return answer_within_budget(
+        "What is the return policy?",
+        retrieve=lambda: NODES,
+        synthesize=synthesize,
+        budget_seconds=budget,
+        breaker=breaker,
+        executor=ThreadPoolExecutor(2),
+    )
+
+
+def _hang(nodes):
+    time.sleep(2)
+    return "too late"
+
+
+def _fail(nodes):
+    raise ConnectionError("groq unreachable")
+
+
+def test_extractive_answer_has_top_sentences_and_tally():
+    answer, tally = extractive_answer("What is the return policy?", REVIEWS)
+    assert tally == {"neutral": 1, "positive": 1, "negative": 1}
+    lines = answer.splitlines()
+    assert "3 matching reviews" in lines[0]
+    assert lines[1] == '- "Return policy is easy."'
+    assert "Sentiment:" not in answer
+
+
+def test_healthy_llm_answer_is_not_degraded():
+    result = _ask(lambda nodes: "Returns are accepted within 7 days.", budget=5)
+    assert result["answer"] == "Returns are accepted within 7 days."
+    assert not result["degraded"] and result["usage"]["input_tokens"] > 0
+
+
+def test_slow_llm_falls_back_at_the_deadline():
+    start = time.monotonic()
+    result = _ask(_hang, budget=0.2)
+    assert time.monotonic() - start < 1.0
+    assert result["degraded"] and result["degraded_reason"] == "deadline"
+    assert result["answer"].startswith("From 3 matching reviews")
+    assert result["usage"] == {"input_tokens": 0, "output_tokens": 0}
+
+
+def test_llm_error_falls_back():
+    result = _ask(_fail, budget=5)
+    assert result["degraded_reason"] == "llm_error"
+    assert len(result["sources"]) == 3
+
+
+def test_breaker_skips_llm_while_failing_then_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.2)
+    calls = []
+
+    def failing(nodes):
+        calls.append(1)
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        _ask(failing, breaker=breaker)
+    assert breaker.state == "open"
+    assert _ask(failing, breaker=breaker)["degraded_reason"] == "circuit_open"
+    assert len(calls) == 2
+
+    time.sleep(0.25)
+    _ask(failing, breaker=breaker)  # failed probe reopens
+    assert len(calls) == 3 and breaker.state == "open"
+    time.sleep(0.25)
+    assert not _ask(lambda nodes: "ok", breaker=breaker)["degraded"]
+    assert breaker.state == "closed"
+
+
+def test_tiny_caller_budget_does_not_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1)
+    assert _ask(_hang, budget=0.05, breaker=breaker)["degraded"]
+    assert breaker.state == "closed"
+
+
+def test_ask_endpoint_enforces_caller_budget(monkeypatch):
+    from app import main
+
+    def ask_rag(question, budget_seconds=None):
+        return _ask(_hang, budget=budget_seconds)
+
+    monkeypatch.setattr(main, "ask_rag", ask_rag)
+    monkeypatch.setattr(main, "RAG_READY", True)
+    client = TestClient(main.app)
+
+    start = time.monotonic()
+    response = client.post(
+        "/ask", json={"question": "What is the return policy?", "budget_seconds": 0.3}
+    )
+    assert time.monotonic() - start < 1.5
+    body = response.json()
+    assert response.status_code == 200
+    assert body["degraded"] and body["degraded_reason"] == "deadline"
+
+    bad = client.post("/ask", json={"question": "hi", "budget_seconds": 0})
+    assert bad.status_code == 422
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from app.drift import DriftMonitor, build_reference
+from app.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+
+def _frame(rng, n, price_scale=1.0, category="Groceries"):
+    data = {column: rng.normal(100, 10, n) for column in NUMERIC_FEATURES}
+    data["Original Price"] = data["Original Price"] * price_scale
+    data["Category"] = [category] * n
+    data["Delivery Type"] = rng.choice(["Free Delivery", "Standard Delivery"], n)
+    data["Flagship Store"] = rng.choice(["Yes", "No"], n)
+    return pd.DataFrame(data)[NUMERIC_FEATURES + CATEGORICAL_FEATURES]
+
+
+def _requests(df):
+    renamed = df.rename(
+        columns={
+            "Original Price": "Original_Price",
+            "Discount Price": "Discount_Price",
+            "Number of Ratings": "Number_of_Ratings",
+            "Positive Seller Ratings": "Positive_Seller_Ratings",
+            "Ship On Time": "Ship_On_Time",
+            "Chat Response Rate": "Chat_Response_Rate",
+            "No. of products to be sold": "No_of_products_to_be_sold",
+            "Delivery Type": "Delivery_Type",
+            "Flagship Store": "Flagship_Store",
+        }
+    )
+    return renamed.to_dict(orient="records")
+
+
+def test_no_drift_on_same_distribution():
+    rng = np.random.default_rng(0)
+    monitor = DriftMonitor(build_reference(_frame(rng, 5000)), window_size=500)
+    for row in _requests(_frame(rng, 500)):
+        monitor.observe(row)
+
+    results = monitor.compute()
+    assert results["Original_Price"]["psi"] < 0.1
+    assert results["Category"]["psi"] < 0.1
+
+
+def test_drift_detected_and_window_slides():
+    rng = np.random.default_rng(1)
+    monitor = DriftMonitor(
+        build_reference(_frame(rng, 5000)), window_size=500, n_slots=5
+    )
+    for row in _requests(_frame(rng, 500, price_scale=1.5, category="Toys")):
+        monitor.observe(row)
+
+    results = monitor.compute()
+    assert results["Original_Price"]["psi"] > 0.25
+    assert results["Original_Price"]["ks"] > 0.5
+    assert results["Category"]["psi"] > 0.25
+    assert results["Discount_Price"]["psi"] < 0.1
+
+    # Once enough normal traffic has gone through, the drifted slots are gone
+    for row in _requests(_frame(rng, 1000)):
+        monitor.observe(row)
+    assert monitor.window_count <= 500
+    assert monitor.compute()["Original_Price"]["psi"] < 0.1
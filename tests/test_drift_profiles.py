@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from app.monitoring.drift_profiles import (
+    TDigest,
+    compare_profiles,
+    profile_chunks,
+    sample_from_profile,
+)
+
+
+def _chunks(df, size=1000):
+    return lambda: (df.iloc[i : i + size] for i in range(0, len(df), size))
+
+
+def _frame(rng, n, shift=0.0, shops=("A", "B", "C")):
+    return pd.DataFrame(
+        {
+            "price": rng.lognormal(6 + shift, 1, n),
+            "ship_on_time": rng.choice([0, 100], n, p=[0.6, 0.4]),
+            "shop": rng.choice(list(shops), n),
+        }
+    )
+
+
+def test_tdigest_quantiles_streamed_in_chunks():
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, 200_000)
+    digest = TDigest()
+    for chunk in np.array_split(values, 40):
+        digest.update(chunk)
+
+    assert len(digest.means) < 500  # bounded, independent of row count
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert abs(digest.quantile(q) - np.quantile(values, q)) < 0.5
+    assert abs(digest.cdf(50.0) - 0.5) < 0.01
+
+
+def test_profiles_detect_drift_only_where_it_happened():
+    rng = np.random.default_rng(1)
+    reference = profile_chunks(_chunks(_frame(rng, 20_000)))
+
+    same = profile_chunks(_chunks(_frame(rng, 5000)), reference=reference)
+    result = compare_profiles(reference, same)
+    assert result["drifted_columns"] == 0
+
+    drifted = profile_chunks(
+        _chunks(_frame(rng, 5000, shift=1.0, shops=("A", "D"))), reference=reference
+    )
+    result = compare_profiles(reference, drifted)
+    assert result["columns"]["price"]["drift_detected"]
+    assert result["columns"]["shop"]["drift_detected"]
+    assert "D" in result["columns"]["shop"]["new_categories"]
+    assert not result["columns"]["ship_on_time"]["drift_detected"]
+
+
+def test_sample_from_profile_is_bounded():
+    rng = np.random.default_rng(2)
+    profile = profile_chunks(_chunks(_frame(rng, 20_000)))
+    sample = sample_from_profile(profile, n=500)
+    assert len(sample) == 500
+    assert set(sample["shop"]) == {"A", "B", "C"}
@@ -0,0 +1,132 @@
+import itertools
+import math
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from app import explain, main
+from app.explain import TreeExplainer
+
+client = TestClient(main.app)
+
+PRODUCT = {
+    "Original_Price": 1650,
+    "Discount_Price": 725,
+    "Number_of_Ratings": 31,
+    "Positive_Seller_Ratings": 86,
+    "Ship_On_Time": 0,
+    "Chat_Response_Rate": 93,
+    "No_of_products_to_be_sold": 113.79,
+    "Category": "Watches, Bags, Jewellery",
+    "Delivery_Type": "Free Delivery",
+    "Flagship_Store": "No",
+}
+
+
+def _forest(n_features=5, **kwargs):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, n_features))
+    X[:, 3] = rng.integers(0, 2, 300)
+    y = 2 * X[:, 0] + np.sin(X[:, 1]) + X[:, 3] * X[:, 2] + 0.1 * rng.normal(size=300)
+    return RandomForestRegressor(random_state=0, **kwargs).fit(X, y), X
+
+
+def _brute_force_shap(model, x):
+    """Shapley values of the path-dependent conditional expectation."""
+
+    def expectation(tree, subset, node=0):
+        if tree.children_left[node] == -1:
+            return tree.value[node, 0, 0]
+        left, right = tree.children_left[node], tree.children_right[node]
+        if tree.feature[node] in subset:
+            goes_left = np.float32(x[tree.feature[node]]) <= tree.threshold[node]
+            return expectation(tree, subset, left if goes_left else right)
+        cover = tree.weighted_n_node_samples
+        return (
+            expectation(tree, subset, left) * cover[left]
+            + expectation(tree, subset, right) * cover[right]
+        ) / cover[node]
+
+    def f(subset):
+        return np.mean([expectation(e.tree_, subset) for e in model.estimators_])
+
+    n = len(x)
+    phi = np.zeros(n)
+    for i in range(n):
+        others = [j for j in range(n) if j != i]
+        for r in range(n):
+            weight = math.factorial(r) * math.factorial(n - r - 1) / math.factorial(n)
+            for subset in itertools.combinations(others, r):
+                phi[i] += weight * (f(set(subset) | {i}) - f(set(subset)))
+    return phi
+
+
+def test_matches_brute_force_shapley_values():
+    model, X = _forest(n_estimators=4, max_depth=6)
+    phi = TreeExplainer(model).shap_values(X[:3])
+    for i in range(3):
+        np.testing.assert_allclose(phi[i], _brute_force_shap(model, X[i]), atol=1e-9)
+
+
+@pytest.mark.parametrize("table", [True, False])
+def test_contributions_sum_to_prediction(monkeypatch, table):
+    if not table:  # every path-length group runs the recurrences per request
+        monkeypatch.setattr(explain, "_TABLE_ELEMENTS", 0)
+    model, X = _forest(n_features=8, n_estimators=20, max_depth=9)
+    explainer = TreeExplainer(model)
+    phi = explainer.shap_values(X)
+    assert phi.shape == X.shape
+    np.testing.assert_allclose(
+        phi.sum(1) + explainer.expected_value, model.predict(X), atol=1e-9
+    )
+
+    tree = DecisionTreeRegressor(max_depth=4, random_state=0).fit(X, X[:, 0])
+    explainer = TreeExplainer(tree)
+    np.testing.assert_allclose(
+        explainer.shap_values(X).sum(1) + explainer.expected_value,
+        tree.predict(X),
+        atol=1e-9,
+    )
+
+
+def test_shipped_model_contributions_sum_to_prediction():
+    model = joblib.load(main.MODEL_PATH)
+    X = pd.DataFrame(
+        np.random.default_rng(1).uniform(0, 2000, size=(200, model.n_features_in_)),
+        columns=model.feature_names_in_,
+    )
+    explainer = TreeExplainer(model)
+    phi = explainer.shap_values(X.to_numpy())
+    np.testing.assert_allclose(
+        phi.sum(1) + explainer.expected_value, model.predict(X), atol=1e-9
+    )
+
+
+def test_explain_endpoint_single_and_batch():
+    response = client.post("/predict/explain", json=PRODUCT)
+    assert response.status_code == 200
+    (single,) = response.json()["explanations"]
+    assert set(single["contributions"]) == set(PRODUCT)
+    assert single["expected_value"] + sum(
+        single["contributions"].values()
+    ) == pytest.approx(single["raw_prediction"])
+    predicted = client.post("/predict", json=PRODUCT).json()["predicted_success_score"]
+    assert single["predicted_success_score"] == pytest.approx(predicted)
+
+    other = {**PRODUCT, "No_of_products_to_be_sold": 1, "Category": "Groceries"}
+    response = client.post("/predict/explain", json=[PRODUCT, other, PRODUCT])
+    batch = response.json()["explanations"]
+    assert len(batch) == 3
+    assert batch[0] == batch[2] == single
+    assert batch[1]["raw_prediction"] != single["raw_prediction"]
+
+
+def test_explain_endpoint_limits(monkeypatch):
+    monkeypatch.setattr(main, "EXPLAIN_MAX_BATCH", 1)
+    response = client.post("/predict/explain", json=[PRODUCT, PRODUCT])
+    assert response.status_code == 413
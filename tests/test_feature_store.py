@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from app.feature_store import load_feature_store
+from app.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET_COLUMN
+
+
+def _write_csv(path, rng, n=200):
+    df = pd.DataFrame({c: rng.integers(0, 1000, n) for c in NUMERIC_FEATURES})
+    df["Category"] = rng.choice(["Groceries", "Mother & Baby", "Watches"], n)
+    df["Delivery Type"] = rng.choice(["Free Delivery", "Standard Delivery"], n)
+    df["Flagship Store"] = rng.choice(["No", "Yes"], n)
+    df[TARGET_COLUMN] = rng.integers(-10, 150, n)
+    df["Title"] = "unused"
+    df.loc[0, "Category"] = None  # dropped like in the original pipeline
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_store_matches_get_dummies_encoding(tmp_path):
+    source = tmp_path / "products.csv"
+    df = _write_csv(source, np.random.default_rng(0))
+    store = load_feature_store(str(source), str(tmp_path / "store"))
+
+    clean = df.dropna(subset=NUMERIC_FEATURES + CATEGORICAL_FEATURES)
+    expected = pd.concat(
+        [
+            clean[NUMERIC_FEATURES],
+            pd.get_dummies(clean[CATEGORICAL_FEATURES], drop_first=True),
+        ],
+        axis=1,
+    ).reset_index(drop=True)
+
+    assert store.columns == list(expected.columns)
+    assert np.array_equal(store.X, expected.to_numpy(np.float32))
+    assert store.y.max() <= 100 and store.y.min() >= 0
+    assert len(store.train_idx) + len(store.test_idx) == len(store)
+
+    frame = store.frame()
+    assert frame["Original Price"].dtype == np.float32
+    assert frame["Category_Watches"].dtype == np.uint8
+    assert list(store.raw_frame()["Category"]) == list(clean["Category"])
+
+
+def test_levels_only_in_dropped_rows_are_not_encoded(tmp_path):
+    source = tmp_path / "products.csv"
+    df = _write_csv(source, np.random.default_rng(2))
+    # "Automotive" would sort first and become the drop_first baseline
+    df.loc[1, "Category"] = "Automotive"
+    df.loc[1, NUMERIC_FEATURES[0]] = None
+    df.to_csv(source, index=False)
+    store = load_feature_store(str(source), str(tmp_path / "store"))
+
+    clean = df.dropna(subset=NUMERIC_FEATURES + CATEGORICAL_FEATURES)
+    expected = pd.get_dummies(clean[CATEGORICAL_FEATURES], drop_first=True)
+    assert store.categories["Category"] == ["Groceries", "Mother & Baby", "Watches"]
+    assert store.columns == NUMERIC_FEATURES + list(expected.columns)
+
+
+def test_store_is_reused_until_source_changes(tmp_path):
+    source = tmp_path / "products.csv"
+    rng = np.random.default_rng(1)
+    _write_csv(source, rng)
+    first = load_feature_store(str(source), str(tmp_path / "store"))
+    again = load_feature_store(str(source), str(tmp_path / "store"))
+    assert again.path == first.path
+
+    _write_csv(source, rng)
+    changed = load_feature_store(str(source), str(tmp_path / "store"))
+    assert changed.path != first.path
@@ -1,5 +1,9 @@
+import random
+import time
+
 from fastapi.testclient import TestClient
 from unittest.mock import patch
+from app.guardrails import CustomGuardrails
 from app.main import app
 
 client = TestClient(app)
@@ -41,3 +45,87 @@ def test_guardrail_output_toxicity(mock_ask_rag):
         assert response.status_code == 200
         data = response.json()
         assert data["answer"] == "I cannot answer this due to safety guidelines."
+
+
+# --- Linear-time matching / ReDoS fuzzing ---
+# Worst cases for backtracking on the PII patterns: long runs with no '@',
+# many '@' or '.', and near-miss CNIC/phone digit runs
+ADVERSARIAL = {
+    "letters": lambda n: "a" * n,
+    "spaces": lambda n: "a " * (n // 2),
+    "at_then_letters": lambda n: "@" + "a" * n,
+    "letters_at_letters": lambda n: "a" * (n // 2) + "@" + "a" * (n // 2),
+    "many_ats": lambda n: "a@" * (n // 2),
+    "many_dots": lambda n: "a@" + "b." * (n // 2),
+    "at_dot": lambda n: "@." * (n // 2),
+    "digits": lambda n: "3" * n,
+    "cnic_near_miss": lambda n: "12345-123456-" * (n // 13),
+    "phone_near_miss": lambda n: "+9203" * (n // 5),
+}
+
+
+def _timed_check(guardrails, text, repeats=3):
+    """Best of a few runs, so a GC pause or a busy runner doesn't count."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        guardrails.check_input(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_pii_patterns_are_linear_on_adversarial_input():
+    # Caps off. 8x the input must cost about 8x the time: a backtracking
+    # pattern would be ~64x (the old Email pattern took ~14 s on "a" * 100_000)
+    guardrails = CustomGuardrails(max_input_chars=10**7)
+    for name, make in ADVERSARIAL.items():
+        small = _timed_check(guardrails, make(25_000))
+        large = _timed_check(guardrails, make(200_000))
+        assert large / small < 24, f"{name}: {small:.4f}s -> {large:.4f}s"
+
+
+def test_random_fuzz_stays_within_time_bound():
+    # Inputs at the length cap take well under a millisecond; the loose
+    # bound only catches catastrophic backtracking
+    guardrails = CustomGuardrails()
+    rng = random.Random(0)
+    alphabet = "a@.-+ 0123456789"
+    worst = 0.0
+    for _ in range(300):
+        text = "".join(rng.choices(alphabet, k=guardrails.max_input_chars))
+        worst = max(worst, _timed_check(guardrails, text))
+    assert worst < 0.2, f"{worst:.3f}s"
+
+
+def test_pii_detection_still_matches():
+    guardrails = CustomGuardrails()
+    for text, pii_type in [
+        ("mail me at ali.khan@gmail.com", "Email"),
+        ("a@b.pk", "Email"),
+        ("call 03001234567", "Phone"),
+        ("call +923001234567", "Phone"),
+        ("id 42101-1234567-1", "CNIC"),
+    ]:
+        is_safe, reason = guardrails.check_input(text)
+        assert not is_safe and f"({pii_type})" in reason, text
+    assert guardrails.check_input("rating @ 4.5 stars, price Rs. 1,299")[0]
+
+
+def test_length_cap_applies_before_scanning():
+    guardrails = CustomGuardrails(max_input_chars=20, max_output_chars=30)
+    is_safe, reason = guardrails.check_input("42101-1234567-1 " * 2)
+    assert not is_safe and "too long" in reason
+    assert guardrails.check_input("x" * 20)[0]
+    assert not guardrails.check_output("fine " * 10)[0]
+
+    # An explicit 0 is a cap of 0, not "use the default"
+    zero = CustomGuardrails(max_input_chars=0, max_output_chars=0)
+    assert (zero.max_input_chars, zero.max_output_chars) == (0, 0)
+    assert not zero.check_input("hi")[0]
+
+
+def test_api_rejects_oversized_question():
+    payload = {"question": "a" * 5000}
+    response = client.post("/ask", json=payload)
+    assert response.status_code == 400
+    assert "Input too long" in response.json()["detail"]
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from rag.hedging import AttemptTimeout, CallPolicy, is_retryable
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class StubLLM:
+    """Local stand-in for the Groq call: scripted latency spikes and errors."""
+
+    def __init__(self, latency=0.01, spikes=(), errors=()):
+        self.latency = latency
+        self.spikes = set(spikes)  # call numbers that take SPIKE seconds
+        self.errors = dict(errors)  # call number -> exception to raise
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    SPIKE = 1.0
+
+    def __call__(self, prompt):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        if n in self.errors:
+            raise self.errors[n]
+        time.sleep(self.SPIKE if n in self.spikes else self.latency)
+        return f"answer to {prompt}"
+
+
+def _warm(policy, llm, n=20):
+    for _ in range(n):
+        policy.call(llm, "warm-up")
+
+
+def test_is_retryable():
+    assert is_retryable(TimeoutError()) and is_retryable(ConnectionError())
+    assert is_retryable(APIStatusError(429)) and is_retryable(APIStatusError(503))
+    assert not is_retryable(APIStatusError(400)) and not is_retryable(ValueError())
+
+
+def test_hedge_beats_latency_spike():
+    llm = StubLLM(spikes={20})
+    policy = CallPolicy(min_samples=20, burst=5)
+    _warm(policy, llm)
+
+    start = time.monotonic()
+    assert policy.call(llm, "q") == "answer to q"
+    assert time.monotonic() - start < StubLLM.SPIKE / 2
+    assert policy.counts["hedge_fired"] == 1 and policy.counts["hedge_won"] == 1
+
+
+def test_no_hedge_until_latency_is_known():
+    llm = StubLLM(spikes={0})
+    policy = CallPolicy(min_samples=20)
+    assert policy.call(llm, "q") == "answer to q"
+    assert policy.counts["hedge_fired"] == 0 and llm.calls == 1
+
+
+def test_retryable_error_is_retried():
+    llm = StubLLM(errors={0: APIStatusError(429), 1: ConnectionError()})
+    policy = CallPolicy(retries=2, backoff=0.01)
+    assert policy.call(llm, "q") == "answer to q"
+    assert llm.calls == 3 and policy.counts["retry"] == 2
+
+
+def test_non_retryable_error_is_raised_at_once():
+    llm = StubLLM(errors={0: APIStatusError(400)})
+    policy = CallPolicy(retries=2, backoff=0.01)
+    with pytest.raises(APIStatusError):
+        policy.call(llm, "q")
+    assert llm.calls == 1
+
+
+def test_attempt_deadline():
+    llm = StubLLM(spikes={0, 1})
+    policy = CallPolicy(attempt_timeout=0.1, retries=1, backoff=0.01, hedge=False)
+    start = time.monotonic()
+    with pytest.raises(AttemptTimeout):
+        policy.call(llm, "q")
+    assert time.monotonic() - start < 0.5
+    assert policy.counts["attempt_timeout"] == 2 and llm.calls == 2
+
+
+def test_extra_load_is_capped():
+    # Every call after warm-up spikes, but the budget allows a single hedge
+    llm = StubLLM(latency=0.01, spikes=set(range(20, 100)))
+    StubLLM.SPIKE, spike = 0.2, StubLLM.SPIKE
+    try:
+        policy = CallPolicy(min_samples=20, hedge_quantile=0.5, burst=1, extra_load=0.0)
+        _warm(policy, llm)
+        for _ in range(5):
+            policy.call(llm, "q")
+    finally:
+        StubLLM.SPIKE = spike
+    assert policy.counts["hedge_fired"] == 1
+    assert policy.counts["budget_exhausted"] == 4
+    assert llm.calls == 20 + 5 + 1
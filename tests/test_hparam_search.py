@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.feature_store import load_feature_store
+from app.features import NUMERIC_FEATURES, TARGET_COLUMN
+from app.hparam_search import HyperparameterSearch, random_candidates
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 120
+    df = pd.DataFrame({c: rng.integers(0, 1000, n) for c in NUMERIC_FEATURES})
+    df["Category"] = rng.choice(["Groceries", "Watches"], n)
+    df["Delivery Type"] = rng.choice(["Free Delivery", "Standard Delivery"], n)
+    df["Flagship Store"] = rng.choice(["No", "Yes"], n)
+    df[TARGET_COLUMN] = df[NUMERIC_FEATURES[0]] % 100
+    df.to_csv(tmp_path / "products.csv", index=False)
+    return load_feature_store(str(tmp_path / "products.csv"), str(tmp_path / "store"))
+
+
+def test_folds_cover_train_split_once(store):
+    search = HyperparameterSearch(store, n_folds=3, workers=1)
+    validation = np.concatenate([val for _, val in search.folds])
+    assert sorted(validation) == sorted(store.train_idx)
+
+
+def test_random_candidates_are_reproducible():
+    assert random_candidates(5, seed=3) == random_candidates(5, seed=3)
+
+
+@pytest.mark.parametrize("method", ["random", "halving"])
+def test_search_picks_lowest_objective(store, method):
+    search = HyperparameterSearch(store, n_folds=2, workers=2, latency_weight=0.5)
+    summary = search.run(method, n_trials=4)
+
+    final = [t for t in search.trials if t["fraction"] == 1.0]
+    assert summary["best"]["objective"] == min(t["objective"] for t in final)
+    assert summary["trials"] == len(search.trials)
+    assert summary["trials_per_minute"] > 0
+    for trial in search.trials:
+        expected = trial["rmse"] + 0.5 * trial["latency_ms"]
+        assert trial["objective"] == pytest.approx(expected)
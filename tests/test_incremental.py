@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from app.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET_COLUMN
+from app.incremental import encode_rows, grow_forest, incremental_update, unseen_levels
+
+MODEL_COLUMNS = NUMERIC_FEATURES + [
+    "Category_Groceries",
+    "Delivery Type_Standard Delivery",
+    "Flagship Store_Yes",
+]
+CATEGORIES = {
+    "Category": ["Books", "Groceries"],
+    "Delivery Type": ["Free Delivery", "Standard Delivery"],
+    "Flagship Store": ["No", "Yes"],
+}
+
+
+def _rows(n, seed, shift=0.0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({c: rng.uniform(0, 100, n) for c in NUMERIC_FEATURES})
+    df["Category"] = rng.choice(["Books", "Groceries"], n)
+    df["Delivery Type"] = rng.choice(["Free Delivery", "Standard Delivery"], n)
+    df["Flagship Store"] = rng.choice(["No", "Yes"], n)
+    df[TARGET_COLUMN] = df["No. of products to be sold"] / 2 + shift
+    return df
+
+
+def test_encode_rows_keeps_model_columns():
+    df = _rows(50, 0)
+    df.loc[0, "Category"] = "Gadgets"  # unseen level
+    df.loc[1, "Original Price"] = None
+    df.loc[2, TARGET_COLUMN] = 250
+    assert unseen_levels(df, CATEGORIES) == {"Category": ["Gadgets"]}
+
+    X, y = encode_rows(df, MODEL_COLUMNS)
+    assert list(X.columns) == MODEL_COLUMNS
+    assert len(X) == len(y) == 49
+    assert X.loc[0, "Category_Groceries"] == 0
+    assert y.max() == 100
+    assert set(CATEGORICAL_FEATURES).isdisjoint(X.columns)
+
+
+def test_grow_forest_adds_trees_and_caps_oldest():
+    X, y = encode_rows(_rows(300, 1), MODEL_COLUMNS)
+    model = RandomForestRegressor(n_estimators=4, max_depth=4, random_state=0)
+    model.fit(X, y)
+    before = model.predict(X)
+
+    grown = grow_forest(model, X, y, new_trees=3)
+    assert len(grown.estimators_) == 7
+    assert grown.estimators_[0] is not model.estimators_[0]  # model untouched
+    assert np.array_equal(model.predict(X), before)
+
+    capped = grow_forest(model, X, y, new_trees=3, max_trees=5)
+    assert len(capped.estimators_) == capped.n_estimators == 5
+    oldest = capped.estimators_[0].tree_
+    assert np.array_equal(oldest.threshold, model.estimators_[2].tree_.threshold)
+
+
+def test_incremental_update_promotes_only_when_not_worse():
+    X_old, y_old = encode_rows(_rows(300, 2), MODEL_COLUMNS)
+    model = RandomForestRegressor(n_estimators=5, max_depth=5, random_state=0)
+    model.fit(X_old, y_old)
+
+    # The target drifted upwards; trees fitted on new data follow it
+    X_new, y_new = encode_rows(_rows(400, 3, shift=20), MODEL_COLUMNS)
+    X_hold, y_hold = encode_rows(_rows(200, 4, shift=20), MODEL_COLUMNS)
+    candidate, report = incremental_update(
+        model, X_new, y_new, X_hold, y_hold, new_trees=20, max_trees=20
+    )
+    assert report["promote"]
+    assert report["candidate"]["rmse"] < report["current"]["rmse"]
+    assert report["trees"] == 20 and report["new_rows"] == 400
+
+    # New rows that contradict the holdout make the candidate worse
+    X_bad, y_bad = encode_rows(_rows(400, 5, shift=-40), MODEL_COLUMNS)
+    X_hold, y_hold = encode_rows(_rows(200, 6), MODEL_COLUMNS)
+    _, report = incremental_update(model, X_bad, y_bad, X_hold, y_hold, new_trees=5)
+    assert not report["promote"]
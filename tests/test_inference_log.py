@@ -0,0 +1,77 @@
+import time
+
+import pyarrow.parquet as pq
+
+from app.inference_log import InferenceLogger, schema_from_model
+from app.main import ProductFeatures
+
+PAYLOAD = ProductFeatures.model_config["json_schema_extra"]["example"]
+
+
+def _logger(tmp_path, **kwargs):
+    schema = schema_from_model(ProductFeatures, {"predicted_success_score": float})
+    return InferenceLogger(str(tmp_path), {"predictions": schema}, **kwargs)
+
+
+def test_records_are_written_to_parquet(tmp_path):
+    logger = _logger(tmp_path, batch_size=100).start()
+    for i in range(250):
+        logger.log("predictions", {**PAYLOAD, "predicted_success_score": float(i)})
+    logger.close()
+
+    files = list((tmp_path / "predictions").glob("*.parquet"))
+    assert len(files) == 1
+    table = pq.read_table(files[0])
+    assert table.num_rows == 250
+    assert set(ProductFeatures.model_fields) < set(table.column_names)
+    assert str(table.schema.field("Number_of_Ratings").type) == "int64"
+    assert table.column("predicted_success_score").to_pylist()[-1] == 249.0
+    assert logger.written == 250
+
+
+def test_failed_batch_is_counted_and_later_flushes_continue(tmp_path):
+    logger = _logger(tmp_path, batch_size=1, flush_interval=0.01).start()
+    bad = {**PAYLOAD, "predicted_success_score": "not a number"}
+    logger.log("predictions", bad)
+    deadline = time.monotonic() + 5
+    while logger.failed == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert logger.failed == 1
+
+    for i in range(3):
+        logger.log("predictions", {**PAYLOAD, "predicted_success_score": float(i)})
+    deadline = time.monotonic() + 5
+    while logger.written < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert logger._thread.is_alive()
+    logger.close()
+
+    rows = sum(
+        pq.read_table(f).num_rows for f in (tmp_path / "predictions").glob("*.parquet")
+    )
+    assert rows == 3 and logger.written == 3
+
+
+def test_backpressure_samples_then_drops(tmp_path):
+    # Not started, so nothing drains the queue
+    logger = _logger(tmp_path, max_queue=10, high_water=0.5, sample_rate=1.0)
+    for _ in range(25):
+        logger.log("predictions", dict(PAYLOAD))
+    assert len(logger._queue) == 10
+    assert logger.dropped == 15
+
+    logger = _logger(tmp_path, max_queue=10, high_water=0.5, sample_rate=0.0)
+    for _ in range(25):
+        logger.log("predictions", dict(PAYLOAD))
+    assert len(logger._queue) == 5
+    assert logger.sampled_out == 20
+
+
+def test_log_overhead_is_small(tmp_path):
+    logger = _logger(tmp_path, max_queue=1_000_000)
+    n = 20_000
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.log("predictions", {**PAYLOAD, "predicted_success_score": 1.0})
+    per_call_us = (time.perf_counter() - start) / n * 1e6
+    assert per_call_us < 50
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rag.llm_cache import CachedGroqClient, CacheMiss, LLMCache, make_key
+
+
+class FakeGroq:
+    """Counts calls and echoes the prompt back, like a deterministic LLM."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, **params):
+        self.calls += 1
+        content = f"echo: {messages[-1]['content']}"
+        return SimpleNamespace(
+            model_dump=lambda mode=None: {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2},
+            }
+        )
+
+
+def _ask(client, text, temperature=0.0):
+    return client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[{"role": "user", "content": text}],
+        temperature=temperature,
+        max_tokens=100,
+    )
+
+
+def test_key_depends_on_sampling_params():
+    messages = [{"role": "user", "content": "hi"}]
+    assert make_key("m", messages, {"temperature": 0.0}) == make_key(
+        "m", messages, {"temperature": 0.0}
+    )
+    assert make_key("m", messages, {"temperature": 0.0}) != make_key(
+        "m", messages, {"temperature": 0.7}
+    )
+
+
+def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    fake = FakeGroq()
+
+    recorder = CachedGroqClient(fake, LLMCache(path=path, mode="record"))
+    first = _ask(recorder, "acha product")
+    second = _ask(recorder, "acha product")
+    assert fake.calls == 1
+    assert first.choices[0].message.content == "echo: acha product"
+    assert second.choices[0].message.content == "echo: acha product"
+    assert second.usage.prompt_tokens == 3
+    assert recorder.cache.stats()["hit_rate"] == 0.5
+
+    # Replay never touches the client and fails loudly on unseen prompts
+    replayer = CachedGroqClient(FakeGroq(), LLMCache(path=path, mode="replay"))
+    assert _ask(replayer, "acha product").choices[0].message.content.startswith("echo")
+    with pytest.raises(CacheMiss):
+        _ask(replayer, "acha product", temperature=0.5)
+
+
+def test_passthrough_does_not_cache(tmp_path):
+    fake = FakeGroq()
+    client = CachedGroqClient(
+        fake, LLMCache(path=str(tmp_path / "c.sqlite"), mode="passthrough")
+    )
+    _ask(client, "same")
+    _ask(client, "same")
+    assert fake.calls == 2
+    assert not (tmp_path / "c.sqlite").exists()
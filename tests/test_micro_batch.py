@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+
+from rag.micro_batch import MicroBatchedEmbedding, MicroBatcher, query_batch_fn
+
+
+def _run_concurrently(fn, n):
+    results, errors = {}, {}
+
+    def call(i):
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_queries_share_batches():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        time.sleep(0.02)  # a forward pass; the next batch fills meanwhile
+        return [item * 10 for item in items]
+
+    observed = []
+    batcher = MicroBatcher(
+        batch_fn,
+        max_batch_size=8,
+        max_wait_seconds=0.01,
+        on_batch=lambda size, waited: observed.append(size),
+    )
+    results, errors = _run_concurrently(batcher.submit, 40)
+    assert not errors
+    assert results == {i: i * 10 for i in range(40)}
+    assert max(sizes) == 8 and len(sizes) < 40 / 2
+    assert observed == sizes
+    assert batcher.items == 40 and batcher.batches == len(sizes)
+
+
+def test_lone_query_waits_at_most_max_wait():
+    batcher = MicroBatcher(lambda items: items, max_wait_seconds=0.005)
+    batcher.submit(0)  # starts the thread
+    start = time.perf_counter()
+    assert batcher.submit(1) == 1
+    assert time.perf_counter() - start < 0.1
+
+
+def test_batch_error_fails_every_waiter():
+    def batch_fn(items):
+        time.sleep(0.01)
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_seconds=0.02)
+    results, errors = _run_concurrently(batcher.submit, 4)
+    assert not results
+    assert all(isinstance(e, RuntimeError) for e in errors.values())
+    batcher.batch_fn = lambda items: items  # the thread survives the error
+    assert batcher.submit(7) == 7
+
+
+def test_short_result_fails_the_batch_instead_of_hanging():
+    batcher = MicroBatcher(lambda items: items[:-1], max_wait_seconds=0.05)
+    results, errors = _run_concurrently(batcher.submit, 3)
+    assert not results and len(errors) == 3
+    assert all("results for" in str(e) for e in errors.values())
+    assert batcher._thread.is_alive()
+
+
+def test_batch_thread_survives_an_on_batch_error():
+    def on_batch(size, waited):
+        raise ValueError("metrics backend down")
+
+    batcher = MicroBatcher(lambda items: items, on_batch=on_batch)
+    for i in range(3):  # each result was already set; later batches still run
+        assert batcher.submit(i) == i
+    assert batcher._thread.is_alive() and batcher.batches == 3
+
+
+def test_embedding_wrapper():
+    inner = MockEmbedding(embed_dim=3)
+    calls = []
+
+    def batch_fn(queries):
+        calls.append(list(queries))
+        return [[float(len(q))] * 3 for q in queries]
+
+    model = MicroBatchedEmbedding(inner, max_wait_seconds=0.01, batch_fn=batch_fn)
+    results, _ = _run_concurrently(lambda i: model.get_query_embedding("q" * i), 6)
+    assert all(results[i] == [float(i)] * 3 for i in range(6))
+    assert sum(len(c) for c in calls) == 6 and len(calls) < 6
+    # Documents are embedded by the wrapped model, outside the batcher
+    assert model.get_text_embedding_batch(["a", "b"]) == [[0.5] * 3] * 2
+    assert sum(len(c) for c in calls) == 6
+
+
+def test_query_batch_fn_matches_single_query_path():
+    class PromptedEmbedding(MockEmbedding):
+        def _embed(self, sentences, prompt_name=None):
+            return [[float(prompt_name == "query")] * 3 for _ in sentences]
+
+        def _get_query_embedding(self, query):
+            return self._embed([query], prompt_name="query")[0]
+
+    model = PromptedEmbedding(embed_dim=3)
+    batch = query_batch_fn(model)(["a", "b"])
+    assert batch == [model._get_query_embedding("a")] * 2 == [[1.0] * 3] * 2
+    # Without a batched entry point it falls back to one call per query
+    assert query_batch_fn(MockEmbedding(embed_dim=2))(["a"]) == [[0.5, 0.5]]
+
+
+@pytest.mark.parametrize("max_batch", [1, 2])
+def test_max_batch_size_is_respected(max_batch):
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        time.sleep(0.005)
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=max_batch, max_wait_seconds=0.01)
+    _run_concurrently(batcher.submit, 10)
+    assert max(sizes) <= max_batch
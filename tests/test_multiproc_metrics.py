@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.multiproc_metrics import collect_latest, mark_worker_dead, reset_dir
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+WORKER = """
+import os
+from app.instrumentation import log_feature_drift, log_model_latency, observe_prediction
+for _ in range({n}):
+    observe_prediction("v1")
+    log_model_latency("v1", 0.002)
+log_feature_drift({{"price": {{"psi": 0.5}}}}, 10)
+print(os.getpid())
+"""
+
+
+def _env(path):
+    return {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(path), "PYTHONPATH": SRC}
+
+
+def _run_worker(path, n):
+    out = subprocess.run(
+        [sys.executable, "-c", WORKER.format(n=n)],
+        env=_env(path),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+def _samples(path):
+    samples = {}
+    for family in text_string_to_metric_families(collect_latest(str(path)).decode()):
+        for s in family.samples:
+            samples.setdefault(s.name, []).append((s.labels, s.value))
+    return samples
+
+
+def test_counters_and_histograms_sum_across_workers(tmp_path):
+    reset_dir(str(tmp_path))
+    pids = [_run_worker(tmp_path, n) for n in (5, 7, 11)]
+
+    samples = _samples(tmp_path)
+    assert samples["api_predictions_total"] == [({"model_version": "v1"}, 23.0)]
+    assert samples["model_inference_latency_seconds_count"][0][1] == 23.0
+    assert len(samples["feature_drift_psi"]) == 1  # livemostrecent: one value
+    assert len(os.listdir(tmp_path)) > 3
+
+    # Dead workers: counters keep their totals, live gauges go away
+    for pid in pids:
+        assert mark_worker_dead(pid, str(tmp_path)) == 2  # counter + histogram
+    samples = _samples(tmp_path)
+    assert samples["api_predictions_total"] == [({"model_version": "v1"}, 23.0)]
+    assert samples["model_inference_latency_seconds_count"][0][1] == 23.0
+    assert "feature_drift_psi" not in samples
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith(".db")) == [
+        "counter_archive.db",
+        "histogram_archive.db",
+    ]
+
+    # A later worker adds on top of the archive
+    mark_worker_dead(_run_worker(tmp_path, 2), str(tmp_path))
+    assert _samples(tmp_path)["api_predictions_total"][0][1] == 25.0
+
+
+def test_reset_dir_drops_stale_files(tmp_path):
+    _run_worker(tmp_path, 1)
+    reset_dir(str(tmp_path))
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".db")]
+
+
+def test_metrics_endpoint_merges_workers(tmp_path):
+    reset_dir(str(tmp_path))
+    _run_worker(tmp_path, 4)
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "from app.instrumentation import observe_prediction\n"
+        "observe_prediction('v1')\n"
+        "response = TestClient(app).get('/metrics')\n"
+        "assert response.status_code == 200\n"
+        "print(response.text)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        env=_env(tmp_path),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert 'api_predictions_total{model_version="v1"} 5.0' in out.stdout
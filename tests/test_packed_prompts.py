@@ -0,0 +1,91 @@
+import json
+
+from rag.packed_prompts import (
+    build_preamble,
+    build_prompt,
+    classify_packed,
+    parse_packed,
+)
+
+REVIEWS = ["zabardast", "bakwas", "theek hai", "acha\nhai", "bura"]
+TRUTH = ["positive", "negative", "neutral", "positive", "negative"]
+USAGE = {"prompt_tokens": 10, "completion_tokens": 2}
+
+
+def _reply(prompt):
+    """Answers every numbered review in the prompt correctly."""
+    truth = {" ".join(r.split()): t for r, t in zip(REVIEWS, TRUTH)}
+    body = prompt.rsplit("Now classify these reviews:\n", 1)[1]
+    items = [line.split("] ", 1)[1] for line in body.splitlines() if line[:1] == "["]
+    return [{"id": i, "sentiment": truth[r]} for i, r in enumerate(items, 1)]
+
+
+def test_parse_packed_is_strict():
+    assert parse_packed('[{"id": 1, "sentiment": "Positive"}]', 1) == {1: "positive"}
+    assert parse_packed('```json\n[{"id": "2", "sentiment": "neutral"}]\n```', 2) == {
+        2: "neutral"
+    }
+    # Unknown ids, bad labels, duplicates and non-objects are all dropped
+    output = (
+        'Sure! [{"id": 1, "sentiment": "good"}, {"id": 2, "sentiment": "negative"},'
+        ' {"id": 2, "sentiment": "positive"}, {"id": 9, "sentiment": "neutral"},'
+        ' "positive", {"id": 3, "sentiment": "neutral"}]'
+    )
+    assert parse_packed(output, 3) == {3: "neutral"}
+    assert parse_packed('[{"id": 1, "sentiment": "positive"}', 1) == {}
+    assert parse_packed('{"id": 1, "sentiment": "positive"}', 1) == {}
+
+
+def test_prompt_shares_one_preamble_and_keeps_reviews_on_one_line():
+    preamble = build_preamble([("acha", "positive")])
+    prompt = build_prompt(preamble, REVIEWS)
+    assert prompt.count(preamble) == 1
+    assert "[4] acha hai\n" in prompt
+    assert '"sentiment": "positive"' in preamble
+
+
+def test_only_unparsed_items_fall_back_to_single_calls():
+    singles = []
+
+    def complete(prompt, max_tokens):
+        return json.dumps([item for item in _reply(prompt) if item["id"] != 2]), USAGE
+
+    def classify_one(review):
+        singles.append(review)
+        return TRUTH[REVIEWS.index(review)], USAGE
+
+    labels, stats = classify_packed(REVIEWS, complete, classify_one, pack_size=3)
+    assert labels == TRUTH
+    assert singles == ["bakwas", "bura"]  # item 2 of each pack
+    assert stats["packed_calls"] == 2 and stats["single_calls"] == 2
+    assert stats["fallback_items"] == 2
+    assert stats["input_tokens"] == 40
+
+
+def test_failed_pack_falls_back_for_all_its_items():
+    def complete(prompt, max_tokens):
+        raise ConnectionError("upstream down")
+
+    labels, stats = classify_packed(
+        REVIEWS, complete, lambda r: ("neutral", None), pack_size=10
+    )
+    assert labels == ["neutral"] * len(REVIEWS)
+    assert stats["packed_calls"] == 1 and stats["single_calls"] == len(REVIEWS)
+
+
+def test_pack_size_one_is_single_calls():
+    def complete(prompt, max_tokens):
+        raise AssertionError("packed call with pack_size=1")
+
+    calls = []
+    labels, stats = classify_packed(
+        REVIEWS,
+        complete,
+        lambda r: (TRUTH[REVIEWS.index(r)], USAGE),
+        pack_size=1,
+        on_call=lambda: calls.append(1),
+    )
+    assert labels == TRUTH
+    assert stats["single_calls"] == len(calls) == len(REVIEWS)
+    assert stats["fallback_items"] == 0
+    assert stats["input_tokens_per_review"] == 10
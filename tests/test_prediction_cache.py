@@ -0,0 +1,88 @@
+import sqlite3
+
+from app.prediction_cache import PredictionCache
+
+FEATURES = {"Original_Price": 1650.0, "Category": "Watches", "Flagship_Store": "No"}
+
+
+def test_key_is_canonical_and_versioned():
+    cache = PredictionCache(model_version="a")
+    reordered = dict(reversed(list(FEATURES.items())))
+    assert cache.key(FEATURES) == cache.key(reordered)
+    assert cache.key(FEATURES) != cache.key({**FEATURES, "Original_Price": 1651.0})
+
+    other = PredictionCache(model_version="b")
+    assert cache.key(FEATURES) != other.key(FEATURES)
+
+
+def test_lru_eviction_and_stats():
+    cache = PredictionCache(maxsize=2)
+    cache.put("a", 1.0, 0.01)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0  # a is now most recently used
+    cache.put("c", 3.0)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3.0
+    assert len(cache) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["saved_seconds"] == 0.01
+
+
+def test_ttl_expiry():
+    cache = PredictionCache(ttl=-1)
+    cache.put("a", 1.0)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_model_reload_invalidates():
+    cache = PredictionCache(model_version="v1")
+    cache.put("a", 1.0)
+    cache.set_model_version("v1")
+    assert cache.get("a") == 1.0
+    cache.set_model_version("v2")
+    assert cache.get("a") is None
+
+
+def test_shared_store_across_workers(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    first = PredictionCache(model_version="v1", shared_path=path)
+    second = PredictionCache(model_version="v1", shared_path=path)
+    key = first.key(FEATURES)
+    assert key == second.key(FEATURES)
+    first.put(key, 42.0, 0.002)
+    assert second.get(key) == 42.0
+    assert first._conn.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+
+
+def test_reload_in_one_worker_keeps_shared_entries(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    first = PredictionCache(model_version="v1", shared_path=path)
+    second = PredictionCache(model_version="v1", shared_path=path)
+    key = first.key(FEATURES)
+    first.put(key, 42.0)
+    first.put("stale", 1.0)
+    first._conn.execute("UPDATE predictions SET expires = 0 WHERE key = 'stale'")
+    first._conn.commit()
+
+    second.set_model_version("v2")  # second worker reloads first
+    third = PredictionCache(model_version="v1", shared_path=path)
+    assert third.get(key) == 42.0
+    assert second.get(second.key(FEATURES)) is None
+    rows = first._conn.execute("SELECT key FROM predictions").fetchall()
+    assert rows == [(key,)]  # only expired rows were purged
+
+
+def test_reload_does_not_fail_while_another_worker_holds_the_lock(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    cache = PredictionCache(model_version="v1", shared_path=path)
+    cache.put("a", 1.0)
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        cache._conn.execute("PRAGMA busy_timeout = 10")
+        cache.set_model_version("v2")
+    finally:
+        other.rollback()
+    assert cache.model_version == "v2" and len(cache) == 0
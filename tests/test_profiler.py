@@ -0,0 +1,75 @@
+import sys
+import threading
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.profiler import ProfilerBusy, SamplingProfiler
+
+client = TestClient(main.app)
+TOKEN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def predict_load(monkeypatch):
+    """Synthetic /predict traffic from a background thread, cache disabled."""
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(main, "prediction_cache", None)
+    example = main.ProductFeatures.model_config["json_schema_extra"]["example"]
+    features = main.ProductFeatures(**example)
+    main.predict(features)  # load the model before sampling starts
+    stop = threading.Event()
+
+    def load():
+        while not stop.is_set():
+            main.predict(features)
+
+    thread = threading.Thread(target=load)
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+def test_profile_requires_admin_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/admin/profile?seconds=0", headers=TOKEN).status_code == 403
+    monkeypatch.setenv("ADMIN_TOKEN", "other")
+    assert client.get("/admin/profile?seconds=0", headers=TOKEN).status_code == 403
+    assert client.get("/admin/profile?seconds=0").status_code == 403
+
+
+def test_profile_shows_hot_predict_frames(predict_load):
+    response = client.get(
+        "/admin/profile?seconds=1&interval_ms=2&format=collapsed", headers=TOKEN
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    predict_lines = [line for line in lines if "predict (app/main.py:" in line]
+    assert predict_lines
+    # The forest's own predict shows up underneath the endpoint's frame
+    assert any("sklearn/" in line for line in predict_lines)
+    predict_samples = sum(int(line.rsplit(" ", 1)[1]) for line in predict_lines)
+    assert predict_samples >= 10
+
+
+def test_profile_memory_top_n_and_nothing_left_running(predict_load):
+    response = client.get("/admin/profile?seconds=0.3&memory=true&top=5", headers=TOKEN)
+    body = response.json()
+    assert body["samples"] > 0
+    assert 0 < len(body["memory"]) <= 5
+    assert {"site", "size_kb", "count"} <= set(body["memory"][0])
+    # Inactive profiler: no tracing, no hooks, session released
+    assert not tracemalloc.is_tracing()
+    assert sys.getprofile() is None and sys.gettrace() is None
+    assert not main.profiler._lock.locked()
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    profiler._lock.acquire()
+    with pytest.raises(ProfilerBusy):
+        profiler.profile(0.1)
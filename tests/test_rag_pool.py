@@ -0,0 +1,144 @@
+import os
+import pickle
+import socket
+import struct
+import subprocess
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+from app.rag_pool import RAGClient, RAGPoolServer, key_path, parse_address
+
+
+def fake_ask(question: str, budget_seconds: float = None) -> dict:
+    if question == "boom":
+        raise ValueError("index not built")
+    return {
+        "answer": question.upper(),
+        "sources": [],
+        "latency_seconds": 0.0,
+        "budget_seconds": budget_seconds,
+    }
+
+
+@pytest.fixture
+def pool_address(tmp_path):
+    address = str(tmp_path / "rag.sock")
+    server = RAGPoolServer(address, workers=2, handler=f"{__name__}:fake_ask")
+    server.start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield address
+    server.close()
+
+
+def test_parse_address():
+    assert parse_address("/tmp/rag.sock") == "/tmp/rag.sock"
+    assert parse_address("localhost:7000") == ("localhost", 7000)
+    assert parse_address(":7000") == ("127.0.0.1", 7000)
+
+
+def test_client_forwards_and_reuses_connections(pool_address):
+    client = RAGClient(pool_address)
+    assert client.ask("hello")["answer"] == "HELLO"
+    assert client.ask("again")["answer"] == "AGAIN"
+    assert client._idle.qsize() == 1
+
+
+def test_client_forwards_latency_budget(pool_address):
+    client = RAGClient(pool_address)
+    assert client.ask("hello")["budget_seconds"] is None
+    assert client.ask("hello", budget_seconds=2.5)["budget_seconds"] == 2.5
+
+
+def test_handler_errors_are_raised_on_the_api_side(pool_address):
+    client = RAGClient(pool_address)
+    with pytest.raises(RuntimeError, match="index not built"):
+        client.ask("boom")
+    assert client.ask("still works")["answer"] == "STILL WORKS"
+
+
+def test_pool_mode_never_imports_the_rag_stack():
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('src.rag.query', 'llama_index', 'torch') "
+        "if m in sys.modules))"
+    )
+    env = {**os.environ, "RAG_POOL_ADDRESS": "/tmp/unused.sock", "PYTHONPATH": "src"}
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_unix_socket_key_is_private_and_removed_on_close(tmp_path):
+    address = str(tmp_path / "rag.sock")
+    server = RAGPoolServer(address, workers=1, handler=f"{__name__}:fake_ask").start()
+    assert os.stat(key_path(address)).st_mode & 0o777 == 0o600
+    server.close()
+    assert not os.path.exists(key_path(address))
+
+
+class _Payload:
+    """Unpickling this creates a file: proof the server ran sent bytes."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (open, (self.path, "w"))
+
+
+def test_unauthenticated_client_is_rejected(pool_address, tmp_path):
+    with pytest.raises(AuthenticationError):
+        Client(pool_address, authkey=b"wrong key")
+
+    # A raw client skipping the handshake: its pickle must never be loaded
+    marker = tmp_path / "pwned"
+    data = pickle.dumps(_Payload(str(marker)))
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.settimeout(5)
+        sock.connect(pool_address)
+        sock.sendall(struct.pack("!i", len(data)) + data)
+        while sock.recv(4096):  # the server closes the connection
+            pass
+    assert not marker.exists()
+    assert RAGClient(pool_address).ask("hello")["answer"] == "HELLO"
+
+
+def test_tcp_pool_refuses_to_start_without_an_authkey(monkeypatch):
+    monkeypatch.delenv("RAG_POOL_AUTHKEY", raising=False)
+    server = RAGPoolServer("127.0.0.1:0", workers=1, handler=f"{__name__}:fake_ask")
+    with pytest.raises(ValueError, match="RAG_POOL_AUTHKEY"):
+        server.start()
+    with pytest.raises(ValueError, match="RAG_POOL_AUTHKEY"):
+        RAGClient("127.0.0.1:7000").ask("hello")
+
+
+def test_silent_client_does_not_block_other_connections(tmp_path):
+    address = str(tmp_path / "rag.sock")
+    server = RAGPoolServer(
+        address, workers=1, handler=f"{__name__}:fake_ask", handshake_timeout=0.2
+    ).start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX) as silent:
+            silent.connect(address)  # never answers the challenge
+            answers = []
+            thread = threading.Thread(
+                target=lambda: answers.append(RAGClient(address).ask("hello")),
+                daemon=True,
+            )
+            thread.start()
+            thread.join(5)
+            assert answers and answers[0]["answer"] == "HELLO"
+
+            # The silent connection is dropped once the handshake times out
+            silent.settimeout(5)
+            while silent.recv(4096):
+                pass
+    finally:
+        server.close()
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app import main
+from app.sentiment import LABELS, SentimentClassifier, normalize
+
+client = TestClient(main.app)
+
+TEXTS = [
+    "bohat acha product hai",
+    "zabardast quality love it",
+    "bakwas product time waste",
+    "worst quality never buy",
+    "theek hai average",
+    "ok ok hai not bad not good",
+] * 5
+TRUTH = ["positive", "positive", "negative", "negative", "neutral", "neutral"] * 5
+
+
+def test_normalize_caps_repeated_characters():
+    assert normalize("Goooood!!!!") == "good!!"
+
+
+def test_fit_save_load_roundtrip(tmp_path):
+    classifier = SentimentClassifier(n_features=2**12).fit(TEXTS, TRUTH)
+    assert classifier.predict(TEXTS) == TRUTH
+    path = tmp_path / "sentiment.npz"
+    classifier.save(path)
+    loaded = SentimentClassifier.load(path)
+    assert loaded.predict(TEXTS) == TRUTH
+    assert (loaded.decision_function(TEXTS[:3]).argmax(1) < len(LABELS)).all()
+
+
+def test_sentiment_endpoint_batch():
+    reviews = ["bohat acha product, fast delivery", "bakwas, totally fake item"]
+    response = client.post("/sentiment", json={"reviews": reviews * 500})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["labels"][:2] == ["positive", "negative"]
+    assert len(body["labels"]) == 1000
+    assert body["counts"] == {"positive": 500, "negative": 500}
+
+
+def test_sentiment_endpoint_limits(monkeypatch):
+    assert client.post("/sentiment", json={"reviews": []}).json()["labels"] == []
+    monkeypatch.setattr(main, "SENTIMENT_MAX_BATCH", 2)
+    response = client.post("/sentiment", json={"reviews": ["a", "b", "c"]})
+    assert response.status_code == 413
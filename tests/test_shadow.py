@@ -0,0 +1,81 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from app.shadow import (
+    PRIMARY,
+    CanaryRouter,
+    ShadowScorer,
+    load_candidates,
+    parse_spec,
+    score_batch,
+)
+
+COLUMNS = ["a", "b"]
+
+
+def _model(value, columns=COLUMNS):
+    X = pd.DataFrame(np.zeros((3, len(columns))), columns=columns)
+    return DummyRegressor(strategy="constant", constant=value).fit(X, [value] * 3)
+
+
+def test_parse_spec():
+    assert parse_spec("v2=models/a.joblib, v3=b.joblib") == {
+        "v2": "models/a.joblib",
+        "v3": "b.joblib",
+    }
+    assert parse_spec(None) == {}
+
+
+def test_canary_router_weights():
+    router = CanaryRouter({"v2": 0.25})
+    picks = [router.choose() for _ in range(4000)]
+    assert 0.2 < picks.count("v2") / len(picks) < 0.3
+    assert set(picks) == {"v2", PRIMARY}
+    with pytest.raises(ValueError):
+        CanaryRouter({"v2": 0.7, "v3": 0.5})
+
+
+def test_load_candidates_skips_incompatible(tmp_path):
+    joblib.dump(_model(10), tmp_path / "ok.joblib")
+    joblib.dump(_model(10, ["a", "c"]), tmp_path / "bad.joblib")
+    spec = (
+        f"ok={tmp_path / 'ok.joblib'},bad={tmp_path / 'bad.joblib'},"
+        f"gone={tmp_path / 'missing.joblib'}"
+    )
+    assert list(load_candidates(spec, COLUMNS)) == ["ok"]
+
+
+def test_shadow_scores_every_other_model(monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        "app.shadow.log_shadow_score", lambda *args: logged.append(args)
+    )
+    scorer = ShadowScorer(
+        {PRIMARY: _model(50), "v2": _model(60)}, COLUMNS, max_queue=10
+    ).start()
+    for _ in range(5):
+        scorer.submit(PRIMARY, 50.0, np.zeros(2))
+    scorer.submit("v2", 60.0, np.zeros(2))
+    scorer.join()
+    scorer.stop()
+
+    assert scorer.scored == 6
+    deltas = sorted((name, delta) for name, delta, _ in logged)
+    assert deltas == [(PRIMARY, -10.0)] + [("v2", 10.0)] * 5
+
+
+def test_score_batch_skips_the_served_model():
+    models = {PRIMARY: _model(50), "v2": _model(45)}
+    batch = [(PRIMARY, 50.0, np.zeros(2)), ("v2", 45.0, np.zeros(2))]
+    scored = {name: deltas for name, deltas, _ in score_batch(models, COLUMNS, batch)}
+    assert scored == {"v2": [-5.0], PRIMARY: [5.0]}
+
+
+def test_submit_never_blocks_without_a_worker():
+    scorer = ShadowScorer({PRIMARY: _model(1)}, COLUMNS)  # not started
+    for _ in range(5):
+        scorer.submit("v2", 1.0, np.zeros(2))
+    assert scorer.dropped == 5
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.single_flight import CoalesceTimeout, SingleFlight, normalize_question
+
+
+class SlowCall:
+    """Blocks until released, counting how many times it actually ran."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.release = threading.Event()
+        self.error = error
+
+    def __call__(self, question):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return {"answer": f"answer to {question}"}
+
+
+def _burst(flight, fn, n=10, key="q"):
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(flight.do(key, fn, key))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    while flight._calls.get(key) is None or flight._calls[key].waiters < n - 1:
+        time.sleep(0.005)
+    fn.release.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_normalize_question():
+    assert normalize_question("  Free   DELIVERY? ") == normalize_question(
+        "free delivery"
+    )
+
+
+def test_concurrent_duplicates_share_one_call():
+    flight, fn = SingleFlight(timeout=5), SlowCall()
+    results, errors = _burst(flight, fn)
+    assert fn.calls == 1 and not errors
+    assert sorted(shared for _, shared in results) == [False] + [True] * 9
+    # Followers get copies: editing one answer doesn't affect the others
+    results[0][0]["answer"] = "moderated"
+    assert sum(r["answer"] == "answer to q" for r, _ in results) == 9
+    assert flight.in_flight() == 0
+
+
+def test_leader_error_reaches_followers_and_is_not_cached():
+    flight, fn = SingleFlight(timeout=5), SlowCall(error=ValueError("groq down"))
+    results, errors = _burst(flight, fn, n=5)
+    assert fn.calls == 1 and not results
+    assert len(errors) == 5 and all(isinstance(e, ValueError) for e in errors)
+
+    fn.error = None
+    assert flight.do("q", fn, "q") == ({"answer": "answer to q"}, False)
+    assert fn.calls == 2
+
+
+def test_follower_times_out():
+    flight, fn = SingleFlight(timeout=0.05), SlowCall()
+    leader = threading.Thread(target=flight.do, args=("q", fn, "q"))
+    leader.start()
+    while not flight.in_flight():
+        time.sleep(0.005)
+    with pytest.raises(CoalesceTimeout):
+        flight.do("q", fn, "q")
+    fn.release.set()
+    leader.join()
+    assert fn.calls == 1 and flight.timeouts == 1
+
+
+def test_async_duplicates_share_one_call():
+    flight = SingleFlight(timeout=5)
+    calls = []
+
+    async def ask(question):
+        calls.append(question)
+        await asyncio.sleep(0.05)
+        return {"answer": question}
+
+    async def burst():
+        return await asyncio.gather(
+            *(flight.do_async("q", ask, "q") for _ in range(10))
+        )
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert sum(shared for _, shared in results) == 9
+
+
+def test_async_follower_joins_sync_leader():
+    flight, fn = SingleFlight(timeout=5), SlowCall()
+    leader = threading.Thread(target=flight.do, args=("q", fn, "q"))
+    leader.start()
+    while not flight.in_flight():
+        time.sleep(0.005)
+
+    async def follow():
+        threading.Timer(0.05, fn.release.set).start()
+        return await flight.do_async("q", None, "q")
+
+    assert asyncio.run(follow()) == ({"answer": "answer to q"}, True)
+    leader.join()
+    assert fn.calls == 1
+
+
+def test_ask_burst_makes_one_rag_call(monkeypatch):
+    from app import main
+
+    fn = SlowCall()
+    monkeypatch.setattr(
+        main, "ask_rag", lambda q, budget_seconds=None: {**fn(q), "sources": []}
+    )
+    monkeypatch.setattr(main, "RAG_READY", True)
+    monkeypatch.setattr(main, "ask_flight", SingleFlight(timeout=5))
+    query = main.AskQuery(question="Do you offer free delivery?")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(main.ask(query)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while main.ask_flight.in_flight() == 0 or (
+        next(iter(main.ask_flight._calls.values())).waiters < 7
+    ):
+        time.sleep(0.005)
+    fn.release.set()
+    for thread in threads:
+        thread.join()
+    assert fn.calls == 1 and len(results) == 8
+    assert main.ask_flight.shared == 7
+
+
+def test_ask_with_own_budget_is_not_coalesced(monkeypatch):
+    from app import main
+
+    fn = SlowCall()
+    budgets = []
+
+    def ask_rag(question, budget_seconds=None):
+        budgets.append(budget_seconds)
+        if budget_seconds < 1:  # a tight caller budget: answered at once
+            return {"answer": "quick", "sources": [], "degraded": True}
+        return {**fn(question), "sources": []}
+
+    monkeypatch.setattr(main, "ask_rag", ask_rag)
+    monkeypatch.setattr(main, "RAG_READY", True)
+    monkeypatch.setattr(main, "ask_flight", SingleFlight(timeout=5))
+    question = "Do you offer free delivery?"
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(main.ask(main.AskQuery(question=question)))
+    )
+    leader.start()
+    while main.ask_flight.in_flight() == 0:
+        time.sleep(0.005)
+
+    # Runs on its own with its own budget, while the default call is in flight
+    tight = main.ask(main.AskQuery(question=question, budget_seconds=0.5))
+    assert tight["answer"] == "quick" and budgets[-1] <= 0.5
+    fn.release.set()
+    leader.join()
+    assert results[0]["answer"] == f"answer to {question}"
+    assert not results[0].get("degraded")
+    assert fn.calls == 1 and main.ask_flight.shared == 0
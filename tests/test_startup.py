@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+HEAVY = ["pandas", "sklearn", "joblib", "pyarrow", "llama_index", "src.rag.query"]
+
+
+def test_importing_the_api_defers_heavy_subsystems():
+    code = (
+        "import sys, app.main as m; "
+        f"print([n for n in {HEAVY!r} if n in sys.modules], m.model is None)"
+    )
+    env = {**os.environ, "PYTHONPATH": "src"}
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "[] True"
+
+
+def test_import_profile_groups_by_package():
+    from app.startup_report import import_profile
+
+    total, packages = import_profile("json")
+    assert total > 0
+    assert "json" in packages
@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main, sweep
+
+client = TestClient(main.app)
+
+BASE = {
+    "Original_Price": 1650,
+    "Discount_Price": 725,
+    "Number_of_Ratings": 31,
+    "Positive_Seller_Ratings": 86,
+    "Ship_On_Time": 0,
+    "Chat_Response_Rate": 93,
+    "No_of_products_to_be_sold": 113.79,
+    "Category": "Watches, Bags, Jewellery",
+    "Delivery_Type": "Free Delivery",
+    "Flagship_Store": "No",
+}
+
+
+def test_sweep_matches_predict_for_every_variant():
+    grid = {
+        "No_of_products_to_be_sold": [1, 20, 60, 150],
+        "Delivery_Type": ["Free Delivery", "Standard Delivery"],
+        "Category": ["Groceries", "Unknown Category"],
+    }
+    body = client.post("/predict/sweep", json={"base": BASE, "grid": grid}).json()
+    assert body["shape"] == [4, 2, 2]
+    assert body["feasible"] == 16
+    for i, values in enumerate(itertools.product(*grid.values())):
+        variant = {**BASE, **dict(zip(grid, values))}
+        predicted = client.post("/predict", json=variant).json()
+        assert body["scores"][i] == pytest.approx(predicted["predicted_success_score"])
+    assert body["best_score"] == max(body["scores"])
+
+
+def test_sweep_ranges_and_constraints():
+    grid = {
+        "No_of_products_to_be_sold": {"start": 0, "stop": 200, "step": 10},
+        "Discount_Price": {"start": 100, "stop": 1600, "num": 4},
+    }
+    constraints = {"No_of_products_to_be_sold": {"max": 30}, "Discount_Price": {}}
+    response = client.post(
+        "/predict/sweep", json={"base": BASE, "grid": grid, "constraints": constraints}
+    )
+    body = response.json()
+    assert body["shape"] == [21, 4]
+    assert body["axes"]["Discount_Price"] == [100, 600, 1100, 1600]
+    assert body["feasible"] == 4 * 4
+    assert body["best"]["No_of_products_to_be_sold"] <= 30
+    feasible = body["scores"][: 4 * 4]
+    assert body["best_score"] == max(feasible)
+
+    constraints = {"Original_Price": {"max": 100}}  # the base itself is out
+    response = client.post(
+        "/predict/sweep", json={"base": BASE, "grid": grid, "constraints": constraints}
+    )
+    assert response.json()["feasible"] == 0
+    assert response.json()["best"] is None
+
+
+def test_sweep_rejects_bad_grids(monkeypatch):
+    def post(grid, **extra):
+        return client.post("/predict/sweep", json={"base": BASE, "grid": grid, **extra})
+
+    assert post({"Price": [1, 2]}).status_code == 422
+    assert post({"Delivery_Type": [1, 2]}).status_code == 422
+    assert post({"Discount_Price": ["cheap"]}).status_code == 422
+    assert post({"Discount_Price": {"start": 0, "stop": 1}}).status_code == 422
+    assert post({"Discount_Price": []}).status_code == 422
+    constraints = {"Category": {"min": 1}}
+    assert post({"Discount_Price": [1]}, constraints=constraints).status_code == 422
+
+    monkeypatch.setattr(main, "SWEEP_MAX_VARIANTS", 10)
+    assert (
+        post({"Discount_Price": {"start": 0, "stop": 10, "num": 11}}).status_code == 413
+    )
+
+
+def test_sweep_size_limits_cannot_be_bypassed(monkeypatch):
+    def post(grid):
+        return client.post("/predict/sweep", json={"base": BASE, "grid": grid})
+
+    # 65536**4 == 2**64, which wraps to 0 in int64
+    axis = {"start": 0, "stop": 65535, "step": 1}
+    fields = ["Original_Price", "Discount_Price", "Number_of_Ratings", "Ship_On_Time"]
+    assert post({field: axis for field in fields}).status_code == 413
+
+    # Both range forms are capped before their values are allocated
+    monkeypatch.setattr(sweep, "MAX_RANGE_POINTS", 1000)
+    huge = {"start": 0, "stop": 1, "num": 10**10}
+    assert post({"Discount_Price": huge}).status_code == 422
+    tiny_step = {"start": 0, "stop": 1, "step": 1e-320}
+    assert post({"Discount_Price": tiny_step}).status_code == 422
@@ -1,24 +1,67 @@
-import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import numpy as np
+import argparse
 import joblib
 import os
 import json
+import time
 import mlflow
 import mlflow.sklearn
 
+from src.app.drift import build_reference, save_reference
+from src.app.feature_store import load_feature_store
+from src.app.hparam_search import HyperparameterSearch
+
+parser = argparse.ArgumentParser(description="Train the product success model")
+parser.add_argument(
+    "--search",
+    choices=["grid", "random", "halving"],
+    default=None,
+    help="Run a parallel hyperparameter search and train with the best params",
+)
+parser.add_argument("--trials", type=int, default=27, help="random/halving trials")
+parser.add_argument("--folds", type=int, default=3)
+parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+parser.add_argument(
+    "--latency-weight",
+    type=float,
+    default=1.0,
+    help="RMSE points one millisecond of single-row latency is worth",
+)
+parser.add_argument(
+    "--incremental",
+    metavar="NEW_DATA",
+    default=None,
+    help="CSV/Parquet of new labelled rows: add trees to the current model "
+    "instead of retraining from scratch",
+)
+parser.add_argument("--new-trees", type=int, default=5)
+parser.add_argument(
+    "--max-trees", type=int, default=None, help="drop the oldest trees beyond this"
+)
+parser.add_argument(
+    "--recent-rows",
+    type=int,
+    default=0,
+    help="also fit the new trees on this many of the latest existing rows",
+)
+parser.add_argument(
+    "--tolerance",
+    type=float,
+    default=0.0,
+    help="promote if holdout RMSE is at most (1 + tolerance) x the current one",
+)
+args = parser.parse_args()
+
 print("--- Script Starting (v3.4: Adding MLflow) ---")
 
 # Define File Paths
 DATA_PATH = "data/raw/Top_Selling_Product_Data.csv"
-PROCESSED_DATA_DIR = "data/processed"
-TRAIN_SET_PATH = os.path.join(PROCESSED_DATA_DIR, "train_set.csv")
-TEST_SET_PATH = os.path.join(PROCESSED_DATA_DIR, "test_set.csv")
 MODEL_DIR = "models"
 MODEL_PATH = os.path.join(MODEL_DIR, "model.joblib")  # Still save locally too
 MODEL_COLS_PATH = os.path.join(MODEL_DIR, "model_columns.json")
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, "drift_reference.json")
 REPORT_DIR = "reports"  # For saving metrics plot
 
 # MLflow Configuration
@@ -27,63 +70,163 @@ mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
 mlflow.set_experiment("Daraz Product Success")  # Experiment name
 
 os.makedirs(MODEL_DIR, exist_ok=True)
-os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
 os.makedirs(REPORT_DIR, exist_ok=True)
 print("Directories ready.")
 
 
-try:
-    df = pd.read_csv(DATA_PATH)
-    print(f"Loaded data from {DATA_PATH}")
-except FileNotFoundError:
+# Load Data from the feature store (parsed and encoded once per CSV version)
+if not os.path.exists(DATA_PATH):
     print(f"Error: Data file not found at {DATA_PATH}")
     exit()
 
-# Prepare Data
-numeric_features = [
-    "Original Price",
-    "Discount Price",
-    "Number of Ratings",
-    "Positive Seller Ratings",
-    "Ship On Time",
-    "Chat Response Rate",
-    "No. of products to be sold",
-]
-categorical_features = ["Category", "Delivery Type", "Flagship Store"]
-target_column = "Sell percentage to increase"
-
-all_features = numeric_features + categorical_features
-df_clean = df.dropna(subset=all_features + [target_column])
-y_raw = df_clean[target_column]  # Keep raw target for potential analysis later
-y = y_raw.clip(lower=0, upper=100).reset_index(drop=True)  # Clipped target for training
-
-X_numeric = df_clean[numeric_features].reset_index(drop=True)
-X_categorical = df_clean[categorical_features].reset_index(drop=True)
-X_categorical_encoded = pd.get_dummies(X_categorical, drop_first=True)
-X = pd.concat([X_numeric, X_categorical_encoded], axis=1)
-print(f"Final features shape (X): {X.shape}")
-
-# Train Model & Log with MLflow
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+load_start = time.time()
+store = load_feature_store(DATA_PATH)
+print(f"Loaded feature store {store.path} in {time.time() - load_start:.3f}s")
+
+X_train, X_test = store.X_frame(store.train_idx), store.X_frame(store.test_idx)
+y_train, y_test = store.y_series(store.train_idx), store.y_series(store.test_idx)
+print(f"Final features shape (X): {(len(store), len(store.columns))}")
+
+
+def run_incremental():
+    """Warm-start update of the current model (src/app/incremental.py)."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    from src.app.incremental import (
+        encode_rows,
+        incremental_update,
+        read_rows,
+        unseen_levels,
+    )
+
+    model = joblib.load(MODEL_PATH)
+    with open(MODEL_COLS_PATH) as f:
+        model_columns = json.load(f)
+
+    new_rows = read_rows(args.incremental)
+    for column, levels in unseen_levels(new_rows, store.categories).items():
+        print(f"Warning: unseen {column} levels encoded as all zeros: {levels}")
+    X_new, y_new = encode_rows(new_rows, model_columns)
+    fit_idx, holdout_idx = train_test_split(
+        np.arange(len(X_new)), test_size=0.2, random_state=42
+    )
+
+    # Fit on the new rows (+ the latest existing ones); hold out some of both
+    recent = np.sort(store.train_idx)[max(0, len(store.train_idx) - args.recent_rows) :]
+    X_fit = pd.concat(
+        [
+            store.X_frame(recent).reindex(columns=model_columns, fill_value=0),
+            X_new.iloc[fit_idx],
+        ],
+        ignore_index=True,
+    )
+    y_fit = pd.concat([store.y_series(recent), y_new.iloc[fit_idx]], ignore_index=True)
+    X_holdout = pd.concat(
+        [
+            X_test.reindex(columns=model_columns, fill_value=0),
+            X_new.iloc[holdout_idx],
+        ],
+        ignore_index=True,
+    )
+    y_holdout = pd.concat([y_test, y_new.iloc[holdout_idx]], ignore_index=True)
+
+    candidate, report = incremental_update(
+        model,
+        X_fit,
+        y_fit.to_numpy(),
+        X_holdout,
+        y_holdout.to_numpy(),
+        new_trees=args.new_trees,
+        max_trees=args.max_trees,
+        tolerance=args.tolerance,
+    )
+    print(
+        f"Added {args.new_trees} trees on {len(X_fit)} rows in "
+        f"{report['fit_seconds']:.2f}s ({report['trees']} trees total)"
+    )
+    print(f"Holdout current:   {report['current']}")
+    print(f"Holdout candidate: {report['candidate']}")
+
+    with mlflow.start_run(run_name="incremental"):
+        mlflow.log_param("new_data", args.incremental)
+        mlflow.log_param("feature_store", store.meta["hash"])
+        mlflow.log_params(
+            {
+                "new_trees": args.new_trees,
+                "max_trees": args.max_trees,
+                "recent_rows": args.recent_rows,
+                "tolerance": args.tolerance,
+                "n_estimators": report["trees"],
+            }
+        )
+        mlflow.log_metrics({f"current_{k}": v for k, v in report["current"].items()})
+        mlflow.log_metrics(report["candidate"])
+        mlflow.log_metrics(
+            {"fit_seconds": report["fit_seconds"], "new_rows": report["new_rows"]}
+        )
+        mlflow.log_param("promoted", report["promote"])
+        if not report["promote"]:
+            print("Candidate is worse on the holdout; keeping the current model.")
+            return
+        mlflow.sklearn.log_model(
+            sk_model=candidate,
+            artifact_path="sklearn-model",
+            registered_model_name="daraz-product-success-predictor",
+        )
+    # model_columns.json is unchanged: new rows were encoded against it
+    joblib.dump(candidate, MODEL_PATH)
+    print(f"Promoted: updated model saved to {MODEL_PATH}")
+
+
+if args.incremental:
+    run_incremental()
+    print("--- Script Finished ---")
+    exit()
+
+# Define Model Parameters (optionally chosen by a hyperparameter search)
+n_estimators = 10
+max_depth = 5
+model_params = {
+    "n_estimators": n_estimators,
+    "max_depth": max_depth,
+    "random_state": 42,
+    "n_jobs": -1,
+}
+
+if args.search:
+    print(f"Running {args.search} hyperparameter search...")
+    search = HyperparameterSearch(
+        store,
+        n_folds=args.folds,
+        workers=args.workers,
+        latency_weight=args.latency_weight,
+    )
+    summary = search.run(args.search, n_trials=args.trials)
+    best = summary["best"]
+    print(
+        f"{summary['trials']} trials in {summary['wall_seconds']:.1f}s "
+        f"({summary['trials_per_minute']:.1f} trials/min, "
+        f"{summary['speedup_vs_serial']:.2f}x vs serial on {summary['workers']} workers)"
+    )
+    print(
+        f"Best: {best['params']} "
+        f"rmse={best['rmse']:.3f} latency={best['latency_ms']:.2f}ms"
+    )
+    with mlflow.start_run(run_name=f"hparam-search-{args.search}"):
+        mlflow.log_param("feature_store", store.meta["hash"])
+        search.log_to_mlflow(summary)
+    model_params.update(best["params"])
 
 # NEW: Start MLflow Run
 with mlflow.start_run() as run:
     print(f"MLflow Run ID: {run.info.run_id}")
     mlflow.log_param("data_path", DATA_PATH)
+    mlflow.log_param("feature_store", store.meta["hash"])
     mlflow.log_param("test_size", 0.2)
     mlflow.log_param("random_state", 42)
 
-    # Define and Log Model Parameters
-    n_estimators = 10
-    max_depth = 5
-    model_params = {
-        "n_estimators": n_estimators,
-        "max_depth": max_depth,
-        "random_state": 42,
-        "n_jobs": -1,
-    }
+    # Log Model Parameters
     mlflow.log_params(model_params)
 
     model = RandomForestRegressor(**model_params)
@@ -136,21 +279,16 @@ joblib.dump(model, MODEL_PATH)
 print(f"Local model saved to {MODEL_PATH}")
 
 print("Saving local model columns...")
-model_columns = list(X.columns)
+model_columns = store.columns
 with open(MODEL_COLS_PATH, "w") as f:
     json.dump(model_columns, f)
 print(f"Local model columns saved to {MODEL_COLS_PATH}")
 
-# Saving train/test
-print("Saving local train and test sets...")
-train_df = pd.concat(
-    [X_train.reset_index(drop=True), y_train.reset_index(drop=True)], axis=1
-)
-test_df = pd.concat(
-    [X_test.reset_index(drop=True), y_test.reset_index(drop=True)], axis=1
-)
-train_df.to_csv(TRAIN_SET_PATH, index=False)
-test_df.to_csv(TEST_SET_PATH, index=False)
-print(f"Local Train/Test sets saved to {PROCESSED_DATA_DIR}")
+# Reference profile for online drift monitoring (src/app/drift.py)
+print("Saving drift reference profile...")
+train_rows = store.raw_frame(store.train_idx)
+train_scores = np.clip(model.predict(X_train), 1, 100)
+save_reference(build_reference(train_rows, train_scores), DRIFT_REFERENCE_PATH)
+print(f"Drift reference saved to {DRIFT_REFERENCE_PATH}")
 
 print("--- Script Finished ---")
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from src.app.sentiment import SentimentClassifier
+
+parser = argparse.ArgumentParser(description="Train the local sentiment classifier")
+parser.add_argument("--C", type=float, default=0.5, help="LinearSVC regularization")
+parser.add_argument("--no-mlflow", action="store_true")
+args = parser.parse_args()
+
+print("--- Sentiment Training Starting ---")
+
+DATA_PATH = "data/raw/daraz-code-mixed-product-reviews.csv"
+EVAL_PATH = "data/eval.jsonl"
+MODEL_PATH = os.path.join("models", "sentiment.npz")
+THROUGHPUT_BATCH = 10_000
+
+df = pd.read_csv(DATA_PATH).dropna(subset=["Reviews", "Sentiments"])
+df["Reviews"] = df["Reviews"].astype(str)
+with open(EVAL_PATH, encoding="utf-8") as f:
+    eval_items = [json.loads(line) for line in f]
+
+# The prompt-strategy eval reviews also occur in the CSV; keep them out of
+# training so the comparison with the LLM prompts stays fair
+eval_reviews = {item["review"].strip().lower() for item in eval_items}
+leaked = df["Reviews"].str.strip().str.lower().isin(eval_reviews)
+df = df[~leaked]
+print(f"{len(df)} labeled reviews ({leaked.sum()} eval reviews excluded)")
+
+train_df, test_df = train_test_split(
+    df, test_size=0.2, random_state=42, stratify=df["Sentiments"]
+)
+
+start = time.time()
+classifier = SentimentClassifier().fit(
+    train_df["Reviews"].tolist(), train_df["Sentiments"].tolist(), C=args.C
+)
+fit_seconds = time.time() - start
+print(f"Trained on {len(train_df)} reviews in {fit_seconds:.1f}s")
+
+
+def evaluate(texts, labels, prefix):
+    pred = classifier.predict(texts)
+    return {
+        f"{prefix}_accuracy": accuracy_score(labels, pred),
+        f"{prefix}_f1_weighted": f1_score(labels, pred, average="weighted"),
+    }
+
+
+metrics = {
+    **evaluate(test_df["Reviews"].tolist(), test_df["Sentiments"].tolist(), "test"),
+    **evaluate(
+        [item["review"] for item in eval_items],
+        [item["ground_truth"] for item in eval_items],
+        "eval",
+    ),
+}
+
+batch = (df["Reviews"].tolist() * 2)[:THROUGHPUT_BATCH]
+start = time.perf_counter()
+classifier.predict(batch)
+metrics["reviews_per_second"] = len(batch) / (time.perf_counter() - start)
+metrics["fit_seconds"] = fit_seconds
+
+classifier.save(MODEL_PATH)
+size_kb = os.path.getsize(MODEL_PATH) / 1024
+print(f"Saved {MODEL_PATH} ({size_kb:.0f} KB)")
+for name, value in metrics.items():
+    print(f"  {name:<20} {value:.4f}")
+
+if not args.no_mlflow:
+    import mlflow
+
+    # Logged next to the LLM prompt strategies (experiments/prompts/)
+    mlflow.set_tracking_uri("http://localhost:5000")
+    mlflow.set_experiment("prompt_engineering_d1")
+    with mlflow.start_run(run_name="local_classifier"):
+        mlflow.log_params({"strategy": "char_ngram_linear_svc", "C": args.C})
+        mlflow.log_metrics(
+            {
+                "accuracy": metrics["eval_accuracy"],
+                "f1_weighted": metrics["eval_f1_weighted"],
+                **metrics,
+            }
+        )
+        mlflow.log_artifact(MODEL_PATH)
+
+print("--- Script Finished ---")